@@ -36,27 +36,69 @@ contract AlphaHomo is GenericLenderBase {
 
     receive() external payable {}
 
-    function nav() external view override returns (uint256) {
-        return _nav();
+    //everything the plugin reads from the bank. loaded once per entry point and passed down
+    struct bankState {
+        uint256 balance; //eth held by the bank
+        uint256 glbDebtVal; //stored, before pending interest
+        uint256 reservePool; //stored, before pending interest
+        uint256 totalEth; //including pending interest and its reserve cut
+        uint256 totalSupply;
+        uint256 shares; //our bank shares
+        BankConfig config;
     }
 
-    function _nav() internal view returns (uint256) {
-        return want.balanceOf(address(this)).add(underlyingBalanceStored());
+    function _bankState() internal view returns (bankState memory state) {
+        state = _rateState();
+        Bank b = Bank(bank);
+        state.totalSupply = b.totalSupply();
+        state.shares = b.balanceOf(address(this));
+
+        uint256 interest = b.pendingInterest(0);
+        uint256 toReserve = interest.mul(state.config.getReservePoolBps()).div(10000);
+        state.totalEth = state.balance.add(state.glbDebtVal.add(interest)).sub(state.reservePool.add(toReserve));
     }
 
-    function withdrawUnderlying(uint256 amount) internal returns (uint256) {
+    //just what the rate maths needs. the share fields are left empty
+    function _rateState() internal view returns (bankState memory state) {
         Bank b = Bank(bank);
+        state.balance = bank.balance;
+        state.glbDebtVal = b.glbDebtVal();
+        state.reservePool = b.reservePool();
+        state.config = BankConfig(b.config());
+    }
 
-     
-        uint256 shares = amount.mul(b.totalSupply()).div(_bankTotalEth());
-        //uint256 shares = amount.mul(b.glbDebtVal().add(b.pendingInterest(0))).div(b.glbDebtShare());
-        // uint256 shares = b.debtValToShare(amount);
-        uint256 balance = b.balanceOf(address(this));
-        if (shares > balance) {
+    function nav() external view override returns (uint256) {
+        return _nav(_bankState());
+    }
 
-            b.withdraw(balance);
+    function _nav(bankState memory state) internal view returns (uint256) {
+        return want.balanceOf(address(this)).add(_underlying(state));
+    }
+
+    //nav, apr, aprAfterDeposit and the eth value of 1e18 bank shares from one read of the bank
+    function bankView(uint256 depositAmount)
+        external
+        view
+        returns (
+            uint256 _navOut,
+            uint256 _aprOut,
+            uint256 _aprAfterDeposit,
+            uint256 _ethPerShare
+        )
+    {
+        bankState memory state = _bankState();
+        _navOut = _nav(state);
+        _aprOut = _apr(state, 0);
+        _aprAfterDeposit = _apr(state, depositAmount);
+        _ethPerShare = uint256(1e18).mul(state.totalEth).div(state.totalSupply);
+    }
+
+    function withdrawUnderlying(bankState memory state, uint256 amount) internal returns (uint256) {
+        uint256 shares = amount.mul(state.totalSupply).div(state.totalEth);
+        if (shares > state.shares) {
+            Bank(bank).withdraw(state.shares);
         } else {
-            b.withdraw(shares);
+            Bank(bank).withdraw(shares);
         }
 
         uint256 withdrawn = address(this).balance;
@@ -66,39 +108,37 @@ contract AlphaHomo is GenericLenderBase {
     }
 
     function underlyingBalanceStored() public view returns (uint256 balance) {
-        Bank b = Bank(bank);
-        return b.balanceOf(address(this)).mul(_bankTotalEth()).div(b.totalSupply());
-        //return b.balanceOf(address(this)).mul(b.glbDebtVal().add(b.pendingInterest(0))).div(b.glbDebtShare());
+        return _underlying(_bankState());
     }
 
-    function _bankTotalEth() internal view returns (uint256 _totalEth){
-        Bank b = Bank(bank);
-
-        uint256 interest = b.pendingInterest(0);
-        BankConfig config = BankConfig(b.config());
-        uint256 toReserve = interest.mul(config.getReservePoolBps()).div(10000);
-
-        uint256 glbDebtVal = b.glbDebtVal().add(interest);
-        uint256 reservePool = b.reservePool().add(toReserve);
-
-        _totalEth = bank.balance.add(glbDebtVal).sub(reservePool);
+    function _underlying(bankState memory state) internal pure returns (uint256) {
+        return state.shares.mul(state.totalEth).div(state.totalSupply);
     }
 
     function apr() external view override returns (uint256) {
-        return _apr(0);
+        return _apr(_rateState(), 0);
     }
 
     function aprAfterDeposit(uint256 amount) external view override returns (uint256) {
-        return _apr(amount);
+        return _apr(_rateState(), amount);
     }
 
-    function _apr(uint256 amount) internal view returns (uint256) {
-        Bank b = Bank(bank);
-        BankConfig config = BankConfig(b.config());
-        uint256 balance = bank.balance.add(amount);
-        uint256 ratePerSec = config.getInterestRate(b.glbDebtVal(), balance);
+    function aprAfterWithdraw(uint256 amount) external view override returns (uint256) {
+        bankState memory state = _rateState();
+        uint256 remaining = state.balance > amount ? state.balance - amount : 0;
+        return _aprAt(state, remaining);
+    }
+
+    function _apr(bankState memory state, uint256 amount) internal view returns (uint256) {
+        return _aprAt(state, state.balance.add(amount));
+    }
+
+    //apr with the bank holding balance eth. deposits and withdrawals only move the rate, not utilisation
+    function _aprAt(bankState memory state, uint256 balance) internal view returns (uint256) {
+        uint256 ratePerSec = state.config.getInterestRate(state.glbDebtVal, balance);
 
-        uint256 utilisation = uint256(1e18).mul(b.glbDebtVal()).div(b.totalETH());
+        //the bank's totalETH(). stored values, no pending interest
+        uint256 utilisation = uint256(1e18).mul(state.glbDebtVal).div(state.balance.add(state.glbDebtVal).sub(state.reservePool));
 
         //10% is kept as reserves. So remove. Then multiply by utilisation to share per lender
         uint256 rate = ratePerSec.mul(9).div(10).mul(utilisation).div(1e18);
@@ -107,8 +147,8 @@ contract AlphaHomo is GenericLenderBase {
     }
 
     function weightedApr() external view override returns (uint256) {
-        uint256 a = _apr(0);
-        return a.mul(_nav());
+        bankState memory state = _bankState();
+        return _apr(state, 0).mul(_nav(state));
     }
 
     function withdraw(uint256 amount) external override management returns (uint256) {
@@ -117,14 +157,15 @@ contract AlphaHomo is GenericLenderBase {
 
     //emergency withdraw. sends balance plus amount to governance
     function emergencyWithdraw(uint256 amount) external override management {
-        withdrawUnderlying(amount);
+        withdrawUnderlying(_bankState(), amount);
 
         want.safeTransfer(vault.governance(), want.balanceOf(address(this)));
     }
 
     //withdraw an amount including any want balance
     function _withdraw(uint256 amount) internal returns (uint256) {
-        uint256 balanceUnderlying = underlyingBalanceStored();
+        bankState memory state = _bankState();
+        uint256 balanceUnderlying = _underlying(state);
         uint256 looseBalance = want.balanceOf(address(this));
         uint256 total = balanceUnderlying.add(looseBalance);
 
@@ -138,17 +179,17 @@ contract AlphaHomo is GenericLenderBase {
         }
 
         //not state changing but OK because of previous call
-        uint256 liquidity = bank.balance;
+        uint256 liquidity = state.balance;
 
         if (liquidity > 1) {
             uint256 toWithdraw = amount.sub(looseBalance);
 
             if (toWithdraw <= liquidity) {
                 //we can take all
-                withdrawUnderlying(toWithdraw);
+                withdrawUnderlying(state, toWithdraw);
             } else {
                 //take all we can
-                withdrawUnderlying(liquidity);
+                withdrawUnderlying(state, liquidity);
             }
         }
         looseBalance = want.balanceOf(address(this));
@@ -164,13 +205,11 @@ contract AlphaHomo is GenericLenderBase {
     }
 
     function withdrawAll() external override management returns (bool) {
-        uint256 invested = _nav();
-        Bank b = Bank(bank);
-     
-        uint256 balance = b.balanceOf(address(this));
-       
-        b.withdraw(balance);
-      
+        bankState memory state = _bankState();
+        uint256 invested = _nav(state);
+
+        Bank(bank).withdraw(state.shares);
+
         uint256 withdrawn = address(this).balance;
         IWETH(weth).deposit{value: withdrawn}();
         uint256 returned =want.balanceOf(address(this));
@@ -192,6 +231,27 @@ contract AlphaHomo is GenericLenderBase {
         return bankBal.add(wantBal) > dust;
     }
 
+    //nav, apr, hasAssets, weightedApr and aprAfterDeposit(depositAmount) from one read of the bank
+    function lenderState(uint256 depositAmount)
+        external
+        view
+        override
+        returns (
+            uint256,
+            uint256,
+            bool,
+            uint256,
+            uint256
+        )
+    {
+        bankState memory state = _bankState();
+        uint256 looseBalance = want.balanceOf(address(this));
+        uint256 lent = looseBalance.add(_underlying(state));
+        uint256 a = _apr(state, 0);
+
+        return (lent, a, state.shares.add(looseBalance) > dust, a.mul(lent), depositAmount == 0 ? a : _apr(state, depositAmount));
+    }
+
     function protectedTokens() internal view override returns (address[] memory) {
         address[] memory protected = new address[](2);
         protected[0] = address(want);
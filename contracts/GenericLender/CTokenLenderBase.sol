@@ -0,0 +1,231 @@
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import "../Interfaces/Compound/CErc20I.sol";
+import "../Interfaces/Compound/InterestRateModel.sol";
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/math/SafeMath.sol";
+import "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+
+import "./GenericLenderBase.sol";
+
+/********************
+ *   Everything the compound fork plugins have in common. nav, apr, withdrawals and the supply rate math
+ *   Works as is for erc20 markets. EthCTokenLenderBase wraps eth and CompRewardLenderBase sells comp
+ *
+ ********************* */
+
+abstract contract CTokenLenderBase is GenericLenderBase {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    uint256 internal constant blocksPerYear = 2_300_000;
+    address public constant weth = address(0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2);
+
+    CErc20I public cToken;
+
+    constructor(
+        address _strategy,
+        string memory name,
+        address _cToken
+    ) public GenericLenderBase(_strategy, name) {
+        _initializeCToken(_cToken);
+    }
+
+    function _initialize(
+        address _strategy,
+        string memory name,
+        address _cToken
+    ) internal {
+        _initialize(_strategy, name);
+        _initializeCToken(_cToken);
+    }
+
+    function _initializeCToken(address _cToken) internal {
+        cToken = CErc20I(_cToken);
+        _initializeMarket();
+    }
+
+    //anything the market needs before we can lend. adapters extend it
+    function _initializeMarket() internal virtual {
+        require(cToken.underlying() == address(want), "WRONG CTOKEN");
+
+        want.approve(address(cToken), uint256(-1));
+    }
+
+    /*** how want gets in and out of the cToken. the eth adapter wraps and unwraps here ***/
+
+    function _mint(uint256 amount) internal virtual {
+        cToken.mint(amount);
+    }
+
+    function _redeemUnderlying(uint256 amount) internal virtual {
+        cToken.redeemUnderlying(amount);
+    }
+
+    //erc20 markets are annualised, the eth markets have always quoted per block
+    function _aprScale() internal pure virtual returns (uint256) {
+        return blocksPerYear;
+    }
+
+    function _hasAssets(uint256 cTokens, uint256 looseBalance) internal view virtual returns (bool) {
+        return cTokens > 0 || looseBalance > 0;
+    }
+
+    function nav() external view override returns (uint256) {
+        return _nav();
+    }
+
+    function _nav() internal view returns (uint256) {
+        return want.balanceOf(address(this)).add(underlyingBalanceStored());
+    }
+
+    function underlyingBalanceStored() public view returns (uint256 balance) {
+        uint256 currentCr = cToken.balanceOf(address(this));
+        if (currentCr == 0) {
+            balance = 0;
+        } else {
+            balance = currentCr.mul(cToken.exchangeRateStored()).div(1e18);
+        }
+    }
+
+    function apr() external view override returns (uint256) {
+        return _apr();
+    }
+
+    function _apr() internal view returns (uint256) {
+        return cToken.supplyRatePerBlock().mul(_aprScale());
+    }
+
+    function weightedApr() external view override returns (uint256) {
+        uint256 a = _apr();
+        return a.mul(_nav());
+    }
+
+    function withdraw(uint256 amount) external override management returns (uint256) {
+        return _withdraw(amount);
+    }
+
+    //emergency withdraw. sends balance plus amount to governance
+    function emergencyWithdraw(uint256 amount) external override management {
+        _redeemUnderlying(amount);
+
+        want.safeTransfer(vault.governance(), want.balanceOf(address(this)));
+    }
+
+    //withdraw an amount including any want balance
+    function _withdraw(uint256 amount) internal returns (uint256) {
+        uint256 balanceUnderlying = cToken.balanceOfUnderlying(address(this));
+        uint256 looseBalance = want.balanceOf(address(this));
+        uint256 total = balanceUnderlying.add(looseBalance);
+
+        if (amount > total) {
+            //cant withdraw more than we own
+            amount = total;
+        }
+        if (looseBalance >= amount) {
+            want.safeTransfer(address(strategy), amount);
+            return amount;
+        }
+
+        //not state changing but OK because of previous call
+        uint256 liquidity = cToken.getCash();
+
+        if (liquidity > 1) {
+            uint256 toWithdraw = amount.sub(looseBalance);
+
+            if (toWithdraw <= liquidity) {
+                //we can take all
+                _redeemUnderlying(toWithdraw);
+            } else {
+                //take all we can
+                _redeemUnderlying(liquidity);
+            }
+        }
+        looseBalance = want.balanceOf(address(this));
+        want.safeTransfer(address(strategy), looseBalance);
+        return looseBalance;
+    }
+
+    function deposit() external override management {
+        _mint(want.balanceOf(address(this)));
+    }
+
+    function withdrawAll() external override management returns (bool) {
+        return _withdrawAll();
+    }
+
+    //takes what liquidity allows instead of reverting, so a force remove still works on an illiquid market
+    function _withdrawAll() internal virtual returns (bool) {
+        uint256 invested = _nav();
+        uint256 returned = _withdraw(invested);
+        return returned >= invested;
+    }
+
+    //think about this
+    function enabled() external view override returns (bool) {
+        return true;
+    }
+
+    function hasAssets() external view override returns (bool) {
+        return _hasAssets(cToken.balanceOf(address(this)), want.balanceOf(address(this)));
+    }
+
+    function aprAfterDeposit(uint256 amount) external view override returns (uint256) {
+        return _aprAfterDeposit(amount);
+    }
+
+    function aprAfterWithdraw(uint256 amount) external view override returns (uint256) {
+        return _aprAfterChange(amount, false);
+    }
+
+    function _aprAfterDeposit(uint256 amount) internal view returns (uint256) {
+        return _aprAfterChange(amount, true);
+    }
+
+    //supply apr once amount has been added to or taken out of the market's cash
+    function _aprAfterChange(uint256 amount, bool isDeposit) internal view virtual returns (uint256) {
+        uint256 cashPrior = cToken.getCash();
+        uint256 cash = isDeposit ? cashPrior.add(amount) : (cashPrior > amount ? cashPrior - amount : 0);
+
+        uint256 borrows = cToken.totalBorrows();
+        uint256 reserves = cToken.totalReserves();
+
+        uint256 reserverFactor = cToken.reserveFactorMantissa();
+        InterestRateModel model = cToken.interestRateModel();
+
+        //the supply rate is derived from the borrow rate, reserve factor and the amount of total borrows.
+        uint256 supplyRate = model.getSupplyRate(cash, borrows, reserves, reserverFactor);
+
+        return supplyRate.mul(_aprScale());
+    }
+
+    //nav, apr, hasAssets, weightedApr and aprAfterDeposit(depositAmount) from one read of the cToken.
+    //the rate model is only asked when there is a deposit to price
+    function lenderState(uint256 depositAmount)
+        external
+        view
+        override
+        returns (
+            uint256,
+            uint256,
+            bool,
+            uint256,
+            uint256
+        )
+    {
+        uint256 looseBalance = want.balanceOf(address(this));
+        uint256 currentCr = cToken.balanceOf(address(this));
+        uint256 lent = looseBalance.add(currentCr.mul(cToken.exchangeRateStored()).div(1e18));
+        uint256 a = _apr();
+
+        return (lent, a, _hasAssets(currentCr, looseBalance), a.mul(lent), depositAmount == 0 ? a : _aprAfterDeposit(depositAmount));
+    }
+
+    function protectedTokens() internal view virtual override returns (address[] memory) {
+        address[] memory protected = new address[](2);
+        protected[0] = address(want);
+        protected[1] = address(cToken);
+        return protected;
+    }
+}
@@ -0,0 +1,124 @@
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import "../Interfaces/Compound/ComptrollerI.sol";
+import "../Interfaces/UniswapInterfaces/IUniswapV2Router02.sol";
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/math/SafeMath.sol";
+import "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+
+import "./CTokenLenderBase.sol";
+
+/********************
+ *   CTokenLenderBase for markets that pay comp. Comp is left to pile up across withdrawals
+ *   and sold on its own keeper transaction once it is worth the gas, also after the lender is removed
+ *
+ ********************* */
+
+abstract contract CompRewardLenderBase is CTokenLenderBase {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    address public constant uniswapRouter = address(0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D);
+    address public constant comp = address(0xc00e94Cb662C3520282E6f5717214004A7f26888);
+    address public constant comptroller = address(0x3d9819210A31b4961b30EF54bE2aeD79B9c9Cd3B);
+
+    uint256 public minCompToSell;
+    //comp is only sold once it is worth this many times the keeper's gas cost
+    uint256 public compGasMultiple;
+    //gas harvestComp is taken to use and the gas price it is costed at. set by management, not the keeper's transaction
+    uint256 public compHarvestGas;
+    uint256 public compGasPrice;
+
+    function _initializeMarket() internal virtual override {
+        super._initializeMarket();
+
+        minCompToSell = 0.5 ether;
+        compGasMultiple = 100;
+        compHarvestGas = 300_000;
+        compGasPrice = 50 gwei;
+        IERC20(comp).safeApprove(uniswapRouter, uint256(-1));
+    }
+
+    function setMinCompToSell(uint256 _minCompToSell) external management {
+        minCompToSell = _minCompToSell;
+    }
+
+    function setCompGasMultiple(uint256 _compGasMultiple) external management {
+        compGasMultiple = _compGasMultiple;
+    }
+
+    function setCompHarvestGas(uint256 _compHarvestGas) external management {
+        compHarvestGas = _compHarvestGas;
+    }
+
+    function setCompGasPrice(uint256 _compGasPrice) external management {
+        compGasPrice = _compGasPrice;
+    }
+
+    //callCost is in eth, like the strategy's triggers
+    function harvestCompTrigger(uint256 callCost) external view returns (bool) {
+        uint256 _comp = IERC20(comp).balanceOf(address(this)).add(ComptrollerI(comptroller).compAccrued(address(this)));
+        return _compWorthSelling(_comp, callCost);
+    }
+
+    function _compWorthSelling(uint256 _comp, uint256 callCost) internal view returns (bool) {
+        if (_comp <= minCompToSell) {
+            return false;
+        }
+
+        address[] memory path = new address[](2);
+        path[0] = comp;
+        path[1] = weth;
+        uint256[] memory amounts = IUniswapV2Router02(uniswapRouter).getAmountsOut(_comp, path);
+
+        return amounts[1] > callCost.mul(compGasMultiple);
+    }
+
+    //minWantOut is worked out off chain by the keeper so the swap can't be sandwiched
+    //the trigger's thresholds are checked again at the configured gas price so comp can't be sold early
+    //once the lender is removed it holds no more than dust and the proceeds go back to the strategy
+    function harvestComp(uint256 minWantOut) external keepers {
+        CTokenI[] memory markets = new CTokenI[](1);
+        markets[0] = CTokenI(address(cToken));
+        ComptrollerI(comptroller).claimComp(address(this), markets);
+
+        uint256 _comp = IERC20(comp).balanceOf(address(this));
+        require(_compWorthSelling(_comp, compGasPrice.mul(compHarvestGas)), "!worth selling");
+        _sellComp(_comp, minWantOut);
+
+        uint256 balance = want.balanceOf(address(this));
+        if (balance == 0) {
+            return;
+        }
+        if (underlyingBalanceStored() > dust) {
+            _mint(balance);
+        } else {
+            want.safeTransfer(address(strategy), balance);
+        }
+    }
+
+    function _sellComp(uint256 _comp, uint256 minWantOut) internal {
+        address[] memory path;
+        if (address(want) == weth) {
+            path = new address[](2);
+            path[0] = comp;
+            path[1] = weth;
+        } else {
+            path = new address[](3);
+            path[0] = comp;
+            path[1] = weth;
+            path[2] = address(want);
+        }
+
+        IUniswapV2Router02(uniswapRouter).swapExactTokensForTokens(_comp, minWantOut, path, address(this), now);
+    }
+
+    function protectedTokens() internal view virtual override returns (address[] memory) {
+        address[] memory protected = new address[](3);
+        protected[0] = address(want);
+        protected[1] = address(cToken);
+        protected[2] = comp;
+        return protected;
+    }
+}
@@ -0,0 +1,70 @@
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import "../Interfaces/Compound/CEtherI.sol";
+import "../Interfaces/UniswapInterfaces/IWETH.sol";
+
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/math/SafeMath.sol";
+import "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+
+import "./CTokenLenderBase.sol";
+
+/********************
+ *   CTokenLenderBase for cEther markets. The strategy deals in weth so we unwrap to mint and wrap what we redeem
+ *
+ ********************* */
+
+abstract contract EthCTokenLenderBase is CTokenLenderBase {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    //to receive eth from weth and the cToken
+    receive() external payable {}
+
+    //cEther has no underlying() and takes eth by value so there is nothing to approve
+    function _initializeMarket() internal virtual override {
+        require(address(want) == weth, "NOT WETH");
+        dust = 10;
+    }
+
+    function _mint(uint256 amount) internal virtual override {
+        IWETH(weth).withdraw(amount);
+        CEtherI(address(cToken)).mint{value: amount}();
+    }
+
+    function _redeemUnderlying(uint256 amount) internal virtual override {
+        cToken.redeemUnderlying(amount);
+
+        //now turn to weth
+        IWETH(weth).deposit{value: address(this).balance}();
+    }
+
+    //redeem every cToken when the market can pay them out so nothing above dust is left to block removal.
+    //an illiquid market gives what cash it has
+    function _withdrawAll() internal virtual override returns (bool) {
+        uint256 invested = _nav();
+
+        if (cToken.balanceOfUnderlying(address(this)) <= cToken.getCash()) {
+            uint256 balance = cToken.balanceOf(address(this));
+            if (balance > 0) {
+                cToken.redeem(balance);
+                IWETH(weth).deposit{value: address(this).balance}();
+            }
+        } else {
+            _redeemUnderlying(cToken.getCash());
+        }
+
+        uint256 returned = want.balanceOf(address(this));
+        want.safeTransfer(address(strategy), returned);
+        return returned.add(dust) >= invested;
+    }
+
+    function _aprScale() internal pure virtual override returns (uint256) {
+        return 1;
+    }
+
+    function _hasAssets(uint256 cTokens, uint256) internal view virtual override returns (bool) {
+        return cTokens > dust;
+    }
+}
@@ -1,14 +1,7 @@
 pragma solidity 0.6.12;
 pragma experimental ABIEncoderV2;
 
-import "../Interfaces/Compound/CErc20I.sol";
-import "../Interfaces/Compound/InterestRateModel.sol";
-import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
-import "@openzeppelin/contracts/math/SafeMath.sol";
-import "@openzeppelin/contracts/utils/Address.sol";
-import "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
-
-import "./GenericLenderBase.sol";
+import "./CTokenLenderBase.sol";
 
 /********************
  *   A lender plugin for LenderYieldOptimiser for any erc20 asset on Cream (not eth)
@@ -17,141 +10,28 @@ import "./GenericLenderBase.sol";
  *
  ********************* */
 
-contract GenericCream is GenericLenderBase {
-    using SafeERC20 for IERC20;
-    using Address for address;
-    using SafeMath for uint256;
-
-    uint256 private constant blocksPerYear = 2_300_000;
-
-    CErc20I public cToken;
-
+contract GenericCream is CTokenLenderBase {
     constructor(
         address _strategy,
         string memory name,
         address _cToken
-    ) public GenericLenderBase(_strategy, name) {
-        cToken = CErc20I(_cToken);
-
-        require(cToken.underlying() == address(want), "WRONG CTOKEN");
-
-        want.approve(_cToken, uint256(-1));
-    }
-
-    function nav() external view override returns (uint256) {
-        return _nav();
-    }
-
-    function _nav() internal view returns (uint256) {
-        return want.balanceOf(address(this)).add(underlyingBalanceStored());
-    }
-
-    function underlyingBalanceStored() public view returns (uint256 balance) {
-        uint256 currentCr = cToken.balanceOf(address(this));
-        if (currentCr == 0) {
-            balance = 0;
-        } else {
-            balance = currentCr.mul(cToken.exchangeRateStored()).div(1e18);
-        }
-    }
-
-    function apr() external view override returns (uint256) {
-        return _apr();
-    }
-
-    function _apr() internal view returns (uint256) {
-        return cToken.supplyRatePerBlock().mul(blocksPerYear);
-    }
-
-    function weightedApr() external view override returns (uint256) {
-        uint256 a = _apr();
-        return a.mul(_nav());
-    }
-
-    function withdraw(uint256 amount) external override management returns (uint256) {
-        return _withdraw(amount);
-    }
-
-    //emergency withdraw. sends balance plus amount to governance
-    function emergencyWithdraw(uint256 amount) external override management {
-        cToken.redeemUnderlying(amount);
-
-        want.safeTransfer(vault.governance(), want.balanceOf(address(this)));
-    }
+    ) public CTokenLenderBase(_strategy, name, _cToken) {}
 
-    //withdraw an amount including any want balance
-    function _withdraw(uint256 amount) internal returns (uint256) {
-        uint256 balanceUnderlying = cToken.balanceOfUnderlying(address(this));
-        uint256 looseBalance = want.balanceOf(address(this));
-        uint256 total = balanceUnderlying.add(looseBalance);
-
-        if (amount > total) {
-            //cant withdraw more than we own
-            amount = total;
-        }
-        if (looseBalance >= amount) {
-            want.safeTransfer(address(strategy), amount);
-            return amount;
-        }
-
-        //not state changing but OK because of previous call
-        uint256 liquidity = want.balanceOf(address(cToken));
-
-        if (liquidity > 1) {
-            uint256 toWithdraw = amount.sub(looseBalance);
-
-            if (toWithdraw <= liquidity) {
-                //we can take all
-                cToken.redeemUnderlying(toWithdraw);
-            } else {
-                //take all we can
-                cToken.redeemUnderlying(liquidity);
-            }
-        }
-        looseBalance = want.balanceOf(address(this));
-        want.safeTransfer(address(strategy), looseBalance);
-        return looseBalance;
-    }
-
-    function deposit() external override management {
-        uint256 balance = want.balanceOf(address(this));
-        cToken.mint(balance);
-    }
-
-    function withdrawAll() external override management returns (bool) {
-        uint256 invested = _nav();
-        uint256 returned = _withdraw(invested);
-        return returned >= invested;
-    }
-
-    //think about this
-    function enabled() external view override returns (bool) {
-        return true;
-    }
-
-    function hasAssets() external view override returns (bool) {
-        return cToken.balanceOf(address(this)) > 0;
-    }
-
-    function aprAfterDeposit(uint256 amount) external view override returns (uint256) {
-        uint256 cashPrior = want.balanceOf(address(cToken));
-
-        uint256 borrows = cToken.totalBorrows();
-        uint256 reserves = cToken.totalReserves();
-
-        uint256 reserverFactor = cToken.reserveFactorMantissa();
-        InterestRateModel model = cToken.interestRateModel();
-
-        //the supply rate is derived from the borrow rate, reserve factor and the amount of total borrows.
-        uint256 supplyRate = model.getSupplyRate(cashPrior.add(amount), borrows, reserves, reserverFactor);
-
-        return supplyRate.mul(blocksPerYear);
+    function initialize(
+        address _strategy,
+        string memory name,
+        address _cToken
+    ) external {
+        _initialize(_strategy, name, _cToken);
     }
 
-    function protectedTokens() internal view override returns (address[] memory) {
-        address[] memory protected = new address[](2);
-        protected[0] = address(want);
-        protected[1] = address(cToken);
-        return protected;
+    //a new market or strategy for the price of a minimal proxy
+    function cloneCreamLender(
+        address _strategy,
+        string memory name,
+        address _cToken
+    ) external returns (address newLender) {
+        newLender = _clone();
+        GenericCream(newLender).initialize(_strategy, name, _cToken);
     }
 }
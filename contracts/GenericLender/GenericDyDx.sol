@@ -55,14 +55,15 @@ contract GenericDyDx is GenericLenderBase {
         return want.balanceOf(address(this)).add(underlying);
     }
 
+    //only our own market. does not grow with the number of solo markets
     function underlyingBalanceStored() public view returns (uint256) {
-        (address[] memory cur, , Types.Wei[] memory balance) = ISoloMargin(SOLO).getAccountBalances(_getAccountInfo());
+        Types.Wei memory balance = ISoloMargin(SOLO).getAccountWei(_getAccountInfo(), dydxMarketId);
 
-        for (uint256 i = 0; i < cur.length; i++) {
-            if (cur[i] == address(want)) {
-                return balance[i].value;
-            }
+        //we never borrow so a negative balance should not happen
+        if (!balance.sign) {
+            return 0;
         }
+        return balance.value;
     }
 
     function apr() external view override returns (uint256) {
@@ -168,19 +169,74 @@ contract GenericDyDx is GenericLenderBase {
         return _apr(amount);
     }
 
+    function aprAfterWithdraw(uint256 amount) external view override returns (uint256) {
+        (uint256 borrow, uint256 supply, address interestSetter) = _marketState();
+
+        //supply can't drop below what is borrowed
+        uint256 remaining = supply > amount ? supply - amount : 0;
+        if (remaining < borrow) {
+            remaining = borrow;
+        }
+        if (remaining == 0) {
+            return 0;
+        }
+        return _aprFrom(borrow, remaining, interestSetter);
+    }
+
     function _apr(uint256 extraSupply) internal view returns (uint256) {
+        (uint256 borrow, uint256 supply, address interestSetter) = _marketState();
+        return _aprFrom(borrow, supply.add(extraSupply), interestSetter);
+    }
+
+    //solo's totals for our market. read once and shared between apr and aprAfterDeposit
+    function _marketState()
+        internal
+        view
+        returns (
+            uint256 borrow,
+            uint256 supply,
+            address interestSetter
+        )
+    {
         ISoloMargin solo = ISoloMargin(SOLO);
         Types.TotalPar memory par = solo.getMarketTotalPar(dydxMarketId);
         Interest.Index memory index = solo.getMarketCurrentIndex(dydxMarketId);
-        address interestSetter = solo.getMarketInterestSetter(dydxMarketId);
-        uint256 borrow = uint256(par.borrow).mul(index.borrow).div(1e18);
-        uint256 supply = (uint256(par.supply).mul(index.supply).div(1e18)).add(extraSupply);
+        interestSetter = solo.getMarketInterestSetter(dydxMarketId);
+        borrow = uint256(par.borrow).mul(index.borrow).div(1e18);
+        supply = uint256(par.supply).mul(index.supply).div(1e18);
+    }
 
+    function _aprFrom(
+        uint256 borrow,
+        uint256 supply,
+        address interestSetter
+    ) internal view returns (uint256) {
         uint256 borrowInterestRate = IInterestSetter(interestSetter).getInterestRate(address(want), borrow, supply).value;
         uint256 lendInterestRate = borrowInterestRate.mul(borrow).div(supply);
         return lendInterestRate.mul(secondsPerBlock);
     }
 
+    //nav, apr, hasAssets, weightedApr and aprAfterDeposit(depositAmount) from one read of solo
+    function lenderState(uint256 depositAmount)
+        external
+        view
+        override
+        returns (
+            uint256,
+            uint256,
+            bool,
+            uint256,
+            uint256
+        )
+    {
+        uint256 underlying = underlyingBalanceStored();
+        uint256 lent = want.balanceOf(address(this)).add(underlying);
+        (uint256 borrow, uint256 supply, address interestSetter) = _marketState();
+        uint256 a = _aprFrom(borrow, supply, interestSetter);
+
+        return (lent, a, underlying > 0, a.mul(lent), depositAmount == 0 ? a : _aprFrom(borrow, supply.add(depositAmount), interestSetter));
+    }
+
     function protectedTokens() internal view override returns (address[] memory) {
         address[] memory protected = new address[](1);
         protected[0] = address(want);
@@ -34,7 +34,16 @@ abstract contract GenericLenderBase is IGenericLender {
 
     uint256 public dust;
 
+    event Cloned(address indexed clone);
+
     constructor(address _strategy, string memory name) public {
+        _initialize(_strategy, name);
+    }
+
+    //clones never run the constructor so they set themselves up through here
+    function _initialize(address _strategy, string memory name) internal {
+        require(address(strategy) == address(0), "Lender already initialized");
+
         strategy = _strategy;
         vault = VaultAPI(IBaseStrategy(strategy).vault());
         want = IERC20(vault.token());
@@ -44,6 +53,21 @@ abstract contract GenericLenderBase is IGenericLender {
         want.approve(_strategy, uint256(-1));
     }
 
+    //eip-1167 minimal proxy delegating to this contract. the caller has to initialize it
+    function _clone() internal returns (address newLender) {
+        bytes20 addressBytes = bytes20(address(this));
+        assembly {
+            let clone_code := mload(0x40)
+            mstore(clone_code, 0x3d602d80600a3d3981f3363d3d373d3d3d363d73000000000000000000000000)
+            mstore(add(clone_code, 0x14), addressBytes)
+            mstore(add(clone_code, 0x28), 0x5af43d82803e903d91602b57fd5bf30000000000000000000000000000000000)
+            newLender := create(0, clone_code, 0x37)
+        }
+        require(newLender != address(0), "CLONE FAILED");
+
+        emit Cloned(newLender);
+    }
+
     function setDust(uint256 _dust) external override virtual management {
         dust = _dust;
     }
@@ -62,4 +86,9 @@ abstract contract GenericLenderBase is IGenericLender {
         require(msg.sender == address(strategy) || msg.sender == vault.governance() || msg.sender == IBaseStrategy(strategy).strategist(), "!management");
         _;
     }
+
+    modifier keepers() {
+        require(msg.sender == IBaseStrategy(strategy).keeper() || msg.sender == vault.governance() || msg.sender == IBaseStrategy(strategy).strategist(), "!keepers");
+        _;
+    }
 }
@@ -25,6 +25,20 @@ interface IGenericLender {
 
     function aprAfterDeposit(uint256 amount) external view returns (uint256);
 
+    function aprAfterWithdraw(uint256 amount) external view returns (uint256);
+
+    //(nav, apr, hasAssets, weightedApr, aprAfterDeposit(depositAmount)) in one call. the last is apr when depositAmount is 0
+    function lenderState(uint256 depositAmount)
+        external
+        view
+        returns (
+            uint256,
+            uint256,
+            bool,
+            uint256,
+            uint256
+        );
+
     function setDust(uint256 _dust) external;
 
     function sweep(address _token) external;
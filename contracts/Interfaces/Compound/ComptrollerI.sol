@@ -135,6 +135,8 @@ interface ComptrollerI {
 
     function claimComp(address holder, CTokenI[] memory cTokens) external;
 
+    function compAccrued(address holder) external view returns (uint256);
+
     function markets(address ctoken)
         external
         view
@@ -0,0 +1,13 @@
+pragma solidity 0.6.12;
+
+import "./InterestRateModel.sol";
+
+interface JumpRateModelI is InterestRateModel {
+    function baseRatePerBlock() external view returns (uint256);
+
+    function multiplierPerBlock() external view returns (uint256);
+
+    function jumpMultiplierPerBlock() external view returns (uint256);
+
+    function kink() external view returns (uint256);
+}
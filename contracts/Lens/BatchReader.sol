@@ -0,0 +1,28 @@
+// SPDX-License-Identifier: GPL-3.0
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+/********************
+ *
+ *   Never deployed. eth_call the creation code with the calls as constructor
+ *   arguments and the constructor returns every result instead of runtime code.
+ *   Works on any node and at any block without a multicall contract
+ *
+ ********************* */
+
+contract BatchReader {
+    constructor(address[] memory targets, bytes[] memory data) public {
+        require(targets.length == data.length, "LENGTH");
+        bool[] memory success = new bool[](targets.length);
+        bytes[] memory results = new bytes[](targets.length);
+
+        for (uint256 i = 0; i < targets.length; i++) {
+            (success[i], results[i]) = targets[i].staticcall(data[i]);
+        }
+
+        bytes memory encoded = abi.encode(success, results);
+        assembly {
+            return(add(encoded, 32), mload(encoded))
+        }
+    }
+}
@@ -0,0 +1,108 @@
+// SPDX-License-Identifier: GPL-3.0
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import "../Strategy.sol";
+
+interface IVaultState {
+    function totalAssets() external view returns (uint256);
+
+    function totalDebt() external view returns (uint256);
+}
+
+interface IDecimals {
+    function decimals() external view returns (uint8);
+}
+
+/********************
+ *
+ *   Read only lens for the lender optimisation strategy
+ *   Everything the monitoring scripts print in one eth_call
+ *   Deployed separately so the strategy bytecode does not grow
+ *
+ ********************* */
+
+contract StrategyLens {
+    //numeric fields that reverted in the strategy are reported as this
+    uint256 public constant FAILED = uint256(-1);
+
+    struct StrategyReport {
+        string name;
+        uint256 decimals;
+        uint256 looseWant;
+        uint256 estimatedTotalAssets;
+        StrategyParams params;
+        uint256 ironBankBorrowRate;
+        uint256 currentSupplyRate;
+        uint256 ironBankDebt;
+        bool borrowMore;
+        uint256 creditAmount;
+        bool harvestTrigger;
+        bool harvestTriggerFailed;
+        bool tendTrigger;
+        bool tendTriggerFailed;
+        bool emergencyExit;
+        Strategy.lendStatus[] lendStatuses;
+    }
+
+    struct VaultReport {
+        uint256 totalAssets;
+        uint256 totalDebt;
+        uint256 looseWant;
+    }
+
+    //callCost is in wei like the keepers pass to harvestTrigger/tendTrigger.
+    //the rate and trigger reads can revert, e.g. currentSupplyRate with no assets, so they don't take the report down with them
+    function strategyReport(address _strategy, uint256 callCost) public view returns (StrategyReport memory report) {
+        Strategy strategy = Strategy(_strategy);
+        address want = address(strategy.want());
+
+        report.name = strategy.name();
+        report.decimals = IDecimals(want).decimals();
+        report.looseWant = IERC20(want).balanceOf(_strategy);
+        report.estimatedTotalAssets = strategy.estimatedTotalAssets();
+        report.params = strategy.vault().strategies(_strategy);
+        report.ironBankBorrowRate = strategy.ironBankBorrowRate(0, true);
+        try strategy.currentSupplyRate() returns (uint256 rate) {
+            report.currentSupplyRate = rate;
+        } catch {
+            report.currentSupplyRate = FAILED;
+        }
+        report.ironBankDebt = strategy.ironBankOutstandingDebtStored();
+        try strategy.internalCreditOfficer() returns (bool borrowMore, uint256 amount) {
+            (report.borrowMore, report.creditAmount) = (borrowMore, amount);
+        } catch {
+            report.creditAmount = FAILED;
+        }
+        try strategy.harvestTrigger(callCost) returns (bool trigger) {
+            report.harvestTrigger = trigger;
+        } catch {
+            report.harvestTriggerFailed = true;
+        }
+        try strategy.tendTrigger(callCost) returns (bool trigger) {
+            report.tendTrigger = trigger;
+        } catch {
+            report.tendTriggerFailed = true;
+        }
+        report.emergencyExit = strategy.emergencyExit();
+        report.lendStatuses = strategy.lendStatuses();
+    }
+
+    function vaultReport(address _vault) public view returns (VaultReport memory report) {
+        IVaultState vault = IVaultState(_vault);
+        report.totalAssets = vault.totalAssets();
+        report.totalDebt = vault.totalDebt();
+        report.looseWant = IERC20(VaultAPI(_vault).token()).balanceOf(_vault);
+    }
+
+    //the strategy must belong to the vault
+    function fullReport(address _strategy, address _vault, uint256 callCost)
+        external
+        view
+        returns (StrategyReport memory strategyState, VaultReport memory vaultState)
+    {
+        require(address(Strategy(_strategy).vault()) == _vault, "WRONG VAULT");
+        strategyState = strategyReport(_strategy, callCost);
+        vaultState = vaultReport(_vault);
+    }
+}
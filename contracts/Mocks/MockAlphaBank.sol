@@ -0,0 +1,146 @@
+// SPDX-License-Identifier: GPL-3.0
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+
+import "../Interfaces/alpha-homora/BankConfig.sol";
+
+/********************
+ *   Alpha Homora v1 Bank for local tests. Copied to the mainnet bank address
+ *   ibETH shares over totalETH, debt accrues per second from the config and a share of it goes to the reserve
+ *   Positions are not modelled. borrowDemand stands in for leveraged farmers
+ ********************* */
+
+contract MockAlphaBank {
+    using SafeMath for uint256;
+
+    string public constant name = "Interest Bearing ETH";
+    string public constant symbol = "ibETH";
+    uint8 public constant decimals = 18;
+
+    address public owner;
+    BankConfig public config;
+    uint256 public glbDebtShare;
+    uint256 public glbDebtVal;
+    uint256 public lastAccrueTime;
+    uint256 public reservePool;
+    uint256 public totalSupply;
+
+    mapping(address => uint256) public balanceOf;
+    mapping(address => mapping(address => uint256)) public allowance;
+
+    event Transfer(address indexed from, address indexed to, uint256 value);
+    event Approval(address indexed owner, address indexed spender, uint256 value);
+
+    modifier accrue(uint256 msgValue) {
+        if (now > lastAccrueTime) {
+            uint256 interest = pendingInterest(msgValue);
+            uint256 toReserve = interest.mul(config.getReservePoolBps()).div(10000);
+            reservePool = reservePool.add(toReserve);
+            glbDebtVal = glbDebtVal.add(interest);
+            lastAccrueTime = now;
+        }
+        _;
+    }
+
+    function initialize(BankConfig _config) external {
+        require(owner == address(0), "INITIALIZED");
+        owner = msg.sender;
+        config = _config;
+        lastAccrueTime = now;
+    }
+
+    function pendingInterest(uint256 msgValue) public view returns (uint256) {
+        if (now > lastAccrueTime) {
+            uint256 timePast = now.sub(lastAccrueTime);
+            uint256 balance = address(this).balance.sub(msgValue);
+            uint256 ratePerSec = config.getInterestRate(glbDebtVal, balance);
+            return ratePerSec.mul(glbDebtVal).mul(timePast).div(1e18);
+        } else {
+            return 0;
+        }
+    }
+
+    function debtShareToVal(uint256 debtShare) public view returns (uint256) {
+        if (glbDebtShare == 0) return debtShare;
+        return debtShare.mul(glbDebtVal).div(glbDebtShare);
+    }
+
+    function debtValToShare(uint256 debtVal) public view returns (uint256) {
+        if (glbDebtShare == 0) return debtVal;
+        return debtVal.mul(glbDebtShare).div(glbDebtVal);
+    }
+
+    function totalETH() public view returns (uint256) {
+        return address(this).balance.add(glbDebtVal).sub(reservePool);
+    }
+
+    function deposit() external payable accrue(msg.value) {
+        uint256 total = totalETH().sub(msg.value);
+        uint256 share = total == 0 ? msg.value : msg.value.mul(totalSupply).div(total);
+        totalSupply = totalSupply.add(share);
+        balanceOf[msg.sender] = balanceOf[msg.sender].add(share);
+        emit Transfer(address(0), msg.sender, share);
+    }
+
+    function withdraw(uint256 share) external accrue(0) {
+        uint256 amount = share.mul(totalETH()).div(totalSupply);
+        balanceOf[msg.sender] = balanceOf[msg.sender].sub(share, "BALANCE");
+        totalSupply = totalSupply.sub(share);
+        emit Transfer(msg.sender, address(0), share);
+
+        (bool success, ) = msg.sender.call{value: amount}("");
+        require(success, "eth transfer failed");
+    }
+
+    /*****************
+     * Test helpers. Stand in for leveraged positions
+     ******************/
+
+    function borrowDemand(uint256 amount) external accrue(0) {
+        require(msg.sender == owner, "!owner");
+        uint256 debtShare = debtValToShare(amount);
+        glbDebtShare = glbDebtShare.add(debtShare);
+        glbDebtVal = glbDebtVal.add(amount);
+
+        (bool success, ) = msg.sender.call{value: amount}("");
+        require(success, "eth transfer failed");
+    }
+
+    /*****************
+     * ERC20
+     ******************/
+
+    function approve(address spender, uint256 amount) external returns (bool) {
+        allowance[msg.sender][spender] = amount;
+        emit Approval(msg.sender, spender, amount);
+        return true;
+    }
+
+    function transfer(address to, uint256 amount) external returns (bool) {
+        _transfer(msg.sender, to, amount);
+        return true;
+    }
+
+    function transferFrom(
+        address from,
+        address to,
+        uint256 amount
+    ) external returns (bool) {
+        if (allowance[from][msg.sender] != uint256(-1)) {
+            allowance[from][msg.sender] = allowance[from][msg.sender].sub(amount, "ALLOWANCE");
+        }
+        _transfer(from, to, amount);
+        return true;
+    }
+
+    function _transfer(
+        address from,
+        address to,
+        uint256 amount
+    ) internal {
+        balanceOf[from] = balanceOf[from].sub(amount, "BALANCE");
+        balanceOf[to] = balanceOf[to].add(amount);
+        emit Transfer(from, to, amount);
+    }
+}
@@ -0,0 +1,37 @@
+// SPDX-License-Identifier: GPL-3.0
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+
+/********************
+ *   Alpha Homora bank config for local tests. TripleSlopeModel rates and a fixed reserve share
+ ********************* */
+
+contract MockBankConfig {
+    using SafeMath for uint256;
+
+    uint256 public getReservePoolBps;
+
+    constructor(uint256 _reservePoolBps) public {
+        getReservePoolBps = _reservePoolBps;
+    }
+
+    //interest per second scaled by 1e18
+    function getInterestRate(uint256 debt, uint256 floating) external pure returns (uint256) {
+        uint256 total = debt.add(floating);
+        uint256 utilization = total == 0 ? 0 : debt.mul(10000).div(total);
+        if (utilization < 8000) {
+            // Less than 80% utilization - 0%-10% APY
+            return utilization.mul(10e16).div(8000) / 365 days;
+        } else if (utilization < 9000) {
+            // Between 80% and 90% - 10% APY
+            return uint256(10e16) / 365 days;
+        } else if (utilization < 10000) {
+            // Between 90% and 100% - 10%-50% APY
+            return (10e16 + utilization.sub(9000).mul(40e16).div(1000)) / 365 days;
+        } else {
+            // Not possible, but just in case - 50% APY
+            return uint256(50e16) / 365 days;
+        }
+    }
+}
@@ -0,0 +1,56 @@
+// SPDX-License-Identifier: GPL-3.0
+pragma solidity 0.6.12;
+
+import "./MockCTokenBase.sol";
+
+/********************
+ *   CEther for local tests. Copied to the crETH and cETH addresses
+ ********************* */
+
+contract MockCEther is MockCTokenBase {
+    function initialize(
+        address _comptroller,
+        InterestRateModel _interestRateModel,
+        uint256 _initialExchangeRateMantissa,
+        uint256 _reserveFactorMantissa,
+        string memory _name,
+        string memory _symbol
+    ) external {
+        _initialize(_comptroller, _interestRateModel, _initialExchangeRateMantissa, _reserveFactorMantissa, _name, _symbol);
+    }
+
+    //real cether reverts when mint fails
+    function mint() external payable {
+        require(_mint(msg.sender, msg.value) == 0, "mint failed");
+    }
+
+    function redeem(uint256 redeemTokens) external returns (uint256) {
+        return _redeem(msg.sender, redeemTokens, 0);
+    }
+
+    function redeemUnderlying(uint256 redeemAmount) external returns (uint256) {
+        return _redeem(msg.sender, 0, redeemAmount);
+    }
+
+    function borrow(uint256 borrowAmount) external returns (uint256) {
+        return _borrow(msg.sender, borrowAmount);
+    }
+
+    function repayBorrow() external payable {
+        require(_repay(msg.sender, msg.sender, msg.value) == 0, "repay failed");
+    }
+
+    //eth sent with the call is not cash yet
+    function _getCashPrior() internal view override returns (uint256) {
+        return address(this).balance.sub(msg.value);
+    }
+
+    function _doTransferIn(address, uint256 amount) internal override {
+        require(msg.value == amount, "value mismatch");
+    }
+
+    function _doTransferOut(address payable to, uint256 amount) internal override {
+        (bool success, ) = to.call{value: amount}("");
+        require(success, "eth transfer failed");
+    }
+}
@@ -0,0 +1,66 @@
+// SPDX-License-Identifier: GPL-3.0
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+
+import "./MockCTokenBase.sol";
+
+/********************
+ *   CErc20 for local tests. Used for compound, cream and iron bank markets
+ ********************* */
+
+contract MockCToken is MockCTokenBase {
+    using SafeERC20 for IERC20;
+
+    address public underlying;
+
+    function initialize(
+        address _underlying,
+        address _comptroller,
+        InterestRateModel _interestRateModel,
+        uint256 _initialExchangeRateMantissa,
+        uint256 _reserveFactorMantissa,
+        string memory _name,
+        string memory _symbol
+    ) external {
+        _initialize(_comptroller, _interestRateModel, _initialExchangeRateMantissa, _reserveFactorMantissa, _name, _symbol);
+        underlying = _underlying;
+    }
+
+    function mint(uint256 mintAmount) external returns (uint256) {
+        return _mint(msg.sender, mintAmount);
+    }
+
+    function redeem(uint256 redeemTokens) external returns (uint256) {
+        return _redeem(msg.sender, redeemTokens, 0);
+    }
+
+    function redeemUnderlying(uint256 redeemAmount) external returns (uint256) {
+        return _redeem(msg.sender, 0, redeemAmount);
+    }
+
+    function borrow(uint256 borrowAmount) external returns (uint256) {
+        return _borrow(msg.sender, borrowAmount);
+    }
+
+    function repayBorrow(uint256 repayAmount) external returns (uint256) {
+        return _repay(msg.sender, msg.sender, repayAmount);
+    }
+
+    function repayBorrowBehalf(address borrower, uint256 repayAmount) external returns (uint256) {
+        return _repay(msg.sender, borrower, repayAmount);
+    }
+
+    function _getCashPrior() internal view override returns (uint256) {
+        return IERC20(underlying).balanceOf(address(this));
+    }
+
+    function _doTransferIn(address from, uint256 amount) internal override {
+        IERC20(underlying).safeTransferFrom(from, address(this), amount);
+    }
+
+    function _doTransferOut(address payable to, uint256 amount) internal override {
+        IERC20(underlying).safeTransfer(to, amount);
+    }
+}
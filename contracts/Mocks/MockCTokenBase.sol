@@ -0,0 +1,303 @@
+// SPDX-License-Identifier: GPL-3.0
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+
+import "../Interfaces/Compound/InterestRateModel.sol";
+import "./MockComptroller.sol";
+
+/********************
+ *   Shared cToken logic for the local mocks. Follows Compound's CToken accounting:
+ *   per block interest accrual, an exchange rate from cash + borrows - reserves and a borrow index
+ *   Errors that compound returns as codes are returned as codes. Everything else reverts
+ *   Storage is only written in initialize so the code can be copied to a fixed mainnet address
+ ********************* */
+
+abstract contract MockCTokenBase {
+    using SafeMath for uint256;
+
+    struct BorrowSnapshot {
+        uint256 principal;
+        uint256 interestIndex;
+    }
+
+    uint8 public constant decimals = 8;
+    uint256 internal constant INSUFFICIENT_CASH = 14;
+
+    string public name;
+    string public symbol;
+    address public admin;
+    MockComptroller public comptroller;
+    InterestRateModel public interestRateModel;
+    uint256 public initialExchangeRateMantissa;
+    uint256 public reserveFactorMantissa;
+    uint256 public accrualBlockNumber;
+    uint256 public borrowIndex;
+    uint256 public totalBorrows;
+    uint256 public totalReserves;
+    uint256 public totalSupply;
+
+    mapping(address => uint256) public balanceOf;
+    mapping(address => mapping(address => uint256)) public allowance;
+    mapping(address => BorrowSnapshot) internal accountBorrows;
+
+    event Transfer(address indexed from, address indexed to, uint256 amount);
+    event Approval(address indexed owner, address indexed spender, uint256 amount);
+
+    modifier onlyAdmin() {
+        require(msg.sender == admin, "!admin");
+        _;
+    }
+
+    function _initialize(
+        address _comptroller,
+        InterestRateModel _interestRateModel,
+        uint256 _initialExchangeRateMantissa,
+        uint256 _reserveFactorMantissa,
+        string memory _name,
+        string memory _symbol
+    ) internal {
+        require(accrualBlockNumber == 0, "INITIALIZED");
+        admin = msg.sender;
+        comptroller = MockComptroller(_comptroller);
+        interestRateModel = _interestRateModel;
+        initialExchangeRateMantissa = _initialExchangeRateMantissa;
+        reserveFactorMantissa = _reserveFactorMantissa;
+        name = _name;
+        symbol = _symbol;
+        accrualBlockNumber = block.number;
+        borrowIndex = 1e18;
+    }
+
+    function _getCashPrior() internal view virtual returns (uint256);
+
+    function _doTransferIn(address from, uint256 amount) internal virtual;
+
+    function _doTransferOut(address payable to, uint256 amount) internal virtual;
+
+    /*****************
+     * Views
+     ******************/
+
+    function getCash() external view returns (uint256) {
+        return _getCashPrior();
+    }
+
+    function borrowRatePerBlock() public view returns (uint256) {
+        return interestRateModel.getBorrowRate(_getCashPrior(), totalBorrows, totalReserves);
+    }
+
+    function supplyRatePerBlock() public view returns (uint256) {
+        return interestRateModel.getSupplyRate(_getCashPrior(), totalBorrows, totalReserves, reserveFactorMantissa);
+    }
+
+    function exchangeRateStored() public view returns (uint256) {
+        if (totalSupply == 0) {
+            return initialExchangeRateMantissa;
+        }
+        return _getCashPrior().add(totalBorrows).sub(totalReserves).mul(1e18).div(totalSupply);
+    }
+
+    function borrowBalanceStored(address account) public view returns (uint256) {
+        BorrowSnapshot storage snapshot = accountBorrows[account];
+        if (snapshot.principal == 0) {
+            return 0;
+        }
+        return snapshot.principal.mul(borrowIndex).div(snapshot.interestIndex);
+    }
+
+    function getAccountSnapshot(address account)
+        external
+        view
+        returns (
+            uint256,
+            uint256,
+            uint256,
+            uint256
+        )
+    {
+        return (0, balanceOf[account], borrowBalanceStored(account), exchangeRateStored());
+    }
+
+    /*****************
+     * Accrual
+     ******************/
+
+    function accrueInterest() public returns (uint256) {
+        uint256 blockDelta = block.number.sub(accrualBlockNumber);
+        if (blockDelta == 0) {
+            return 0;
+        }
+
+        uint256 borrowRate = interestRateModel.getBorrowRate(_getCashPrior(), totalBorrows, totalReserves);
+        uint256 simpleInterestFactor = borrowRate.mul(blockDelta);
+        uint256 interestAccumulated = simpleInterestFactor.mul(totalBorrows).div(1e18);
+
+        totalBorrows = totalBorrows.add(interestAccumulated);
+        totalReserves = reserveFactorMantissa.mul(interestAccumulated).div(1e18).add(totalReserves);
+        borrowIndex = simpleInterestFactor.mul(borrowIndex).div(1e18).add(borrowIndex);
+        accrualBlockNumber = block.number;
+        return 0;
+    }
+
+    function exchangeRateCurrent() external returns (uint256) {
+        accrueInterest();
+        return exchangeRateStored();
+    }
+
+    function balanceOfUnderlying(address owner) external returns (uint256) {
+        accrueInterest();
+        return balanceOf[owner].mul(exchangeRateStored()).div(1e18);
+    }
+
+    function borrowBalanceCurrent(address account) external returns (uint256) {
+        accrueInterest();
+        return borrowBalanceStored(account);
+    }
+
+    function totalBorrowsCurrent() external returns (uint256) {
+        accrueInterest();
+        return totalBorrows;
+    }
+
+    /*****************
+     * Market actions
+     ******************/
+
+    function _mint(address minter, uint256 mintAmount) internal returns (uint256) {
+        accrueInterest();
+        uint256 mintTokens = mintAmount.mul(1e18).div(exchangeRateStored());
+        _doTransferIn(minter, mintAmount);
+
+        totalSupply = totalSupply.add(mintTokens);
+        balanceOf[minter] = balanceOf[minter].add(mintTokens);
+        emit Transfer(address(this), minter, mintTokens);
+        return 0;
+    }
+
+    function _redeem(
+        address payable redeemer,
+        uint256 redeemTokensIn,
+        uint256 redeemAmountIn
+    ) internal returns (uint256) {
+        accrueInterest();
+        uint256 exchangeRate = exchangeRateStored();
+
+        uint256 redeemTokens;
+        uint256 redeemAmount;
+        if (redeemTokensIn > 0) {
+            redeemTokens = redeemTokensIn;
+            redeemAmount = redeemTokensIn.mul(exchangeRate).div(1e18);
+        } else {
+            redeemTokens = redeemAmountIn.mul(1e18).div(exchangeRate);
+            redeemAmount = redeemAmountIn;
+        }
+
+        if (_getCashPrior() < redeemAmount) {
+            return INSUFFICIENT_CASH;
+        }
+
+        balanceOf[redeemer] = balanceOf[redeemer].sub(redeemTokens, "REDEEM TOO MUCH");
+        totalSupply = totalSupply.sub(redeemTokens);
+        _doTransferOut(redeemer, redeemAmount);
+        emit Transfer(redeemer, address(this), redeemTokens);
+        return 0;
+    }
+
+    function _borrow(address payable borrower, uint256 borrowAmount) internal returns (uint256) {
+        accrueInterest();
+        uint256 allowed = comptroller.borrowAllowed(address(this), borrower, borrowAmount);
+        if (allowed != 0) {
+            return allowed;
+        }
+        if (_getCashPrior() < borrowAmount) {
+            return INSUFFICIENT_CASH;
+        }
+
+        BorrowSnapshot storage snapshot = accountBorrows[borrower];
+        snapshot.principal = borrowBalanceStored(borrower).add(borrowAmount);
+        snapshot.interestIndex = borrowIndex;
+        totalBorrows = totalBorrows.add(borrowAmount);
+
+        _doTransferOut(borrower, borrowAmount);
+        return 0;
+    }
+
+    function _repay(
+        address payer,
+        address borrower,
+        uint256 repayAmount
+    ) internal returns (uint256) {
+        accrueInterest();
+        uint256 owed = borrowBalanceStored(borrower);
+        if (repayAmount == uint256(-1)) {
+            repayAmount = owed;
+        }
+        _doTransferIn(payer, repayAmount);
+
+        BorrowSnapshot storage snapshot = accountBorrows[borrower];
+        snapshot.principal = owed.sub(repayAmount, "REPAY TOO MUCH");
+        snapshot.interestIndex = borrowIndex;
+        totalBorrows = totalBorrows > repayAmount ? totalBorrows - repayAmount : 0;
+        return 0;
+    }
+
+    /*****************
+     * Test helpers. Stand in for the rest of the market
+     ******************/
+
+    //borrow without collateral checks. moves utilisation the way other borrowers would
+    function borrowDemand(uint256 amount) external onlyAdmin {
+        accrueInterest();
+        require(_getCashPrior() >= amount, "NO CASH");
+        totalBorrows = totalBorrows.add(amount);
+        _doTransferOut(msg.sender, amount);
+    }
+
+    function _setReserveFactor(uint256 newReserveFactorMantissa) external onlyAdmin {
+        accrueInterest();
+        reserveFactorMantissa = newReserveFactorMantissa;
+    }
+
+    function _setInterestRateModel(InterestRateModel newInterestRateModel) external onlyAdmin {
+        accrueInterest();
+        interestRateModel = newInterestRateModel;
+    }
+
+    /*****************
+     * ERC20
+     ******************/
+
+    function approve(address spender, uint256 amount) external returns (bool) {
+        allowance[msg.sender][spender] = amount;
+        emit Approval(msg.sender, spender, amount);
+        return true;
+    }
+
+    function transfer(address to, uint256 amount) external returns (bool) {
+        _transfer(msg.sender, to, amount);
+        return true;
+    }
+
+    function transferFrom(
+        address from,
+        address to,
+        uint256 amount
+    ) external returns (bool) {
+        if (allowance[from][msg.sender] != uint256(-1)) {
+            allowance[from][msg.sender] = allowance[from][msg.sender].sub(amount, "ALLOWANCE");
+        }
+        _transfer(from, to, amount);
+        return true;
+    }
+
+    function _transfer(
+        address from,
+        address to,
+        uint256 amount
+    ) internal {
+        balanceOf[from] = balanceOf[from].sub(amount, "BALANCE");
+        balanceOf[to] = balanceOf[to].add(amount);
+        emit Transfer(from, to, amount);
+    }
+}
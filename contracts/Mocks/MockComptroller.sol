@@ -0,0 +1,188 @@
+// SPDX-License-Identifier: GPL-3.0
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+
+import "../Interfaces/Compound/CTokenI.sol";
+import "../Interfaces/Compound/PriceOracle.sol";
+import "./MockERC20.sol";
+
+/********************
+ *   Comptroller for local tests. Stands in for both the iron bank and compound
+ *   Iron bank: borrows are limited by creditLimits only, valued with the oracle
+ *   Compound: suppliers earn comp at compSpeeds per block, split by cToken share. Paid out on claimComp
+ ********************* */
+
+contract MockComptroller {
+    using SafeMath for uint256;
+
+    uint256 internal constant INSUFFICIENT_LIQUIDITY = 4;
+
+    address public admin;
+    PriceOracle public oracle;
+    MockERC20 public comp;
+
+    address[] public allMarkets;
+    mapping(address => bool) public isMarket;
+    mapping(address => uint256) public creditLimits;
+    mapping(address => uint256) public compSpeeds;
+
+    //comp accounting. comp per cToken scaled by 1e36
+    mapping(address => uint256) public compIndex;
+    mapping(address => uint256) public compBlock;
+    mapping(address => mapping(address => uint256)) public compSupplierIndex;
+    mapping(address => uint256) public compAccrued;
+
+    modifier onlyAdmin() {
+        require(msg.sender == admin, "!admin");
+        _;
+    }
+
+    function initialize(PriceOracle _oracle, MockERC20 _comp) external {
+        require(admin == address(0), "INITIALIZED");
+        admin = msg.sender;
+        oracle = _oracle;
+        comp = _comp;
+    }
+
+    /*****************
+     * Admin
+     ******************/
+
+    function _supportMarket(address cToken) external onlyAdmin {
+        require(!isMarket[cToken], "LISTED");
+        isMarket[cToken] = true;
+        allMarkets.push(cToken);
+        compBlock[cToken] = block.number;
+    }
+
+    function _setCreditLimit(address protocol, uint256 creditLimit) external onlyAdmin {
+        creditLimits[protocol] = creditLimit;
+    }
+
+    function _setPriceOracle(PriceOracle newOracle) external onlyAdmin {
+        oracle = newOracle;
+    }
+
+    function _setCompSpeed(address cToken, uint256 compSpeed) external onlyAdmin {
+        _updateCompIndex(cToken);
+        compSpeeds[cToken] = compSpeed;
+    }
+
+    /*****************
+     * Credit
+     ******************/
+
+    function markets(address cToken)
+        external
+        view
+        returns (
+            bool,
+            uint256,
+            bool
+        )
+    {
+        return (isMarket[cToken], 0, compSpeeds[cToken] > 0);
+    }
+
+    function getAllMarkets() external view returns (address[] memory) {
+        return allMarkets;
+    }
+
+    function borrowAllowed(
+        address cToken,
+        address borrower,
+        uint256 borrowAmount
+    ) external view returns (uint256) {
+        if (!isMarket[cToken]) {
+            return INSUFFICIENT_LIQUIDITY;
+        }
+        (, , uint256 shortfall) = _accountLiquidity(borrower, cToken, borrowAmount);
+        return shortfall > 0 ? INSUFFICIENT_LIQUIDITY : 0;
+    }
+
+    function getAccountLiquidity(address account)
+        external
+        view
+        returns (
+            uint256,
+            uint256,
+            uint256
+        )
+    {
+        return _accountLiquidity(account, address(0), 0);
+    }
+
+    function _accountLiquidity(
+        address account,
+        address cTokenModify,
+        uint256 borrowAmount
+    )
+        internal
+        view
+        returns (
+            uint256,
+            uint256,
+            uint256
+        )
+    {
+        uint256 borrowValue;
+        for (uint256 i = 0; i < allMarkets.length; i++) {
+            address cToken = allMarkets[i];
+            (, , uint256 borrowBalance, ) = CTokenI(cToken).getAccountSnapshot(account);
+            if (cToken == cTokenModify) {
+                borrowBalance = borrowBalance.add(borrowAmount);
+            }
+            borrowValue = borrowValue.add(borrowBalance.mul(oracle.getUnderlyingPrice(cToken)).div(1e18));
+        }
+
+        uint256 limit = creditLimits[account];
+        if (limit >= borrowValue) {
+            return (0, limit - borrowValue, 0);
+        }
+        return (0, 0, borrowValue - limit);
+    }
+
+    /*****************
+     * Comp
+     ******************/
+
+    function claimComp(address holder) external {
+        _claimComp(holder, allMarkets);
+    }
+
+    function claimComp(address holder, address[] memory cTokens) external {
+        _claimComp(holder, cTokens);
+    }
+
+    function _claimComp(address holder, address[] memory cTokens) internal {
+        for (uint256 i = 0; i < cTokens.length; i++) {
+            require(isMarket[cTokens[i]], "NOT MARKET");
+            _updateCompIndex(cTokens[i]);
+            _distributeSupplierComp(cTokens[i], holder);
+        }
+
+        uint256 accrued = compAccrued[holder];
+        if (accrued > 0) {
+            compAccrued[holder] = 0;
+            comp.mint(holder, accrued);
+        }
+    }
+
+    function _updateCompIndex(address cToken) internal {
+        uint256 blockDelta = block.number.sub(compBlock[cToken]);
+        uint256 supply = CTokenI(cToken).totalSupply();
+        if (blockDelta > 0 && supply > 0) {
+            compIndex[cToken] = compIndex[cToken].add(compSpeeds[cToken].mul(blockDelta).mul(1e36).div(supply));
+        }
+        compBlock[cToken] = block.number;
+    }
+
+    //supplier index starts at zero so the first claim pays from market listing. fine for tests
+    function _distributeSupplierComp(address cToken, address supplier) internal {
+        uint256 index = compIndex[cToken];
+        uint256 delta = index.sub(compSupplierIndex[cToken][supplier]);
+        compSupplierIndex[cToken][supplier] = index;
+        compAccrued[supplier] = compAccrued[supplier].add(CTokenI(cToken).balanceOf(supplier).mul(delta).div(1e36));
+    }
+}
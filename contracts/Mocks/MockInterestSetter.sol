@@ -0,0 +1,55 @@
+// SPDX-License-Identifier: GPL-3.0
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+
+import "../Interfaces/DyDx/ISoloMargin.sol";
+
+/********************
+ *   dYdX PolynomialInterestSetter for local tests
+ *   rate = maxAPR * sum(coefficient_i * utilisation^i) / 100, per second
+ ********************* */
+
+contract MockInterestSetter {
+    using SafeMath for uint256;
+
+    uint256 internal constant BASE = 1e18;
+    uint256 internal constant SECONDS_IN_A_YEAR = 365 days;
+
+    uint256 public maxAPR;
+    uint8[] public coefficients;
+
+    //coefficients are percentages, lowest power first, and must add up to 100
+    constructor(uint256 _maxAPR, uint8[] memory _coefficients) public {
+        uint256 sum;
+        for (uint256 i = 0; i < _coefficients.length; i++) {
+            sum = sum.add(_coefficients[i]);
+        }
+        require(sum == 100, "COEFFICIENTS");
+        maxAPR = _maxAPR;
+        coefficients = _coefficients;
+    }
+
+    function getInterestRate(
+        address,
+        uint256 borrowWei,
+        uint256 supplyWei
+    ) external view returns (Interest.Rate memory) {
+        if (borrowWei == 0) {
+            return Interest.Rate({value: 0});
+        }
+        if (borrowWei >= supplyWei) {
+            return Interest.Rate({value: maxAPR.div(SECONDS_IN_A_YEAR)});
+        }
+
+        uint256 result;
+        uint256 polynomial = BASE;
+        for (uint256 i = 0; i < coefficients.length; i++) {
+            result = result.add(polynomial.mul(coefficients[i]));
+            polynomial = polynomial.mul(borrowWei).div(supplyWei);
+        }
+
+        return Interest.Rate({value: result.mul(maxAPR).div(BASE.mul(100)).div(SECONDS_IN_A_YEAR)});
+    }
+}
@@ -0,0 +1,71 @@
+// SPDX-License-Identifier: GPL-3.0
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+
+/********************
+ *   Compound's JumpRateModelV2 maths for local tests
+ ********************* */
+
+contract MockJumpRateModel {
+    using SafeMath for uint256;
+
+    bool public constant isInterestRateModel = true;
+    uint256 public constant blocksPerYear = 2102400;
+
+    uint256 public baseRatePerBlock;
+    uint256 public multiplierPerBlock;
+    uint256 public jumpMultiplierPerBlock;
+    uint256 public kink;
+
+    //rates are per year scaled by 1e18. same constructor as the real model
+    constructor(
+        uint256 baseRatePerYear,
+        uint256 multiplierPerYear,
+        uint256 jumpMultiplierPerYear,
+        uint256 kink_
+    ) public {
+        baseRatePerBlock = baseRatePerYear.div(blocksPerYear);
+        multiplierPerBlock = multiplierPerYear.mul(1e18).div(blocksPerYear.mul(kink_));
+        jumpMultiplierPerBlock = jumpMultiplierPerYear.div(blocksPerYear);
+        kink = kink_;
+    }
+
+    function utilizationRate(
+        uint256 cash,
+        uint256 borrows,
+        uint256 reserves
+    ) public pure returns (uint256) {
+        if (borrows == 0) {
+            return 0;
+        }
+        return borrows.mul(1e18).div(cash.add(borrows).sub(reserves));
+    }
+
+    function getBorrowRate(
+        uint256 cash,
+        uint256 borrows,
+        uint256 reserves
+    ) public view returns (uint256) {
+        uint256 util = utilizationRate(cash, borrows, reserves);
+
+        if (util <= kink) {
+            return util.mul(multiplierPerBlock).div(1e18).add(baseRatePerBlock);
+        }
+        uint256 normalRate = kink.mul(multiplierPerBlock).div(1e18).add(baseRatePerBlock);
+        uint256 excessUtil = util.sub(kink);
+        return excessUtil.mul(jumpMultiplierPerBlock).div(1e18).add(normalRate);
+    }
+
+    function getSupplyRate(
+        uint256 cash,
+        uint256 borrows,
+        uint256 reserves,
+        uint256 reserveFactorMantissa
+    ) public view returns (uint256) {
+        uint256 oneMinusReserveFactor = uint256(1e18).sub(reserveFactorMantissa);
+        uint256 borrowRate = getBorrowRate(cash, borrows, reserves);
+        uint256 rateToPool = borrowRate.mul(oneMinusReserveFactor).div(1e18);
+        return utilizationRate(cash, borrows, reserves).mul(rateToPool).div(1e18);
+    }
+}
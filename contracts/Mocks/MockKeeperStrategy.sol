@@ -0,0 +1,82 @@
+// SPDX-License-Identifier: GPL-3.0
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+//the keeper facing surface of Strategy with every answer settable.
+//acts as its own vault so strategies(address) can report a debt
+contract MockKeeperStrategy {
+    struct lendStatus {
+        string name;
+        uint256 assets;
+        uint256 rate;
+        address add;
+    }
+
+    bool public harvestDue;
+    bool public tendDue;
+    uint256 public estimatedTotalAssets;
+    uint256 public totalDebt;
+    uint256[4] internal adjustPosition;
+    uint256[] internal lenderNavs;
+
+    uint256 public harvests;
+    uint256 public tends;
+
+    function setTriggers(bool _harvest, bool _tend) external {
+        harvestDue = _harvest;
+        tendDue = _tend;
+    }
+
+    function setAssets(uint256 _estimatedTotalAssets, uint256 _totalDebt) external {
+        estimatedTotalAssets = _estimatedTotalAssets;
+        totalDebt = _totalDebt;
+    }
+
+    function setAdjustPosition(uint256 _lowest, uint256 _lowestApr, uint256 _highest, uint256 _potential) external {
+        adjustPosition = [_lowest, _lowestApr, _highest, _potential];
+    }
+
+    function setLenderNavs(uint256[] calldata _navs) external {
+        lenderNavs = _navs;
+    }
+
+    function vault() external view returns (address) {
+        return address(this);
+    }
+
+    //vault 0.3.0 StrategyParams. only totalDebt is filled
+    function strategies(address) external view returns (uint256, uint256, uint256, uint256, uint256, uint256, uint256, uint256) {
+        return (0, 0, 0, 0, 0, totalDebt, 0, 0);
+    }
+
+    function harvestTrigger(uint256 callCost) external view returns (bool) {
+        callCost;
+        return harvestDue;
+    }
+
+    function tendTrigger(uint256 callCost) external view returns (bool) {
+        callCost;
+        return tendDue && !harvestDue;
+    }
+
+    function estimateAdjustPosition() external view returns (uint256, uint256, uint256, uint256) {
+        return (adjustPosition[0], adjustPosition[1], adjustPosition[2], adjustPosition[3]);
+    }
+
+    function lendStatuses() external view returns (lendStatus[] memory statuses) {
+        statuses = new lendStatus[](lenderNavs.length);
+        for (uint256 i = 0; i < lenderNavs.length; i++) {
+            statuses[i] = lendStatus("mock", lenderNavs[i], 0, address(0));
+        }
+    }
+
+    function harvest() external {
+        harvests++;
+        harvestDue = false;
+    }
+
+    function tend() external {
+        tends++;
+        tendDue = false;
+    }
+}
@@ -0,0 +1,19 @@
+// SPDX-License-Identifier: GPL-3.0
+pragma solidity 0.6.12;
+
+contract MockPriceOracle {
+    mapping(address => uint256) public prices;
+
+    //compound convention. price of the underlying scaled by 1e36 / underlying decimals
+    function setUnderlyingPrice(address cToken, uint256 price) external {
+        prices[cToken] = price;
+    }
+
+    function getUnderlyingPrice(address cToken) external view returns (uint256) {
+        uint256 price = prices[cToken];
+        if (price == 0) {
+            return 1e18;
+        }
+        return price;
+    }
+}
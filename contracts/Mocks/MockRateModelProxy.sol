@@ -0,0 +1,70 @@
+// SPDX-License-Identifier: GPL-3.0
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+
+import "../Interfaces/Compound/JumpRateModelI.sol";
+
+/********************
+ *   Forwards to a jump rate model. Can hide the jump model getters so a market's model looks opaque,
+ *   or misreport the jump multiplier so local maths only agrees with the model below the kink
+ ********************* */
+
+contract MockRateModelProxy {
+    using SafeMath for uint256;
+
+    bool public constant isInterestRateModel = true;
+
+    JumpRateModelI public model;
+    bool public opaque;
+    uint256 public jumpSkew;
+
+    constructor(JumpRateModelI _model) public {
+        model = _model;
+    }
+
+    function setOpaque(bool _opaque) external {
+        opaque = _opaque;
+    }
+
+    function setJumpSkew(uint256 _jumpSkew) external {
+        jumpSkew = _jumpSkew;
+    }
+
+    function baseRatePerBlock() external view returns (uint256) {
+        require(!opaque, "OPAQUE");
+        return model.baseRatePerBlock();
+    }
+
+    function multiplierPerBlock() external view returns (uint256) {
+        require(!opaque, "OPAQUE");
+        return model.multiplierPerBlock();
+    }
+
+    function jumpMultiplierPerBlock() external view returns (uint256) {
+        require(!opaque, "OPAQUE");
+        return model.jumpMultiplierPerBlock().add(jumpSkew);
+    }
+
+    function kink() external view returns (uint256) {
+        require(!opaque, "OPAQUE");
+        return model.kink();
+    }
+
+    function getBorrowRate(
+        uint256 cash,
+        uint256 borrows,
+        uint256 reserves
+    ) external view returns (uint256) {
+        return model.getBorrowRate(cash, borrows, reserves);
+    }
+
+    function getSupplyRate(
+        uint256 cash,
+        uint256 borrows,
+        uint256 reserves,
+        uint256 reserveFactorMantissa
+    ) external view returns (uint256) {
+        return model.getSupplyRate(cash, borrows, reserves, reserveFactorMantissa);
+    }
+}
@@ -0,0 +1,215 @@
+// SPDX-License-Identifier: GPL-3.0
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+
+import "../Interfaces/DyDx/ISoloMargin.sol";
+import "../Interfaces/DyDx/IInterestSetter.sol";
+
+/********************
+ *   SoloMargin for local tests. Copied to the mainnet SOLO address
+ *   Supports wei denominated deposits and withdrawals. Accounts can only supply, borrowing comes from borrowDemand
+ *   Index accrual follows dYdX: borrow interest per second from the interest setter, suppliers get earningsRate of it
+ ********************* */
+
+contract MockSoloMargin {
+    using SafeMath for uint256;
+    using SafeERC20 for IERC20;
+
+    struct Market {
+        address token;
+        address interestSetter;
+        uint256 borrowPar;
+        uint256 supplyPar;
+        uint256 borrowIndex;
+        uint256 supplyIndex;
+        uint256 lastUpdate;
+    }
+
+    uint256 public constant earningsRate = 0.9e18;
+
+    address public owner;
+    Market[] internal markets;
+    //owner => account number => market => supply par
+    mapping(address => mapping(uint256 => mapping(uint256 => uint256))) internal supplyPar;
+
+    function initialize() external {
+        require(owner == address(0), "INITIALIZED");
+        owner = msg.sender;
+    }
+
+    function addMarket(address token, address interestSetter) external {
+        require(msg.sender == owner, "!owner");
+        markets.push(Market(token, interestSetter, 0, 0, 1e18, 1e18, block.timestamp));
+    }
+
+    /*****************
+     * Views
+     ******************/
+
+    function getNumMarkets() external view returns (uint256) {
+        return markets.length;
+    }
+
+    function getMarketTokenAddress(uint256 marketId) external view returns (address) {
+        return markets[marketId].token;
+    }
+
+    function getMarketInterestSetter(uint256 marketId) external view returns (address) {
+        return markets[marketId].interestSetter;
+    }
+
+    function getMarketTotalPar(uint256 marketId) external view returns (Types.TotalPar memory) {
+        Market storage market = markets[marketId];
+        return Types.TotalPar({borrow: uint128(market.borrowPar), supply: uint128(market.supplyPar)});
+    }
+
+    function getMarketCurrentIndex(uint256 marketId) public view returns (Interest.Index memory) {
+        (uint256 borrowIndex, uint256 supplyIndex) = _currentIndex(markets[marketId]);
+        return Interest.Index({borrow: uint96(borrowIndex), supply: uint96(supplyIndex), lastUpdate: uint32(block.timestamp)});
+    }
+
+    function getAccountPar(Account.Info memory account, uint256 marketId) external view returns (Types.Par memory) {
+        return Types.Par({sign: true, value: uint128(supplyPar[account.owner][account.number][marketId])});
+    }
+
+    function getAccountWei(Account.Info memory account, uint256 marketId) public view returns (Types.Wei memory) {
+        (, uint256 supplyIndex) = _currentIndex(markets[marketId]);
+        uint256 par = supplyPar[account.owner][account.number][marketId];
+        return Types.Wei({sign: true, value: par.mul(supplyIndex).div(1e18)});
+    }
+
+    function getAccountBalances(Account.Info memory account)
+        external
+        view
+        returns (
+            address[] memory,
+            Types.Par[] memory,
+            Types.Wei[] memory
+        )
+    {
+        uint256 numMarkets = markets.length;
+        address[] memory tokens = new address[](numMarkets);
+        Types.Par[] memory pars = new Types.Par[](numMarkets);
+        Types.Wei[] memory weis = new Types.Wei[](numMarkets);
+
+        for (uint256 i = 0; i < numMarkets; i++) {
+            tokens[i] = markets[i].token;
+            pars[i] = Types.Par({sign: true, value: uint128(supplyPar[account.owner][account.number][i])});
+            weis[i] = getAccountWei(account, i);
+        }
+        return (tokens, pars, weis);
+    }
+
+    /*****************
+     * Actions
+     ******************/
+
+    function operate(Account.Info[] memory accounts, Actions.ActionArgs[] memory actions) external {
+        for (uint256 i = 0; i < actions.length; i++) {
+            Actions.ActionArgs memory action = actions[i];
+            Account.Info memory account = accounts[action.accountId];
+            require(account.owner == msg.sender, "NOT OWNER");
+            require(action.amount.denomination == Types.AssetDenomination.Wei && action.amount.ref == Types.AssetReference.Delta, "UNSUPPORTED AMOUNT");
+
+            uint256 marketId = action.primaryMarketId;
+            Market storage market = _updateIndex(marketId);
+
+            if (action.actionType == Actions.ActionType.Deposit) {
+                require(action.amount.sign, "SIGN");
+                _deposit(market, account, marketId, action.otherAddress, action.amount.value);
+            } else if (action.actionType == Actions.ActionType.Withdraw) {
+                require(!action.amount.sign, "SIGN");
+                _withdraw(market, account, marketId, action.otherAddress, action.amount.value);
+            } else {
+                revert("UNSUPPORTED ACTION");
+            }
+        }
+    }
+
+    function _deposit(
+        Market storage market,
+        Account.Info memory account,
+        uint256 marketId,
+        address from,
+        uint256 amount
+    ) internal {
+        require(from == msg.sender, "FROM");
+        IERC20(market.token).safeTransferFrom(from, address(this), amount);
+
+        uint256 par = amount.mul(1e18).div(market.supplyIndex);
+        supplyPar[account.owner][account.number][marketId] = supplyPar[account.owner][account.number][marketId].add(par);
+        market.supplyPar = market.supplyPar.add(par);
+    }
+
+    //par is rounded up like dydx. a withdrawal of the full wei balance can be one par over, that is let through as dust
+    function _withdraw(
+        Market storage market,
+        Account.Info memory account,
+        uint256 marketId,
+        address to,
+        uint256 amount
+    ) internal {
+        uint256 balance = supplyPar[account.owner][account.number][marketId];
+        uint256 par = amount.mul(1e18).add(market.supplyIndex).sub(1).div(market.supplyIndex);
+        if (par > balance) {
+            require(par == balance + 1, "NO BORROWING");
+            par = balance;
+        }
+        supplyPar[account.owner][account.number][marketId] = balance - par;
+        market.supplyPar = market.supplyPar.sub(par);
+
+        IERC20(market.token).safeTransfer(to, amount);
+    }
+
+    /*****************
+     * Interest
+     ******************/
+
+    function _currentIndex(Market storage market) internal view returns (uint256 borrowIndex, uint256 supplyIndex) {
+        borrowIndex = market.borrowIndex;
+        supplyIndex = market.supplyIndex;
+
+        uint256 timeDelta = block.timestamp.sub(market.lastUpdate);
+        if (timeDelta == 0) {
+            return (borrowIndex, supplyIndex);
+        }
+
+        uint256 borrowWei = market.borrowPar.mul(borrowIndex).div(1e18);
+        uint256 supplyWei = market.supplyPar.mul(supplyIndex).div(1e18);
+        uint256 rate = IInterestSetter(market.interestSetter).getInterestRate(market.token, borrowWei, supplyWei).value;
+
+        uint256 borrowInterest = rate.mul(timeDelta);
+        uint256 supplyInterest;
+        if (supplyWei > 0) {
+            supplyInterest = borrowInterest.mul(earningsRate).div(1e18);
+            if (borrowWei < supplyWei) {
+                supplyInterest = supplyInterest.mul(borrowWei).div(supplyWei);
+            }
+        }
+
+        borrowIndex = borrowIndex.mul(borrowInterest).div(1e18).add(borrowIndex);
+        supplyIndex = supplyIndex.mul(supplyInterest).div(1e18).add(supplyIndex);
+    }
+
+    function _updateIndex(uint256 marketId) internal returns (Market storage market) {
+        market = markets[marketId];
+        (market.borrowIndex, market.supplyIndex) = _currentIndex(market);
+        market.lastUpdate = block.timestamp;
+    }
+
+    /*****************
+     * Test helpers. Stand in for the rest of the market
+     ******************/
+
+    //borrow without collateral checks. moves utilisation the way other borrowers would
+    function borrowDemand(uint256 marketId, uint256 amount) external {
+        require(msg.sender == owner, "!owner");
+        Market storage market = _updateIndex(marketId);
+        market.borrowPar = market.borrowPar.add(amount.mul(1e18).div(market.borrowIndex));
+        IERC20(market.token).safeTransfer(msg.sender, amount);
+    }
+}
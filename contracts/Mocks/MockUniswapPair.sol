@@ -0,0 +1,54 @@
+// SPDX-License-Identifier: GPL-3.0
+pragma solidity 0.6.12;
+
+/********************
+ *   Uniswap v2 pair for local tests. Holds no tokens, only the reserves and price accumulators
+ *   the router's rate implies, updated the way UniswapV2Pair._update does
+ ********************* */
+
+contract MockUniswapPair {
+    address public token0;
+    address public token1;
+
+    uint112 private reserve0;
+    uint112 private reserve1;
+    uint32 private blockTimestampLast;
+
+    uint256 public price0CumulativeLast;
+    uint256 public price1CumulativeLast;
+
+    bool public broken;
+
+    constructor(address tokenA, address tokenB) public {
+        (token0, token1) = tokenA < tokenB ? (tokenA, tokenB) : (tokenB, tokenA);
+    }
+
+    function setBroken(bool _broken) external {
+        broken = _broken;
+    }
+
+    function getReserves()
+        external
+        view
+        returns (
+            uint112,
+            uint112,
+            uint32
+        )
+    {
+        require(!broken, "BROKEN");
+        return (reserve0, reserve1, blockTimestampLast);
+    }
+
+    function setReserves(uint112 _reserve0, uint112 _reserve1) external {
+        uint32 blockTimestamp = uint32(block.timestamp % 2**32);
+        uint32 timeElapsed = blockTimestamp - blockTimestampLast;
+        if (timeElapsed > 0 && reserve0 != 0 && reserve1 != 0) {
+            price0CumulativeLast += ((uint256(reserve1) << 112) / reserve0) * timeElapsed;
+            price1CumulativeLast += ((uint256(reserve0) << 112) / reserve1) * timeElapsed;
+        }
+        reserve0 = _reserve0;
+        reserve1 = _reserve1;
+        blockTimestampLast = blockTimestamp;
+    }
+}
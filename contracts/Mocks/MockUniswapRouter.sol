@@ -0,0 +1,75 @@
+// SPDX-License-Identifier: GPL-3.0
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+
+import "./MockUniswapPair.sol";
+
+/********************
+ *   Uniswap v2 router for local tests. Copied to the mainnet router address
+ *   Swaps at fixed rates out of its own balance. Doubles as the factory, each rate gets a pair quoting it
+ ********************* */
+
+contract MockUniswapRouter {
+    using SafeMath for uint256;
+    using SafeERC20 for IERC20;
+
+    //tokenIn => tokenOut => amount out for 1e18 in
+    mapping(address => mapping(address => uint256)) public rates;
+    mapping(address => mapping(address => address)) public getPair;
+
+    function factory() external view returns (address) {
+        return address(this);
+    }
+
+    //the pair is set to the last rate given for either direction
+    function setRate(
+        address tokenIn,
+        address tokenOut,
+        uint256 rate
+    ) external {
+        rates[tokenIn][tokenOut] = rate;
+
+        MockUniswapPair pair = MockUniswapPair(getPair[tokenIn][tokenOut]);
+        if (address(pair) == address(0)) {
+            pair = new MockUniswapPair(tokenIn, tokenOut);
+            getPair[tokenIn][tokenOut] = address(pair);
+            getPair[tokenOut][tokenIn] = address(pair);
+        }
+
+        //1e24 of tokenIn against rate * 1e6 of tokenOut
+        uint112 reserveIn = uint112(1e24);
+        uint112 reserveOut = uint112(rate.mul(1e6));
+        if (pair.token0() == tokenIn) {
+            pair.setReserves(reserveIn, reserveOut);
+        } else {
+            pair.setReserves(reserveOut, reserveIn);
+        }
+    }
+
+    function getAmountsOut(uint256 amountIn, address[] memory path) public view returns (uint256[] memory amounts) {
+        require(path.length >= 2, "INVALID_PATH");
+        amounts = new uint256[](path.length);
+        amounts[0] = amountIn;
+        for (uint256 i = 0; i < path.length - 1; i++) {
+            amounts[i + 1] = amounts[i].mul(rates[path[i]][path[i + 1]]).div(1e18);
+        }
+    }
+
+    function swapExactTokensForTokens(
+        uint256 amountIn,
+        uint256 amountOutMin,
+        address[] calldata path,
+        address to,
+        uint256 deadline
+    ) external returns (uint256[] memory amounts) {
+        require(deadline >= block.timestamp, "EXPIRED");
+        amounts = getAmountsOut(amountIn, path);
+        require(amounts[amounts.length - 1] >= amountOutMin, "INSUFFICIENT_OUTPUT_AMOUNT");
+
+        IERC20(path[0]).safeTransferFrom(msg.sender, address(this), amountIn);
+        IERC20(path[path.length - 1]).safeTransfer(to, amounts[amounts.length - 1]);
+    }
+}
@@ -9,6 +9,7 @@ import "@yearnvaults/contracts/BaseStrategy.sol";
 
 import "./Interfaces/Compound/CErc20I.sol";
 import "./Interfaces/Compound/ComptrollerI.sol";
+import "./Interfaces/Compound/JumpRateModelI.sol";
 
 import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
 import "@openzeppelin/contracts/math/SafeMath.sol";
@@ -21,6 +22,22 @@ interface IUni{
         uint256 amountIn, 
         address[] calldata path
     ) external view returns (uint256[] memory amounts);
+
+    function factory() external pure returns (address);
+}
+
+interface IUniFactory{
+    function getPair(address tokenA, address tokenB) external view returns (address pair);
+}
+
+interface IUniPair{
+    function token0() external view returns (address);
+
+    function getReserves() external view returns (uint112 reserve0, uint112 reserve1, uint32 blockTimestampLast);
+
+    function price0CumulativeLast() external view returns (uint256);
+
+    function price1CumulativeLast() external view returns (uint256);
 }
 
 /********************
@@ -45,23 +62,45 @@ contract Strategy is BaseStrategy {
     address public constant weth = address(0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2);
 
     uint256 public constant BLOCKSPERYEAR = 2102400; // 12 seconds per block
+    uint256 public constant REBALANCESTEPS = 6; // bisection steps when sizing a move between lenders
+    uint256 public constant MAXDEPOSITCHUNKS = 20; // each chunk is one more aprAfterDeposit call on the harvest
 
     //IRON BANK
     ComptrollerI private ironBank = ComptrollerI(address(0xAB1c342C7bf5Ec5F02ADEA1c2270670bCa144CbB));
     CErc20I private ironBankToken;
     uint256 public maxIronBankLeverage = 4; //max leverage we will take from iron bank
     uint256 public step = 10;
+    bool public binarySearchCredit = false; //bisect the credit curve instead of walking it in steps
 
     IGenericLender[] public lenders;
+    uint256 public depositChunks = 1; //above 1 loose want is split between lenders in this many chunks
     bool public externalOracle = false;
     address public wantToEthOracle;
 
+    //time weighted want per eth from the uniswap pair, observed at harvest and tend
+    //triggers use it until it is older than wantPriceStaleness blocks
+    address public wantPair;
+    bool private wethIsToken0;
+    uint256 public wantPerEth;
+    uint256 public wantPriceBlock;
+    uint256 public priceCumulativeLast;
+    uint256 public priceTimestampLast;
+    uint256 public twapPeriod = 1800; //min seconds an average covers
+    uint256 public wantPriceStaleness = 6500;
+
     constructor(address _vault, address _ironBankToken) public BaseStrategy(_vault) {
         ironBankToken = CErc20I(_ironBankToken);
 
         debtThreshold = 1e15;
         want.safeApprove(address(ironBankToken), uint256(-1));
 
+        if (address(want) != weth) {
+            wantPair = IUniFactory(IUni(uniswapRouter).factory()).getPair(weth, address(want));
+            if (wantPair != address(0)) {
+                wethIsToken0 = IUniPair(wantPair).token0() == weth;
+            }
+        }
+
         //we do this horrible thing because you can't compare strings in solidity
         require(keccak256(bytes(apiVersion())) == keccak256(bytes(VaultAPI(_vault).apiVersion())), "WRONG VERSION");
     }
@@ -77,6 +116,12 @@ contract Strategy is BaseStrategy {
     //if not, should be reduce?
     //made harder because we can't assume iron bank debt curve. So need to increment
     function internalCreditOfficer() public view returns (bool borrowMore, uint256 amount) {
+        uint256 looseAssets = want.balanceOf(address(this));
+        return _internalCreditOfficer(_currentSupplyRate(_snapshotLenders(0), looseAssets));
+    }
+
+    //currentSR is passed in so harvest and tend can reuse the lender snapshot they already have
+    function _internalCreditOfficer(uint256 currentSR) internal view returns (bool borrowMore, uint256 amount) {
 
         if(emergencyExit){
             return(false, ironBankOutstandingDebtStored());
@@ -100,15 +145,12 @@ contract Strategy is BaseStrategy {
         }
         
 
-        uint256 liquidityAvailable = want.balanceOf(address(ironBankToken));
-        uint256 remainingCredit = Math.min(liquidity, liquidityAvailable);
+        //market state and rate model are read once. every rate below is evaluated against this
+        ironBankMarket memory market = _loadIronBankMarket();
+        uint256 remainingCredit = Math.min(liquidity, market.cash);
 
-        
-        //our current supply rate.
-        //we only calculate once because it is expensive
-        uint256 currentSR = currentSupplyRate();
         //iron bank borrow rate
-        uint256 ironBankBR = ironBankBorrowRate(0, true);
+        uint256 ironBankBR = _ironBankBorrowRate(market, 0, true);
 
         uint256 outstandingDebt = ironBankOutstandingDebtStored();
 
@@ -138,28 +180,36 @@ contract Strategy is BaseStrategy {
         else if(currentSR > ironBankBR){            
             remainingCredit = Math.min(maxCreditDesired - outstandingDebt, remainingCredit);
 
-            while(minIncrement.mul(increment) <= remainingCredit){
-                ironBankBR = ironBankBorrowRate(minIncrement.mul(increment), false);
-                if(currentSR <= ironBankBR){
-                    break;
-                }
+            if(binarySearchCredit){
+                increment = _searchBorrowIncrements(market, currentSR, minIncrement, remainingCredit.div(minIncrement)).add(1);
+            }else{
+                while(minIncrement.mul(increment) <= remainingCredit){
+                    ironBankBR = _ironBankBorrowRate(market, minIncrement.mul(increment), false);
+                    if(currentSR <= ironBankBR){
+                        break;
+                    }
 
-                increment++;
+                    increment++;
+                }
             }
             borrowMore = true;
             amount = minIncrement.mul(increment-1);
 
         }else{
 
-            while(minIncrement.mul(increment) <= outstandingDebt){
-                ironBankBR = ironBankBorrowRate(minIncrement.mul(increment), true);
+            if(binarySearchCredit){
+                increment = _searchRepayIncrements(market, currentSR, minIncrement, outstandingDebt.div(minIncrement)).add(1);
+            }else{
+                while(minIncrement.mul(increment) <= outstandingDebt){
+                    ironBankBR = _ironBankBorrowRate(market, minIncrement.mul(increment), true);
 
-                //we do increment before the if statement here
-                increment++;
-                if(currentSR > ironBankBR){
-                    break;
-                }
+                    //we do increment before the if statement here
+                    increment++;
+                    if(currentSR > ironBankBR){
+                        break;
+                    }
 
+                }
             }
             borrowMore = false;
 
@@ -178,6 +228,43 @@ contract Strategy is BaseStrategy {
         }
      }
 
+    //borrow rate rises with every increment we borrow so we can bisect instead of walking
+    //returns the largest number of increments (up to maxIncrements) we can borrow while sr > br
+    function _searchBorrowIncrements(ironBankMarket memory market, uint256 currentSR, uint256 minIncrement, uint256 maxIncrements) internal view returns (uint256) {
+        uint256 low = 0;
+        uint256 high = maxIncrements;
+
+        while(low < high){
+            uint256 mid = low.add(high.sub(low).add(1).div(2));
+            if(currentSR > _ironBankBorrowRate(market, minIncrement.mul(mid), false)){
+                low = mid;
+            }else{
+                high = mid - 1;
+            }
+        }
+        return low;
+    }
+
+    //borrow rate falls with every increment we repay
+    //returns the smallest number of increments we need to repay until sr > br. maxIncrements if we never get there
+    function _searchRepayIncrements(ironBankMarket memory market, uint256 currentSR, uint256 minIncrement, uint256 maxIncrements) internal view returns (uint256) {
+        if(maxIncrements == 0){
+            return 0;
+        }
+        uint256 low = 1;
+        uint256 high = maxIncrements;
+
+        while(low < high){
+            uint256 mid = low.add(high.sub(low).div(2));
+            if(currentSR > _ironBankBorrowRate(market, minIncrement.mul(mid), true)){
+                high = mid;
+            }else{
+                low = mid + 1;
+            }
+        }
+        return low;
+    }
+
      function ironBankOutstandingDebtStored() public view returns (uint256 available) {
 
         return ironBankToken.borrowBalanceStored(address(this));
@@ -185,31 +272,122 @@ contract Strategy is BaseStrategy {
 
 
      function ironBankBorrowRate(uint256 amount, bool repay) public view returns (uint256) {
-        uint256 cashPrior = want.balanceOf(address(ironBankToken));
+        return _ironBankBorrowRate(_loadIronBankMarket(), amount, repay);
+    }
+
+    //snapshot of the iron bank market. if local is true the jump rate model params are loaded
+    //and we can price any borrow without calling out to the model
+    struct ironBankMarket {
+        uint256 cash;
+        uint256 borrows;
+        uint256 reserves;
+        InterestRateModel model;
+        bool local;
+        uint256 baseRate;
+        uint256 multiplier;
+        uint256 jumpMultiplier;
+        uint256 kink;
+    }
+
+    function _ironBankMarketState() internal view returns (ironBankMarket memory market) {
+        market.cash = want.balanceOf(address(ironBankToken));
+        market.borrows = ironBankToken.totalBorrows();
+        market.reserves = ironBankToken.totalReserves();
+        market.model = ironBankToken.interestRateModel();
+    }
+
+    //if the model isn't a jump rate model we just leave local false and use the model itself
+    function _loadIronBankMarket() internal view returns (ironBankMarket memory market) {
+        market = _ironBankMarketState();
+        JumpRateModelI jumpModel = JumpRateModelI(address(market.model));
+
+        try jumpModel.baseRatePerBlock() returns (uint256 _baseRate) {
+            market.baseRate = _baseRate;
+        } catch {
+            return market;
+        }
+        try jumpModel.multiplierPerBlock() returns (uint256 _multiplier) {
+            market.multiplier = _multiplier;
+        } catch {
+            return market;
+        }
+        try jumpModel.jumpMultiplierPerBlock() returns (uint256 _jumpMultiplier) {
+            market.jumpMultiplier = _jumpMultiplier;
+        } catch {
+            return market;
+        }
+        try jumpModel.kink() returns (uint256 _kink) {
+            market.kink = _kink;
+        } catch {
+            return market;
+        }
 
-        uint256 borrows = ironBankToken.totalBorrows();
-        uint256 reserves = ironBankToken.totalReserves();
+        //only trust our maths if it matches the model at the current state
+        market.local = true;
+        market.local = _ironBankBorrowRate(market, 0, true) == market.model.getBorrowRate(market.cash, market.borrows, market.reserves);
+        if (!market.local) {
+            return market;
+        }
 
-        InterestRateModel model = ironBankToken.interestRateModel();
+        //and past the kink, where only the jump multiplier is used. borrowing all the cash is always past it
+        uint256 allBorrowed = market.borrows.add(market.cash);
+        if (allBorrowed <= market.reserves) {
+            market.local = false;
+            return market;
+        }
+        try market.model.getBorrowRate(0, allBorrowed, market.reserves) returns (uint256 rate) {
+            market.local = _ironBankBorrowRate(market, market.cash, false) == rate;
+        } catch {
+            market.local = false;
+        }
+    }
+
+    function _ironBankBorrowRate(ironBankMarket memory market, uint256 amount, bool repay) internal view returns (uint256) {
         uint256 cashChange;
         uint256 borrowChange;
         if(repay){
-            cashChange = cashPrior.add(amount);
-            borrowChange = borrows.sub(amount);
+            cashChange = market.cash.add(amount);
+            borrowChange = market.borrows.sub(amount);
         }else{
-            cashChange = cashPrior.sub(amount);
-            borrowChange = borrows.add(amount);
+            cashChange = market.cash.sub(amount);
+            borrowChange = market.borrows.add(amount);
+        }
+
+        if(!market.local){
+            return market.model.getBorrowRate(cashChange, borrowChange, market.reserves);
+        }
+
+        //same maths as compound's JumpRateModelV2
+        uint256 util = 0;
+        if(borrowChange > 0){
+            util = borrowChange.mul(1e18).div(cashChange.add(borrowChange).sub(market.reserves));
+        }
+
+        if(util <= market.kink){
+            return util.mul(market.multiplier).div(1e18).add(market.baseRate);
         }
 
-        uint256 borrowRate = model.getBorrowRate(cashChange, borrowChange, reserves);
+        uint256 normalRate = market.kink.mul(market.multiplier).div(1e18).add(market.baseRate);
+        return util.sub(market.kink).mul(market.jumpMultiplier).div(1e18).add(normalRate);
+    }
 
-        return borrowRate;
+    //a finer step only costs log(step) rate checks once binary search is on
+    function setCreditSearch(uint256 _step, bool _binarySearch) external onlyAuthorized{
+        require(_step > 0, "!step");
+        step = _step;
+        binarySearchCredit = _binarySearch;
     }
 
     function setPriceOracle(address _oracle) external onlyAuthorized{
         wantToEthOracle = _oracle;
     }
 
+    function setWantPriceWindows(uint256 _twapPeriod, uint256 _staleness) external onlyAuthorized{
+        require(_twapPeriod > 0, "!twapPeriod");
+        twapPeriod = _twapPeriod;
+        wantPriceStaleness = _staleness;
+    }
+
     function name() external view override returns (string memory) {
         return "StrategyLenderYieldOptimiserIB";
     }
@@ -280,8 +458,9 @@ contract Strategy is BaseStrategy {
             lendStatus memory s;
             s.name = lenders[i].lenderName();
             s.add = address(lenders[i]);
-            s.assets = lenders[i].nav();
-            s.rate = lenders[i].apr().mul(BLOCKSPERYEAR);
+            (uint256 nav, uint256 apr, , , ) = lenders[i].lenderState(0);
+            s.assets = nav;
+            s.rate = apr.mul(BLOCKSPERYEAR);
             statuses[i] = s;
         }
 
@@ -318,6 +497,57 @@ contract Strategy is BaseStrategy {
 
         return weightedAPR.div(bal);
     }
+
+    //everything the strategy needs to know about a lender to make a decision.
+    //read once per harvest/tend and passed down so we dont ask every lender again on every pass
+    struct lenderSnapshot {
+        uint256 nav;
+        uint256 apr;
+        bool hasAssets;
+        uint256 aprAfterDeposit; //apr after depositing the amount the snapshot was taken with
+    }
+
+    //one lenderState call per lender. depositAmount is what aprAfterDeposit is quoted for
+    function _snapshotLenders(uint256 depositAmount) internal view returns (lenderSnapshot[] memory snapshot) {
+        snapshot = new lenderSnapshot[](lenders.length);
+        for (uint256 i = 0; i < lenders.length; i++) {
+            _refreshSnapshot(snapshot, i, depositAmount);
+        }
+    }
+
+    //used after we move money in or out of a lender
+    function _refreshSnapshot(lenderSnapshot[] memory snapshot, uint256 i, uint256 depositAmount) internal view {
+        (snapshot[i].nav, snapshot[i].apr, snapshot[i].hasAssets, , snapshot[i].aprAfterDeposit) = lenders[i].lenderState(depositAmount);
+    }
+
+    function _setDepositAprs(lenderSnapshot[] memory snapshot, uint256 looseAssets) internal view {
+        for (uint256 i = 0; i < snapshot.length; i++) {
+            snapshot[i].aprAfterDeposit = lenders[i].aprAfterDeposit(looseAssets);
+        }
+    }
+
+    function _lentTotalAssets(lenderSnapshot[] memory snapshot) internal pure returns (uint256 nav) {
+        for (uint256 i = 0; i < snapshot.length; i++) {
+            nav += snapshot[i].nav;
+        }
+    }
+
+    //same as currentSupplyRate. weightedApr is apr * nav for every lender.
+    //returns 0 instead of reverting when there is nothing to weight
+    function _currentSupplyRate(lenderSnapshot[] memory snapshot, uint256 looseAssets) internal pure returns (uint256) {
+        uint256 bal = _lentTotalAssets(snapshot).add(looseAssets);
+        if (bal == 0) {
+            return 0;
+        }
+
+        uint256 weightedAPR = 0;
+        for (uint256 i = 0; i < snapshot.length; i++) {
+            weightedAPR += snapshot[i].apr.mul(snapshot[i].nav);
+        }
+
+        return weightedAPR.div(bal);
+    }
+
     function estimatedAPR() public view returns (uint256){
         uint256 outstandingDebt = ironBankOutstandingDebtStored();
         uint256 ironBankBR = ironBankBorrowRate(0, true);
@@ -337,62 +567,73 @@ contract Strategy is BaseStrategy {
     }
 
     //Estimates the impact on APR if we add more money. It does not take into account adjusting position
-    function _estimateDebtLimitIncrease(uint256 change) internal view returns (uint256) {
+    //totalAssets is estimatedTotalAssets at the time of the snapshot. snapshot must have deposit aprs for change
+    function _estimateDebtLimitIncrease(lenderSnapshot[] memory snapshot, uint256 totalAssets, uint256 change) internal pure returns (uint256) {
         uint256 highestAPR = 0;
         uint256 aprChoice = 0;
         uint256 assets = 0;
 
-        for (uint256 i = 0; i < lenders.length; i++) {
-            uint256 apr = lenders[i].aprAfterDeposit(change);
+        for (uint256 i = 0; i < snapshot.length; i++) {
+            uint256 apr = snapshot[i].aprAfterDeposit;
             if (apr > highestAPR) {
                 aprChoice = i;
                 highestAPR = apr;
-                assets = lenders[i].nav();
+                assets = snapshot[i].nav;
             }
         }
 
         uint256 weightedAPR = highestAPR.mul(assets.add(change));
 
-        for (uint256 i = 0; i < lenders.length; i++) {
+        for (uint256 i = 0; i < snapshot.length; i++) {
             if (i != aprChoice) {
-                weightedAPR += lenders[i].weightedApr();
+                weightedAPR += snapshot[i].apr.mul(snapshot[i].nav);
             }
         }
 
-        uint256 bal = estimatedTotalAssets().add(change);
+        uint256 bal = totalAssets.add(change);
 
         return weightedAPR.div(bal);
     }
 
-    //Estimates debt limit decrease. It is not accurate and should only be used for very broad decision making
-    function _estimateDebtLimitDecrease(uint256 change) internal view returns (uint256) {
-        uint256 lowestApr = uint256(-1);
-        uint256 aprChoice = 0;
+    //Estimates debt limit decrease. change is taken in the order _withdrawSome takes it
+    //and what is left in each lender drawn on is weighted at its apr after the withdrawal
+    function _estimateDebtLimitDecrease(lenderSnapshot[] memory snapshot, uint256 totalAssets, uint256 change) internal view returns (uint256) {
+        uint256 weightedAPR = 0;
+        for (uint256 i = 0; i < snapshot.length; i++) {
+            weightedAPR += snapshot[i].apr.mul(snapshot[i].nav);
+        }
 
-        for (uint256 i = 0; i < lenders.length; i++) {
-            uint256 apr = lenders[i].aprAfterDeposit(change);
-            if (apr < lowestApr) {
-                aprChoice = i;
-                lowestApr = apr;
+        uint256 remaining = change;
+        (uint256[] memory queue, uint256[] memory aprAfter) = _withdrawalQueue(snapshot, change);
+        for (uint256 k = 0; k < queue.length && remaining > 0; k++) {
+            uint256 i = queue[k];
+            uint256 taken = Math.min(remaining, snapshot[i].nav);
+            if (taken == 0) {
+                continue;
             }
-        }
 
-        uint256 weightedAPR = 0;
+            //the queue priced taking min(change, nav). only the last lender drawn on can be taken from less
+            uint256 apr = taken == Math.min(change, snapshot[i].nav) ? aprAfter[i] : lenders[i].aprAfterWithdraw(taken);
+            uint256 left = snapshot[i].nav - taken;
+            weightedAPR = weightedAPR.sub(snapshot[i].apr.mul(snapshot[i].nav)).add(apr.mul(left));
+            remaining = remaining - taken;
+        }
 
-        for (uint256 i = 0; i < lenders.length; i++) {
-            if (i != aprChoice) {
-                weightedAPR += lenders[i].weightedApr();
-            } else {
-                uint256 asset = lenders[i].nav();
-                if (asset < change) {
-                    //simplistic. not accurate
-                    change = asset;
-                }
-                weightedAPR += lowestApr.mul(change);
-            }
+        uint256 withdrawn = change - remaining;
+        if (totalAssets <= withdrawn) {
+            return 0;
         }
-        uint256 bal = estimatedTotalAssets().add(change);
-        return weightedAPR.div(bal);
+        return weightedAPR.div(totalAssets - withdrawn);
+    }
+
+    //same as estimatedTotalAssets but with lent assets from the snapshot
+    function _estimatedTotalAssets(lenderSnapshot[] memory snapshot) internal view returns (uint256) {
+        uint256 nav = _lentTotalAssets(snapshot).add(want.balanceOf(address(this)));
+
+        uint256 ironBankDebt = ironBankOutstandingDebtStored();
+        if(ironBankDebt > nav) return 0;
+
+        return nav.sub(ironBankDebt);
     }
 
     //estimates highest and lowest apr lenders. Public for debugging purposes but not much use to general public
@@ -408,20 +649,35 @@ contract Strategy is BaseStrategy {
     {
         //all loose assets are to be invested
         uint256 looseAssets = want.balanceOf(address(this));
+        lenderSnapshot[] memory snapshot = _snapshotLenders(looseAssets);
 
+        return _estimateAdjustPosition(snapshot, looseAssets);
+    }
+
+    //snapshot must have deposit aprs set for looseAssets
+    function _estimateAdjustPosition(lenderSnapshot[] memory snapshot, uint256 looseAssets)
+        internal
+        view
+        returns (
+            uint256 _lowest,
+            uint256 _lowestApr,
+            uint256 _highest,
+            uint256 _potential
+        )
+    {
         // our simple algo
         // get the lowest apr strat
         // cycle through and see who could take its funds plus want for the highest apr
         _lowestApr = uint256(-1);
         _lowest = 0;
         uint256 lowestNav = 0;
-        for (uint256 i = 0; i < lenders.length; i++) {
-            if (lenders[i].hasAssets()) {
-                uint256 apr = lenders[i].apr();
+        for (uint256 i = 0; i < snapshot.length; i++) {
+            if (snapshot[i].hasAssets) {
+                uint256 apr = snapshot[i].apr;
                 if (apr < _lowestApr) {
                     _lowestApr = apr;
                     _lowest = i;
-                    lowestNav = lenders[i].nav();
+                    lowestNav = snapshot[i].nav;
                 }
             }
         }
@@ -431,9 +687,8 @@ contract Strategy is BaseStrategy {
         uint256 highestApr = 0;
         _highest = 0;
 
-        for (uint256 i = 0; i < lenders.length; i++) {
-            uint256 apr;
-            apr = lenders[i].aprAfterDeposit(looseAssets);
+        for (uint256 i = 0; i < snapshot.length; i++) {
+            uint256 apr = snapshot[i].aprAfterDeposit;
 
             if (apr > highestApr) {
                 highestApr = apr;
@@ -448,13 +703,57 @@ contract Strategy is BaseStrategy {
     //gives estiomate of future APR with a change of debt limit. Useful for governance to decide debt limits
     function estimatedFutureAPR(uint256 newDebtLimit) public view returns (uint256) {
         uint256 oldDebtLimit = vault.strategies(address(this)).totalDebt;
+        //an increase is quoted at the snapshot's deposit amount so the lenders are read once
+        uint256 increase = newDebtLimit > oldDebtLimit ? newDebtLimit - oldDebtLimit : 0;
+        lenderSnapshot[] memory snapshot = _snapshotLenders(increase);
+
+        return _estimatedFutureAPR(snapshot, _estimatedTotalAssets(snapshot), oldDebtLimit, newDebtLimit);
+    }
+
+    //an increase needs the snapshot's deposit aprs quoted for the change
+    function _estimatedFutureAPR(
+        lenderSnapshot[] memory snapshot,
+        uint256 totalAssets,
+        uint256 oldDebtLimit,
+        uint256 newDebtLimit
+    ) internal view returns (uint256) {
         uint256 change;
         if (oldDebtLimit < newDebtLimit) {
             change = newDebtLimit - oldDebtLimit;
-            return _estimateDebtLimitIncrease(change);
+            return _estimateDebtLimitIncrease(snapshot, totalAssets, change);
         } else {
             change = oldDebtLimit - newDebtLimit;
-            return _estimateDebtLimitDecrease(change);
+            return _estimateDebtLimitDecrease(snapshot, totalAssets, change);
+        }
+    }
+
+    //many points on the apr curves in one call. for sweeping debt limits off chain
+    //lenderAprs[i][j] is lenders[i].aprAfterDeposit(amounts[j])
+    //futureAprs[k] is estimatedFutureAPR(newDebtLimits[k])
+    function aprCurves(uint256[] memory amounts, uint256[] memory newDebtLimits)
+        public
+        view
+        returns (uint256[][] memory lenderAprs, uint256[] memory futureAprs)
+    {
+        lenderAprs = new uint256[][](lenders.length);
+        for (uint256 i = 0; i < lenders.length; i++) {
+            lenderAprs[i] = new uint256[](amounts.length);
+            for (uint256 j = 0; j < amounts.length; j++) {
+                lenderAprs[i][j] = lenders[i].aprAfterDeposit(amounts[j]);
+            }
+        }
+
+        //the lenders and our debt are only read once for the whole curve
+        uint256 oldDebtLimit = vault.strategies(address(this)).totalDebt;
+        lenderSnapshot[] memory snapshot = _snapshotLenders(0);
+        uint256 totalAssets = _estimatedTotalAssets(snapshot);
+
+        futureAprs = new uint256[](newDebtLimits.length);
+        for (uint256 k = 0; k < newDebtLimits.length; k++) {
+            if (newDebtLimits[k] > oldDebtLimit) {
+                _setDepositAprs(snapshot, newDebtLimits[k] - oldDebtLimit);
+            }
+            futureAprs[k] = _estimatedFutureAPR(snapshot, totalAssets, oldDebtLimit, newDebtLimits[k]);
         }
     }
 
@@ -483,7 +782,8 @@ contract Strategy is BaseStrategy {
         _loss = 0; //for clarity
         _debtPayment = _debtOutstanding;
 
-        uint256 lentAssets = lentTotalAssets();
+        lenderSnapshot[] memory snapshot = _snapshotLenders(0);
+        uint256 lentAssets = _lentTotalAssets(snapshot);
 
         uint256 looseAssets = want.balanceOf(address(this));
         uint256 ironBankDebt = ironBankOutstandingDebtStored();
@@ -517,7 +817,7 @@ contract Strategy is BaseStrategy {
             //dont need to do logic if there is nothiing to free
             if (amountToFree > 0 && looseAssets < amountToFree) {
                 //withdraw what we can withdraw
-                _withdrawSome(amountToFree.sub(looseAssets));
+                _withdrawSome(snapshot, amountToFree.sub(looseAssets), false);
                 uint256 newLoose = want.balanceOf(address(this));
                 //if we dont have enough money adjust _debtOutstanding and only change profit if needed
                 if (newLoose < amountToFree) {
@@ -539,7 +839,7 @@ contract Strategy is BaseStrategy {
             if (amountToFree > 0 && looseAssets < amountToFree) {
                 //withdraw what we can withdraw
 
-                _withdrawSome(amountToFree.sub(looseAssets));
+                _withdrawSome(snapshot, amountToFree.sub(looseAssets), false);
                 uint256 newLoose = want.balanceOf(address(this));
 
                 //if we dont have enough money adjust _debtOutstanding and only change profit if needed
@@ -562,13 +862,18 @@ contract Strategy is BaseStrategy {
      *   we ignore debt outstanding for an easy life
      */
     function adjustPosition(uint256 _debtOutstanding) internal override {
+        //the keeper is paying for a transaction anyway so refresh the trigger price here
+        _updateWantPrice();
+
+        //one read of every lender for the whole adjustment
+        lenderSnapshot[] memory snapshot = _snapshotLenders(0);
 
         //start off by borrowing or returning:
-        (bool borrowMore, uint256 amount) = internalCreditOfficer();
+        (bool borrowMore, uint256 amount) = _internalCreditOfficer(_currentSupplyRate(snapshot, want.balanceOf(address(this))));
         
         //do iron bank stuff first
         if(!borrowMore){
-            (uint256 _amountFreed,) = liquidatePosition(amount);
+            (uint256 _amountFreed,) = _liquidatePosition(snapshot, amount, true);
             //withdraw and repay
             ironBankToken.repayBorrow(_amountFreed);
             
@@ -592,102 +897,271 @@ contract Strategy is BaseStrategy {
         _debtOutstanding; //ignored. we handle it in prepare return
 
 
-        (uint256 lowest, uint256 lowestApr, uint256 highest, uint256 potential) = estimateAdjustPosition();
-
-        if (potential > lowestApr) {
-            //apr should go down after deposit so wont be withdrawing from self
-            lenders[lowest].withdrawAll();
+        //iron bank may have changed our loose balance so deposit aprs are only read now
+        uint256 looseAssets = want.balanceOf(address(this));
+        _setDepositAprs(snapshot, looseAssets);
+        (uint256 lowest, uint256 lowestApr, uint256 highest, uint256 potential) = _estimateAdjustPosition(snapshot, looseAssets);
+
+        if (potential > lowestApr && lowest != highest) {
+            //only move as much as it takes to level the two rates
+            uint256 toMove = _rebalanceAmount(snapshot, lowest, highest, potential, looseAssets);
+            if (toMove >= snapshot[lowest].nav) {
+                lenders[lowest].withdrawAll();
+            } else if (toMove > debtThreshold) {
+                lenders[lowest].withdraw(toMove);
+            }
         }
 
         uint256 bal = want.balanceOf(address(this));
-        if (bal > 0) {
+        if (bal >= depositChunks && depositChunks > 1) {
+            _waterFill(bal);
+        } else if (bal > 0) {
             want.safeTransfer(address(lenders[highest]), bal);
             lenders[highest].deposit();
         }
     }
 
+    //how much to move from lowest to highest so that their aprs meet
+    //potential is the apr of highest if it took all of lowest plus loose
+    function _rebalanceAmount(
+        lenderSnapshot[] memory snapshot,
+        uint256 lowest,
+        uint256 highest,
+        uint256 potential,
+        uint256 looseAssets
+    ) internal view returns (uint256) {
+        uint256 nav = snapshot[lowest].nav;
+
+        //still better after moving everything
+        if (potential > lenders[lowest].aprAfterWithdraw(nav)) {
+            return nav;
+        }
+
+        uint256 low = 0;
+        uint256 high = nav;
+        for (uint256 i = 0; i < REBALANCESTEPS; i++) {
+            uint256 mid = low.add(high).div(2);
+            if (lenders[highest].aprAfterDeposit(looseAssets.add(mid)) > lenders[lowest].aprAfterWithdraw(mid)) {
+                low = mid;
+            } else {
+                high = mid;
+            }
+        }
+        return low;
+    }
+
+    //split _amount into depositChunks and give each chunk to the lender paying the most for it.
+    //this levels out marginal apr across lenders in one harvest.
+    //only the lender that won the last chunk is asked for a new rate so cost is lenders + chunks calls
+    function _waterFill(uint256 _amount) internal {
+        uint256 chunk = _amount.div(depositChunks);
+        uint256[] memory allocations = new uint256[](lenders.length);
+        uint256[] memory nextApr = new uint256[](lenders.length);
+
+        for (uint256 i = 0; i < lenders.length; i++) {
+            nextApr[i] = lenders[i].aprAfterDeposit(chunk);
+        }
+
+        uint256 best = 0;
+        for (uint256 c = 0; c < depositChunks; c++) {
+            best = 0;
+            for (uint256 i = 1; i < lenders.length; i++) {
+                if (nextApr[i] > nextApr[best]) {
+                    best = i;
+                }
+            }
+            allocations[best] = allocations[best].add(chunk);
+            nextApr[best] = lenders[best].aprAfterDeposit(allocations[best].add(chunk));
+        }
+
+        //rounding dust goes to the last winner
+        allocations[best] = allocations[best].add(_amount.sub(chunk.mul(depositChunks)));
+
+        for (uint256 i = 0; i < lenders.length; i++) {
+            if (allocations[i] > 0) {
+                want.safeTransfer(address(lenders[i]), allocations[i]);
+                lenders[i].deposit();
+            }
+        }
+    }
+
+    //1 keeps the original behaviour of depositing everything into the best lender
+    function setDepositChunks(uint256 _chunks) external onlyAuthorized {
+        require(_chunks > 0 && _chunks <= MAXDEPOSITCHUNKS, "!chunks");
+        depositChunks = _chunks;
+    }
+
     struct lenderRatio {
         address lender;
         //share x 1000
         uint16 share;
     }
 
-    //share must add up to 1000.
+    //share must add up to 1000. lenders left out are emptied.
+    //only the difference between the current and the new position is moved
     function manualAllocation(lenderRatio[] memory _newPositions) public onlyAuthorized {
+        uint256[] memory targets = new uint256[](lenders.length);
+        bool[] memory listed = new bool[](lenders.length);
         uint256 share = 0;
 
-        for (uint256 i = 0; i < lenders.length; i++) {
-            lenders[i].withdrawAll();
-        }
-
-        uint256 assets = want.balanceOf(address(this));
-
+        //match every position to its lender in one pass. targets hold shares until we know the total
         for (uint256 i = 0; i < _newPositions.length; i++) {
             bool found = false;
-
-            //might be annoying and expensive to do this second loop but worth it for safety
             for (uint256 j = 0; j < lenders.length; j++) {
-                if (address(lenders[j]) == _newPositions[j].lender) {
+                if (address(lenders[j]) == _newPositions[i].lender) {
+                    require(!listed[j], "DUPLICATE");
+                    listed[j] = true;
+                    targets[j] = _newPositions[i].share;
                     found = true;
+                    break;
                 }
             }
             require(found, "NOT LENDER");
-
             share += _newPositions[i].share;
-            uint256 toSend = assets.mul(_newPositions[i].share).div(1000);
-            want.safeTransfer(_newPositions[i].lender, toSend);
-            IGenericLender(_newPositions[i].lender).deposit();
         }
-
         require(share == 1000, "SHARE!=1000");
+
+        uint256[] memory navs = new uint256[](lenders.length);
+        uint256 assets = want.balanceOf(address(this));
+        for (uint256 j = 0; j < lenders.length; j++) {
+            navs[j] = lenders[j].nav();
+            assets = assets.add(navs[j]);
+        }
+
+        //a difference under one share is rounding, not a move. lenders already on target are left alone
+        uint256 tolerance = assets.div(1000);
+
+        //take from over allocated lenders first
+        for (uint256 j = 0; j < lenders.length; j++) {
+            targets[j] = assets.mul(targets[j]).div(1000);
+            if (targets[j] == 0) {
+                if (navs[j] > 0) {
+                    lenders[j].withdrawAll();
+                }
+            } else if (navs[j] > targets[j].add(tolerance)) {
+                lenders[j].withdraw(navs[j] - targets[j]);
+            }
+        }
+
+        //then top up the under allocated ones with what we have
+        uint256 last = lenders.length;
+        for (uint256 j = 0; j < lenders.length; j++) {
+            if (targets[j] > navs[j].add(tolerance)) {
+                uint256 toSend = Math.min(targets[j] - navs[j], want.balanceOf(address(this)));
+                if (toSend > 0) {
+                    want.safeTransfer(address(lenders[j]), toSend);
+                    lenders[j].deposit();
+                    last = j;
+                }
+            }
+        }
+
+        //rounding and lenders left alone within tolerance can leave loose want. it goes to the last lender
+        //we topped up, or the largest target when every lender was already on target
+        uint256 loose = want.balanceOf(address(this));
+        if (loose > 0) {
+            if (last == lenders.length) {
+                last = 0;
+                for (uint256 j = 1; j < lenders.length; j++) {
+                    if (targets[j] > targets[last]) {
+                        last = j;
+                    }
+                }
+            }
+            want.safeTransfer(address(lenders[last]), loose);
+            lenders[last].deposit();
+        }
     }
 
-    //cycle through withdrawing from worst rate first
-    function _withdrawSome(uint256 _amount) internal returns (uint256 amountWithdrawn) {
+    //cycle through withdrawing from the lender that gives up the least apr for it first
+    //one pass over the lenders in that order. refresh re-reads the lenders we withdraw from, for callers that reuse the snapshot
+    function _withdrawSome(lenderSnapshot[] memory snapshot, uint256 _amount, bool refresh) internal returns (uint256 amountWithdrawn) {
         //dont withdraw dust
         if (_amount < debtThreshold) {
             return 0;
         }
 
         amountWithdrawn = 0;
-        //most situations this will only run once. Only big withdrawals will be a gas guzzler
-        uint256 j = 0;
-        while (amountWithdrawn < _amount) {
-            uint256 lowestApr = uint256(-1);
-            uint256 lowest = 0;
-            for (uint256 i = 0; i < lenders.length; i++) {
-                if (lenders[i].hasAssets()) {
-                    uint256 apr = lenders[i].apr();
-                    if (apr < lowestApr) {
-                        lowestApr = apr;
-                        lowest = i;
-                    }
-                }
+        (uint256[] memory queue, ) = _withdrawalQueue(snapshot, _amount);
+        for (uint256 k = 0; k < queue.length && amountWithdrawn < _amount; k++) {
+            uint256 i = queue[k];
+            amountWithdrawn += lenders[i].withdraw(_amount - amountWithdrawn);
+            if (refresh) {
+                _refreshSnapshot(snapshot, i, 0);
+            }
+        }
+    }
+
+    //indexes of the lenders with assets, ordered by the apr * nav each gives up per unit of want
+    //if it is the one amount is taken from. ties keep lender order.
+    //one aprAfterWithdraw quote per lender with assets, aprAfter[i] is lender i's quote
+    function _withdrawalQueue(lenderSnapshot[] memory snapshot, uint256 amount) internal view returns (uint256[] memory queue, uint256[] memory aprAfter) {
+        uint256 count = 0;
+        for (uint256 i = 0; i < snapshot.length; i++) {
+            if (snapshot[i].hasAssets) {
+                count++;
             }
-            if (!lenders[lowest].hasAssets()) {
-                return amountWithdrawn;
+        }
+
+        queue = new uint256[](count);
+        aprAfter = new uint256[](snapshot.length);
+        uint256[] memory loss = new uint256[](snapshot.length);
+        uint256[] memory take = new uint256[](snapshot.length);
+        uint256 n = 0;
+        for (uint256 i = 0; i < snapshot.length; i++) {
+            if (!snapshot[i].hasAssets) {
+                continue;
             }
-            amountWithdrawn += lenders[lowest].withdraw(_amount - amountWithdrawn);
-            j++;
-            //dont want infinite loop
-            if(j >= 6){
-                return amountWithdrawn;
+
+            take[i] = Math.min(amount, snapshot[i].nav);
+            aprAfter[i] = lenders[i].aprAfterWithdraw(take[i]);
+            uint256 before = snapshot[i].apr.mul(snapshot[i].nav);
+            uint256 remainder = aprAfter[i].mul(snapshot[i].nav - take[i]);
+            loss[i] = before > remainder ? before - remainder : 0;
+
+            //loss[j] / take[j] > loss[i] / take[i] without dividing. nothing to take sorts last
+            uint256 k = n;
+            while (k > 0 && _costlierWithdrawal(loss[queue[k - 1]], take[queue[k - 1]], loss[i], take[i])) {
+                queue[k] = queue[k - 1];
+                k--;
             }
+            queue[k] = i;
+            n++;
         }
     }
 
+    function _costlierWithdrawal(
+        uint256 lossA,
+        uint256 takeA,
+        uint256 lossB,
+        uint256 takeB
+    ) internal pure returns (bool) {
+        if (takeA == 0 || takeB == 0) {
+            return takeA == 0 && takeB > 0;
+        }
+        return lossA.mul(takeB) > lossB.mul(takeA);
+    }
+
     /*
      * Liquidate as many assets as possible to `want`, irregardless of slippage,
      * up to `_amountNeeded`. Any excess should be re-invested here as well.
      */
     function liquidatePosition(uint256 _amountNeeded) internal override returns (uint256 _amountFreed, uint256 _loss) {
+        //only read the lenders if we actually need to withdraw
+        if (want.balanceOf(address(this)) >= _amountNeeded) {
+            return (_amountNeeded,0);
+        }
+        return _liquidatePosition(_snapshotLenders(0), _amountNeeded, false);
+    }
+
+    function _liquidatePosition(lenderSnapshot[] memory snapshot, uint256 _amountNeeded, bool refresh) internal returns (uint256 _amountFreed, uint256 _loss) {
         uint256 _balance = want.balanceOf(address(this));
 
         if (_balance >= _amountNeeded) {
             //if we don't set reserve here withdrawer will be sent our full balance
             return (_amountNeeded,0);
         } else {
-            uint256 received = _withdrawSome(_amountNeeded - _balance).add(_balance);
+            uint256 received = _withdrawSome(snapshot, _amountNeeded - _balance, refresh).add(_balance);
             if (received >= _amountNeeded) {
                 return (_amountNeeded,0);
             } else {
@@ -698,9 +1172,71 @@ contract Strategy is BaseStrategy {
     }
 
     function harvestTrigger(uint256 callCost) public override view returns (bool) {
-        uint256 wantCallCost = _callCostToWant(callCost);
+        return super.harvestTrigger(_callCostToWant(callCost));
+    }
+
+    //only the uniswap path is cached. weth needs no price and an external oracle is read live
+    //never reverts, a broken pair must not stop harvest or tend
+    function _updateWantPrice() internal {
+        if (address(want) == weth || wantToEthOracle != address(0) || wantPair == address(0)) {
+            return;
+        }
+
+        try this.wantPriceCumulative() returns (uint256 cumulative) {
+            if (priceTimestampLast == 0) {
+                priceCumulativeLast = cumulative;
+                priceTimestampLast = block.timestamp;
+                return;
+            }
+
+            //a short window is cheap to push around so keep accumulating until it covers twapPeriod
+            uint256 elapsed = block.timestamp.sub(priceTimestampLast);
+            if (elapsed < twapPeriod) {
+                return;
+            }
+
+            wantPerEth = _averageWantPerEth(priceCumulativeLast, cumulative, elapsed);
+            wantPriceBlock = block.number;
+            priceCumulativeLast = cumulative;
+            priceTimestampLast = block.timestamp;
+        } catch {}
+    }
+
+    //the pair's cumulative price of eth in want as of this block. same as UniswapV2OracleLibrary.currentCumulativePrices
+    function wantPriceCumulative() public view returns (uint256 cumulative) {
+        require(wantPair != address(0), "!pair");
+        IUniPair pair = IUniPair(wantPair);
+
+        (uint112 reserve0, uint112 reserve1, uint32 timestampLast) = pair.getReserves();
+        cumulative = wethIsToken0 ? pair.price0CumulativeLast() : pair.price1CumulativeLast();
 
-        return super.harvestTrigger(wantCallCost);
+        uint32 timestamp = uint32(block.timestamp % 2**32);
+        if (timestampLast != timestamp && reserve0 > 0 && reserve1 > 0) {
+            //UQ112x112 price since the pair last synced. overflow is desired, as in the pair
+            uint256 price = wethIsToken0 ? (uint256(reserve1) << 112) / reserve0 : (uint256(reserve0) << 112) / reserve1;
+            cumulative += price * (timestamp - timestampLast);
+        }
+    }
+
+    //want for 1e18 wei averaged between two cumulative readings
+    function _averageWantPerEth(uint256 cumulativeStart, uint256 cumulativeEnd, uint256 elapsed) internal pure returns (uint256) {
+        return ((cumulativeEnd - cumulativeStart) / elapsed).mul(1e18) >> 112;
+    }
+
+    //the cached average while fresh. once stale we average from the last observation up to now instead
+    //returns 0 if there is no window of at least twapPeriod yet
+    function _wantPerEthTwap() internal view returns (uint256) {
+        if (wantPerEth > 0 && block.number.sub(wantPriceBlock) <= wantPriceStaleness) {
+            return wantPerEth;
+        }
+
+        if (priceTimestampLast > 0 && block.timestamp.sub(priceTimestampLast) >= twapPeriod) {
+            try this.wantPriceCumulative() returns (uint256 cumulative) {
+                return _averageWantPerEth(priceCumulativeLast, cumulative, block.timestamp.sub(priceTimestampLast));
+            } catch {}
+        }
+
+        return wantPerEth;
     }
 
     function ethToWant(uint256 _amount) internal view returns (uint256){
@@ -720,14 +1256,15 @@ contract Strategy is BaseStrategy {
 
         //three situations
         //1 currency is eth so no change.
-        //2 we use uniswap swap price
-        //3 we use external oracle
+        //2 we use external oracle
+        //3 we use the uniswap twap. spot is only read before the first window has closed
         if(address(want) == weth){
             wantCallCost = callCost;
-        }else if(wantToEthOracle == address(0)){
-            wantCallCost = ethToWant(callCost);
-        }else{
+        }else if(wantToEthOracle != address(0)){
             wantCallCost = IWantToEth(wantToEthOracle).ethToWant(callCost);
+        }else{
+            uint256 price = _wantPerEthTwap();
+            wantCallCost = price > 0 ? callCost.mul(price).div(1e18) : ethToWant(callCost);
         }
 
         return wantCallCost;
@@ -735,24 +1272,28 @@ contract Strategy is BaseStrategy {
 
     function tendTrigger(uint256 callCost) public view override returns (bool) {
         // make sure to call tendtrigger with same callcost as harvestTrigger
-        if (harvestTrigger(callCost)) {
+        uint256 wantCallCost = _callCostToWant(callCost);
+        if (super.harvestTrigger(wantCallCost)) {
             return false;
         }
-        uint256 wantCallCost = _callCostToWant(callCost);
+
+        //read the lenders once for both checks
+        uint256 looseAssets = want.balanceOf(address(this));
+        lenderSnapshot[] memory snapshot = _snapshotLenders(looseAssets);
 
         //test if we want to change iron bank position
-        (,uint256 _amount)= internalCreditOfficer();
+        (,uint256 _amount)= _internalCreditOfficer(_currentSupplyRate(snapshot, looseAssets));
         if(profitFactor.mul(wantCallCost) < _amount){
             return true;
         }
 
         //now let's check if there is better apr somewhere else.
         //If there is and profit potential is worth changing then lets do it
-        (uint256 lowest, uint256 lowestApr, , uint256 potential) = estimateAdjustPosition();
+        (uint256 lowest, uint256 lowestApr, , uint256 potential) = _estimateAdjustPosition(snapshot, looseAssets);
 
         //if protential > lowestApr it means we are changing horses
         if (potential > lowestApr) {
-            uint256 nav = lenders[lowest].nav();
+            uint256 nav = snapshot[lowest].nav;
 
             //profit increase is 1 days profit with new apr
             uint256 profitIncrease = (nav.mul(potential) - nav.mul(lowestApr)).div(1e18).div(365);
@@ -0,0 +1,178 @@
+import asyncio
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import requests
+from eth_abi import decode_abi, encode_abi
+from eth_utils import function_signature_to_4byte_selector
+
+# Vault 0.3.0 StrategyParams index
+TOTAL_DEBT = 5
+# rough gas per call, used to price callCost. tests/gas_bench/baselines.json has measured numbers
+HARVEST_GAS = 1_500_000
+TEND_GAS = 1_000_000
+
+
+def _calldata(signature, types=(), args=()):
+    return "0x" + (function_signature_to_4byte_selector(signature) + encode_abi(list(types), list(args))).hex()
+
+
+class RpcPool:
+    """JSON-RPC over a bounded pool of keep-alive connections.
+
+    At most size requests are in flight. Each runs on a worker thread with its own
+    slot in one requests session, so asyncio callers can fan out without opening a
+    connection per call.
+    """
+
+    def __init__(self, url, size=8, timeout=10):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.executor = ThreadPoolExecutor(size)
+        self.semaphore = asyncio.Semaphore(size)
+        self.ids = itertools.count()
+
+    def _post(self, payload):
+        response = self.session.post(self.url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        body = response.json()
+        if "error" in body:
+            raise RuntimeError(f"{payload['method']} failed: {body['error']}")
+        return body["result"]
+
+    async def request(self, method, params):
+        payload = {"jsonrpc": "2.0", "id": next(self.ids), "method": method, "params": params}
+        async with self.semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, self._post, payload)
+
+    async def call(self, to, data, block):
+        result = await self.request("eth_call", [{"to": to, "data": data}, block])
+        return bytes.fromhex(result[2:])
+
+    def close(self):
+        self.executor.shutdown()
+        self.session.close()
+
+
+@dataclass
+class KeeperStrategy:
+    """A strategy to keep. eth_per_want is the 1e18 scaled price used to rank it against the rest."""
+
+    address: str
+    eth_per_want: int = 10 ** 18
+
+
+@dataclass
+class Job:
+    """A trigger that fired. profit and cost are in wei, profit net of cost."""
+
+    strategy: KeeperStrategy
+    action: str
+    profit: int
+    call_cost: int
+    block: int
+
+
+class Keeper:
+    """Checks harvestTrigger and tendTrigger for many strategies at once and ranks what is due.
+
+    Every read in a poll is pinned to one block. Triggers are priced with the current gas price
+    times HARVEST_GAS or TEND_GAS. Expected profit is the unreported gain for a harvest and one
+    day of the rate gain the strategy itself uses in tendTrigger for a tend.
+    """
+
+    def __init__(self, rpc, strategies, harvest_gas=HARVEST_GAS, tend_gas=TEND_GAS):
+        self.rpc = rpc
+        self.strategies = strategies
+        self.harvest_gas = harvest_gas
+        self.tend_gas = tend_gas
+
+    async def _trigger(self, strategy, name, call_cost, block):
+        (due,) = decode_abi(["bool"], await self.rpc.call(strategy.address, _calldata(f"{name}(uint256)", ["uint256"], [call_cost]), block))
+        return due
+
+    async def _harvest_profit(self, strategy, block):
+        vault, assets = await asyncio.gather(
+            self.rpc.call(strategy.address, _calldata("vault()"), block),
+            self.rpc.call(strategy.address, _calldata("estimatedTotalAssets()"), block),
+        )
+        (vault,) = decode_abi(["address"], vault)
+        (assets,) = decode_abi(["uint256"], assets)
+        params = decode_abi(["uint256"] * 8, await self.rpc.call(vault, _calldata("strategies(address)", ["address"], [strategy.address]), block))
+        return max(assets - params[TOTAL_DEBT], 0)
+
+    async def _tend_profit(self, strategy, block):
+        adjust, statuses = await asyncio.gather(
+            self.rpc.call(strategy.address, _calldata("estimateAdjustPosition()"), block),
+            self.rpc.call(strategy.address, _calldata("lendStatuses()"), block),
+        )
+        lowest, lowest_apr, _, potential = decode_abi(["uint256"] * 4, adjust)
+        (statuses,) = decode_abi(["(string,uint256,uint256,address)[]"], statuses)
+        if potential <= lowest_apr or lowest >= len(statuses):
+            return 0
+        # same yardstick as Strategy.tendTrigger: a day of the better rate on what we move
+        return statuses[lowest][1] * (potential - lowest_apr) // 10 ** 18 // 365
+
+    async def check(self, strategy, gas_price, block_number):
+        """Jobs due for one strategy. A harvest makes a tend redundant."""
+        block = hex(block_number)
+        harvest_cost = gas_price * self.harvest_gas
+        tend_cost = gas_price * self.tend_gas
+        harvest_due, tend_due = await asyncio.gather(
+            self._trigger(strategy, "harvestTrigger", harvest_cost, block),
+            self._trigger(strategy, "tendTrigger", tend_cost, block),
+        )
+        if harvest_due:
+            profit = await self._harvest_profit(strategy, block)
+            return [Job(strategy, "harvest", profit * strategy.eth_per_want // 10 ** 18 - harvest_cost, harvest_cost, block_number)]
+        if tend_due:
+            profit = await self._tend_profit(strategy, block)
+            return [Job(strategy, "tend", profit * strategy.eth_per_want // 10 ** 18 - tend_cost, tend_cost, block_number)]
+        return []
+
+    async def poll(self):
+        """Every job due at the latest block, most profitable first."""
+        block_number, gas_price = await asyncio.gather(self.rpc.request("eth_blockNumber", []), self.rpc.request("eth_gasPrice", []))
+        block_number, gas_price = int(block_number, 16), int(gas_price, 16)
+        checks = await asyncio.gather(*[self.check(s, gas_price, block_number) for s in self.strategies], return_exceptions=True)
+
+        jobs = []
+        for strategy, result in zip(self.strategies, checks):
+            if isinstance(result, Exception):
+                print(f"{strategy.address}: check failed: {result}")
+                continue
+            jobs.extend(result)
+        return sorted(jobs, key=lambda job: job.profit, reverse=True)
+
+    async def run(self, execute, interval=12, rounds=None):
+        """Poll every interval seconds and hand due jobs to execute(job) in profit order."""
+        for _ in itertools.count() if rounds is None else range(rounds):
+            for job in await self.poll():
+                await asyncio.get_running_loop().run_in_executor(None, execute, job)
+            await asyncio.sleep(interval)
+
+
+def main():
+    # brownie run keeper. KEEPER_STRATEGIES is a comma separated list of strategy addresses
+    from brownie import Strategy, accounts, web3
+
+    keeper = accounts.load(os.environ["KEEPER_ACCOUNT"])
+    strategies = [KeeperStrategy(address.strip()) for address in os.environ["KEEPER_STRATEGIES"].split(",")]
+
+    def execute(job):
+        getattr(Strategy.at(job.strategy.address), job.action)({"from": keeper})
+
+    async def serve():
+        rpc = RpcPool(web3.provider.endpoint_uri, size=int(os.environ.get("KEEPER_CONNECTIONS", 8)))
+        try:
+            await Keeper(rpc, strategies).run(execute)
+        finally:
+            rpc.close()
+
+    asyncio.run(serve())
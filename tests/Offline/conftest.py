@@ -0,0 +1,356 @@
+import pytest
+from brownie import Wei, config, network, web3
+
+# Offline profile. Mock protocols are deployed on a plain local chain and their code is copied to the
+# mainnet addresses the plugins hardcode, so nothing needs a fork.
+# run with: npm run test:offline   (brownie test tests/Offline --network hardhat, or anvil)
+
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+USDC = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+COMP = "0xc00e94Cb662C3520282E6f5717214004A7f26888"
+UNISWAP_ROUTER = "0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D"
+IRON_BANK = "0xAB1c342C7bf5Ec5F02ADEA1c2270670bCa144CbB"
+COMPTROLLER = "0x3d9819210A31b4961b30EF54bE2aeD79B9c9Cd3B"
+CR_ETH = "0xD06527D5e56A3495252A528C4987003b712860eE"
+C_ETH = "0x4Ddc2D193948926D02f9B1fE9e1daa0718270ED5"
+C_USDC = "0x39AA39c021dfbaE8faC545936693aC917d5E7563"
+CR_USDC = "0x44fbeBd2F576670a6C33f6Fc0B00aA8c5753b322"
+IRON_WETH = "0x41c84c0e2EE0b740Cf0d31F63f3B6F627DC6b393"
+SOLO = "0x1E0447b19BB6EcFdAe1e4AE1694b0C3659614e4e"
+ALPHA_BANK = "0x67B66C99D3Eb37Fa76Aa3Ed1ff33E8e39F0b9c7A"
+
+SET_CODE_METHODS = ["hardhat_setCode", "anvil_setCode", "evm_setAccountCode"]
+
+#share of every seeded market that is borrowed by the rest of the market
+UTILISATION = 0.6
+
+
+def set_code(address, code):
+    for method in SET_CODE_METHODS:
+        response = web3.provider.make_request(method, [address, code])
+        if "error" not in response:
+            return
+    # skipping would report the whole suite green without running it
+    pytest.fail(f"{network.show_active()} has no setCode rpc. run the offline suite with --network hardhat or anvil", pytrace=False)
+
+
+def deploy_at(container, address, deployer):
+    # deploy a template and copy its runtime code. mocks keep constructors empty for this
+    template = deployer.deploy(container)
+    set_code(address, web3.eth.get_code(template.address).hex())
+    return container.at(address)
+
+
+def ctoken_exchange_rate(decimals):
+    # compound starts markets at 0.02 underlying per cToken
+    return 2 * 10 ** (16 + decimals - 8)
+
+
+def seed_market(ctoken, token, admin, amount):
+    token.approve(ctoken, amount, {"from": admin})
+    ctoken.mint(amount, {"from": admin})
+    ctoken.borrowDemand(int(amount * UTILISATION), {"from": admin})
+
+
+@pytest.fixture(scope="module", autouse=True)
+def shared_setup(module_isolation):
+    pass
+
+
+@pytest.fixture(scope="module")
+def creamdev(accounts):
+    # admin of every mock. owns the iron bank credit limits like the cream multisig
+    yield accounts[8]
+
+
+@pytest.fixture(scope="module")
+def weth(creamdev, MockWETH):
+    yield deploy_at(MockWETH, WETH, creamdev)
+
+
+@pytest.fixture(scope="module")
+def usdc(creamdev, MockERC20):
+    token = deploy_at(MockERC20, USDC, creamdev)
+    token.initialize("USD Coin", "USDC", 6, {"from": creamdev})
+    yield token
+
+
+@pytest.fixture(scope="module")
+def comp(creamdev, MockERC20):
+    token = deploy_at(MockERC20, COMP, creamdev)
+    token.initialize("Compound", "COMP", 18, {"from": creamdev})
+    yield token
+
+
+@pytest.fixture(scope="module")
+def oracle(creamdev, MockPriceOracle):
+    yield creamdev.deploy(MockPriceOracle)
+
+
+@pytest.fixture(scope="module")
+def ironbank(creamdev, oracle, comp, MockComptroller):
+    comptroller = deploy_at(MockComptroller, IRON_BANK, creamdev)
+    comptroller.initialize(oracle, comp, {"from": creamdev})
+    yield comptroller
+
+
+@pytest.fixture(scope="module")
+def comptroller(creamdev, oracle, comp, MockComptroller):
+    comptroller = deploy_at(MockComptroller, COMPTROLLER, creamdev)
+    comptroller.initialize(oracle, comp, {"from": creamdev})
+    yield comptroller
+
+
+@pytest.fixture(scope="module")
+def creamComptroller(creamdev, oracle, comp, MockComptroller):
+    comptroller = creamdev.deploy(MockComptroller)
+    comptroller.initialize(oracle, comp, {"from": creamdev})
+    yield comptroller
+
+
+@pytest.fixture(scope="module")
+def lendingModel(creamdev, MockJumpRateModel):
+    # 2% base, 22% at an 80% kink then 100% a year jump
+    yield creamdev.deploy(MockJumpRateModel, 0.02e18, 0.2e18, 1e18, 0.8e18)
+
+
+@pytest.fixture(scope="module")
+def ironBankModel(creamdev, MockJumpRateModel):
+    # cheaper than the lending markets at their seeded utilisation so the strategy borrows
+    yield creamdev.deploy(MockJumpRateModel, 0, 0.05e18, 1e18, 0.8e18)
+
+
+@pytest.fixture(scope="module")
+def cUsdc(creamdev, usdc, comptroller, lendingModel, MockCToken):
+    ctoken = deploy_at(MockCToken, C_USDC, creamdev)
+    ctoken.initialize(usdc, comptroller, lendingModel, ctoken_exchange_rate(6), 0.1e18, "Compound USD Coin", "cUSDC", {"from": creamdev})
+    comptroller._supportMarket(ctoken, {"from": creamdev})
+    comptroller._setCompSpeed(ctoken, 0.01e18, {"from": creamdev})
+
+    amount = 1_000_000 * 1e6
+    usdc.mint(creamdev, amount, {"from": creamdev})
+    seed_market(ctoken, usdc, creamdev, amount)
+    yield ctoken
+
+
+@pytest.fixture(scope="module")
+def crUsdc(creamdev, usdc, creamComptroller, lendingModel, MockCToken):
+    ctoken = deploy_at(MockCToken, CR_USDC, creamdev)
+    ctoken.initialize(usdc, creamComptroller, lendingModel, ctoken_exchange_rate(6), 0.1e18, "Cream USD Coin", "crUSDC", {"from": creamdev})
+    creamComptroller._supportMarket(ctoken, {"from": creamdev})
+
+    amount = 500_000 * 1e6
+    usdc.mint(creamdev, amount, {"from": creamdev})
+    seed_market(ctoken, usdc, creamdev, amount)
+    yield ctoken
+
+
+@pytest.fixture(scope="module")
+def cEth(creamdev, comptroller, lendingModel, MockCEther):
+    ctoken = deploy_at(MockCEther, C_ETH, creamdev)
+    ctoken.initialize(comptroller, lendingModel, ctoken_exchange_rate(18), 0.1e18, "Compound Ether", "cETH", {"from": creamdev})
+    comptroller._supportMarket(ctoken, {"from": creamdev})
+    comptroller._setCompSpeed(ctoken, 0.01e18, {"from": creamdev})
+
+    amount = Wei("20 ether")
+    ctoken.mint({"from": creamdev, "value": amount})
+    ctoken.borrowDemand(int(amount * UTILISATION), {"from": creamdev})
+    yield ctoken
+
+
+@pytest.fixture(scope="module")
+def crEth(creamdev, creamComptroller, lendingModel, MockCEther):
+    ctoken = deploy_at(MockCEther, CR_ETH, creamdev)
+    ctoken.initialize(creamComptroller, lendingModel, ctoken_exchange_rate(18), 0.1e18, "Cream Ether", "crETH", {"from": creamdev})
+    creamComptroller._supportMarket(ctoken, {"from": creamdev})
+
+    amount = Wei("10 ether")
+    ctoken.mint({"from": creamdev, "value": amount})
+    ctoken.borrowDemand(int(amount * UTILISATION), {"from": creamdev})
+    yield ctoken
+
+
+@pytest.fixture(scope="module")
+def ironWeth(creamdev, weth, ironbank, oracle, ironBankModel, MockCToken):
+    ctoken = deploy_at(MockCToken, IRON_WETH, creamdev)
+    ctoken.initialize(weth, ironbank, ironBankModel, ctoken_exchange_rate(18), 0.1e18, "Iron Bank Wrapped Ether", "iWETH", {"from": creamdev})
+    ironbank._supportMarket(ctoken, {"from": creamdev})
+    oracle.setUnderlyingPrice(ctoken, 2000 * 1e18, {"from": creamdev})
+
+    amount = Wei("30 ether")
+    weth.deposit({"from": creamdev, "value": amount})
+    seed_market(ctoken, weth, creamdev, amount)
+    yield ctoken
+
+
+@pytest.fixture(scope="module")
+def ironUsdc(creamdev, usdc, ironbank, oracle, ironBankModel, MockCToken):
+    ctoken = creamdev.deploy(MockCToken)
+    ctoken.initialize(usdc, ironbank, ironBankModel, ctoken_exchange_rate(6), 0.1e18, "Iron Bank USD Coin", "iUSDC", {"from": creamdev})
+    ironbank._supportMarket(ctoken, {"from": creamdev})
+    # 1 usdc = 1 usd in the 1e36 / decimals convention
+    oracle.setUnderlyingPrice(ctoken, 1e30, {"from": creamdev})
+
+    amount = 2_000_000 * 1e6
+    usdc.mint(creamdev, amount, {"from": creamdev})
+    seed_market(ctoken, usdc, creamdev, amount)
+    yield ctoken
+
+
+@pytest.fixture(scope="module")
+def solo(creamdev, weth, usdc, MockSoloMargin, MockInterestSetter):
+    solo = deploy_at(MockSoloMargin, SOLO, creamdev)
+    solo.initialize({"from": creamdev})
+    # dydx's polynomial setter. maxAPR 100%, 10% x + 10% x^2 + 80% x^6
+    setter = creamdev.deploy(MockInterestSetter, 1e18, [0, 10, 10, 0, 0, 0, 80])
+    solo.addMarket(weth, setter, {"from": creamdev})
+    solo.addMarket(usdc, setter, {"from": creamdev})
+
+    weth.deposit({"from": creamdev, "value": Wei("10 ether")})
+    usdc.mint(creamdev, 1_000_000 * 1e6, {"from": creamdev})
+    for market_id, token in enumerate([weth, usdc]):
+        amount = token.balanceOf(creamdev)
+        token.approve(solo, amount, {"from": creamdev})
+        solo_deposit(solo, creamdev, market_id, amount)
+        solo.borrowDemand(market_id, int(amount * UTILISATION), {"from": creamdev})
+    yield solo
+
+
+def solo_deposit(solo, account, market_id, amount):
+    # Actions.ActionArgs for a wei delta deposit from the account itself
+    action = (0, 0, (True, 0, 0, amount), market_id, 0, account, 0, b"")
+    solo.operate([(account, 0)], [action], {"from": account})
+
+
+@pytest.fixture(scope="module")
+def alphaBank(creamdev, MockAlphaBank, MockBankConfig):
+    bank = deploy_at(MockAlphaBank, ALPHA_BANK, creamdev)
+    bank.initialize(creamdev.deploy(MockBankConfig, 1000), {"from": creamdev})
+
+    amount = Wei("10 ether")
+    bank.deposit({"from": creamdev, "value": amount})
+    bank.borrowDemand(int(amount * UTILISATION), {"from": creamdev})
+    yield bank
+
+
+@pytest.fixture(scope="module")
+def router(creamdev, weth, usdc, comp, MockUniswapRouter):
+    router = deploy_at(MockUniswapRouter, UNISWAP_ROUTER, creamdev)
+    # 1 eth = 2000 usdc. 1 comp = 0.1 eth
+    router.setRate(weth, usdc, 2000 * 1e6, {"from": creamdev})
+    router.setRate(comp, weth, 0.1e18, {"from": creamdev})
+    usdc.mint(router, 10_000_000 * 1e6, {"from": creamdev})
+    weth.deposit({"from": creamdev, "value": Wei("5 ether")})
+    weth.transfer(router, Wei("5 ether"), {"from": creamdev})
+    yield router
+
+
+
+
+@pytest.fixture(scope="module")
+def protocol(weth, usdc, comp, router, ironbank, comptroller, cUsdc, crUsdc, cEth, crEth, ironWeth, ironUsdc, solo, alphaBank):
+    # everything the plugins reach through hardcoded addresses
+    yield
+
+
+#change these fixtures for generic tests
+@pytest.fixture(scope="module", params=["usdc", "weth"])
+def currency(request, protocol, usdc, weth):
+    yield usdc if request.param == "usdc" else weth
+
+
+@pytest.fixture
+def ironToken(currency, weth, ironWeth, ironUsdc):
+    yield ironWeth if currency == weth else ironUsdc
+
+
+@pytest.fixture
+def whale(accounts, currency, weth, usdc):
+    acc = accounts[0]
+    if currency == weth:
+        weth.deposit({"from": acc, "value": Wei("60 ether")})
+    else:
+        usdc.mint(acc, 1_000_000 * 1e6, {"from": acc})
+    yield acc
+
+
+@pytest.fixture
+def amount(currency):
+    # a whale sized deposit in either currency
+    yield (50 if currency.symbol() == "WETH" else 100_000) * 10 ** currency.decimals()
+
+
+@pytest.fixture
+def strategist(accounts, whale, currency):
+    decimals = currency.decimals()
+    currency.transfer(accounts[1], 1 * (10 ** decimals), {"from": whale})
+    yield accounts[1]
+
+
+@pytest.fixture
+def gov(accounts):
+    yield accounts[3]
+
+
+@pytest.fixture
+def rewards(gov):
+    yield gov
+
+
+@pytest.fixture
+def guardian(accounts):
+    yield accounts[2]
+
+
+@pytest.fixture
+def keeper(accounts):
+    yield accounts[4]
+
+
+@pytest.fixture
+def rando(accounts):
+    yield accounts[9]
+
+
+@pytest.fixture
+def Vault(pm):
+    yield pm(config["dependencies"][0]).Vault
+
+
+@pytest.fixture
+def vault(gov, rewards, guardian, currency, Vault):
+    vault = gov.deploy(Vault)
+    vault.initialize(currency, gov, rewards, "", "", guardian)
+    vault.setDepositLimit(2 ** 256 - 1, {"from": gov})
+    yield vault
+
+
+@pytest.fixture
+def strategy(strategist, keeper, vault, gov, currency, weth, ironToken, cUsdc, crUsdc, Strategy, GenericCompound, GenericCream, GenericDyDx, EthCream, EthCompound, AlphaHomo):
+    strategy = strategist.deploy(Strategy, vault, ironToken)
+    strategy.setKeeper(keeper)
+
+    if currency == weth:
+        strategy.addLender(strategist.deploy(EthCream, strategy, "Cream"), {"from": gov})
+        strategy.addLender(strategist.deploy(AlphaHomo, strategy, "Alpha Homo"), {"from": gov})
+        strategy.addLender(strategist.deploy(EthCompound, strategy, "Compound"), {"from": gov})
+    else:
+        strategy.addLender(strategist.deploy(GenericCompound, strategy, "Compound", cUsdc), {"from": gov})
+        strategy.addLender(strategist.deploy(GenericCream, strategy, "Cream", crUsdc), {"from": gov})
+    strategy.addLender(strategist.deploy(GenericDyDx, strategy, "DyDx"), {"from": gov})
+    yield strategy
+
+
+@pytest.fixture
+def smallrunningstrategy(gov, strategy, ironbank, creamdev, currency, vault, whale, amount):
+    vault.addStrategy(strategy, 10_000, 2 ** 256 - 1, 1000, {"from": gov})
+    ironbank._setCreditLimit(strategy, 1_000_000 * 1e18, {"from": creamdev})
+
+    currency.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    strategy.harvest({"from": gov})
+
+    #do it again with a smaller amount to replicate being this full for a while
+    vault.deposit(amount // 10, {"from": whale})
+    strategy.harvest({"from": gov})
+    yield strategy
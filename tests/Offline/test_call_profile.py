@@ -0,0 +1,21 @@
+import json
+
+from brownie import chain
+from call_profiler import format_table, profile_tx, to_json
+
+
+def test_profile_harvest(smallrunningstrategy, gov, keeper, vault, whale, amount):
+    vault.deposit(amount // 10, {"from": whale})
+    chain.mine(100)
+    tx = smallrunningstrategy.harvest({"from": keeper})
+
+    stats = profile_tx(tx)
+    harvest = stats[("Strategy", "harvest")]
+    assert harvest.count == 1
+    # the root frame holds everything the transaction executed
+    assert harvest.cumulative_gas == max(s.cumulative_gas for s in stats.values())
+    assert harvest.cumulative_gas == sum(s.gas for s in stats.values())
+    assert any(s.contract != "Strategy" for s in stats.values())
+
+    assert format_table(stats).splitlines()[1].startswith("Strategy.harvest")
+    assert json.loads(to_json(stats))[0]["function"] == "harvest"
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from ironbank_model import credit_inputs_from_chain, credit_officer, iron_bank_borrow_rate, market_from_chain
+
+STEPS = [1, 3, 10, 57, 400]
+
+
+def assert_matches_chain(strategy, vault, ironbank, ironToken, gov, binary_search):
+    # one model call for the whole step grid, then the contract for each step
+    inputs = credit_inputs_from_chain(strategy, vault, ironbank, ironToken)
+    inputs.update(step=np.array(STEPS), binary_search=binary_search)
+    decisions = credit_officer(**inputs)
+    assert not decisions.reverted.any()
+
+    for i, step in enumerate(STEPS):
+        strategy.setCreditSearch(step, binary_search, {"from": gov})
+        borrowMore, amount = strategy.internalCreditOfficer()
+        assert bool(decisions.borrow_more[i]) == borrowMore
+        assert decisions.amount[i] == amount
+
+
+@pytest.mark.parametrize("binary_search", [False, True])
+def test_model_borrow(smallrunningstrategy, vault, ironbank, ironToken, gov, binary_search):
+    assert_matches_chain(smallrunningstrategy, vault, ironbank, ironToken, gov, binary_search)
+
+
+@pytest.mark.parametrize("binary_search", [False, True])
+def test_model_repay(smallrunningstrategy, vault, ironbank, ironToken, creamdev, gov, MockJumpRateModel, binary_search):
+    # a borrow rate above the supply rate makes the credit officer repay in increments
+    expensive = creamdev.deploy(MockJumpRateModel, 1e24, 1e24, 1e24, 0.8e18)
+    ironToken._setInterestRateModel(expensive, {"from": creamdev})
+    assert smallrunningstrategy.ironBankOutstandingDebtStored() > 0
+
+    assert_matches_chain(smallrunningstrategy, vault, ironbank, ironToken, gov, binary_search)
+
+
+def test_model_shortfall(smallrunningstrategy, vault, ironbank, ironToken, creamdev, gov):
+    ironbank._setCreditLimit(smallrunningstrategy, 0, {"from": creamdev})
+    assert_matches_chain(smallrunningstrategy, vault, ironbank, ironToken, gov, False)
+
+
+def test_model_borrow_rate(smallrunningstrategy, ironToken):
+    strategy = smallrunningstrategy
+    market = market_from_chain(ironToken)
+
+    for repay, limit in [(True, ironToken.totalBorrows()), (False, ironToken.getCash())]:
+        amounts = [limit * i // 20 for i in range(21)]
+        rates, reverted = iron_bank_borrow_rate(market, amounts, repay)
+        assert not reverted.any()
+
+        for amount, rate in zip(amounts, rates):
+            assert strategy.ironBankBorrowRate(amount, repay) == rate
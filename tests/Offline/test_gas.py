@@ -0,0 +1,80 @@
+import pytest
+from brownie import chain
+from gas_bench import GasBaseline
+
+LENDER_COUNTS = range(1, 11)
+# credit limit, credit search step, binary search
+SETTINGS = {
+    "no-credit": (0, 10, False),
+    "step-10": (1_000_000 * 1e18, 10, False),
+    "step-50": (1_000_000 * 1e18, 50, False),
+    "binary": (1_000_000 * 1e18, 10, True),
+}
+
+
+@pytest.fixture(scope="module")
+def gas_baseline():
+    baseline = GasBaseline()
+    yield baseline
+    baseline.save()
+
+
+@pytest.fixture
+def lender_factories(strategist, currency, weth, cUsdc, crUsdc, GenericCompound, GenericCream, GenericDyDx, EthCream, EthCompound, AlphaHomo):
+    if currency == weth:
+        return [
+            lambda s, name: strategist.deploy(EthCream, s, name),
+            lambda s, name: strategist.deploy(AlphaHomo, s, name),
+            lambda s, name: strategist.deploy(EthCompound, s, name),
+            lambda s, name: strategist.deploy(GenericDyDx, s, name),
+        ]
+    return [
+        lambda s, name: strategist.deploy(GenericCompound, s, name, cUsdc),
+        lambda s, name: strategist.deploy(GenericCream, s, name, crUsdc),
+        lambda s, name: strategist.deploy(GenericDyDx, s, name),
+    ]
+
+
+@pytest.mark.parametrize("setting", SETTINGS)
+@pytest.mark.parametrize("num_lenders", LENDER_COUNTS)
+def test_gas(num_lenders, setting, gas_baseline, lender_factories, strategist, keeper, gov, whale, vault, currency, amount, ironToken, ironbank, creamdev, Strategy):
+    credit_limit, step, binary_search = SETTINGS[setting]
+    case = f"{currency.symbol()}-{num_lenders}-{setting}"
+
+    strategy = strategist.deploy(Strategy, vault, ironToken)
+    strategy.setKeeper(keeper)
+    lenders = []
+    for i in range(num_lenders):
+        lender = lender_factories[i % len(lender_factories)](strategy, f"lender {i}")
+        strategy.addLender(lender, {"from": gov})
+        lenders.append(lender)
+
+    vault.addStrategy(strategy, 10_000, 2 ** 256 - 1, 1000, {"from": gov})
+    ironbank._setCreditLimit(strategy, credit_limit, {"from": creamdev})
+    strategy.setCreditSearch(step, binary_search, {"from": gov})
+
+    currency.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    regressions = [gas_baseline.record(case, "harvest-first", strategy.harvest({"from": gov}))]
+
+    # a second harvest with interest accrued is the steady state keepers pay for
+    vault.deposit(amount // 10, {"from": whale})
+    chain.mine(100)
+    regressions.append(gas_baseline.record(case, "harvest", strategy.harvest({"from": keeper})))
+
+    chain.mine(100)
+    regressions.append(gas_baseline.record(case, "tend", strategy.tend({"from": keeper})))
+
+    shares = [1000 // num_lenders] * num_lenders
+    shares[0] += 1000 - sum(shares)
+    allocation = [(lender, share) for lender, share in zip(lenders, shares)]
+    regressions.append(gas_baseline.record(case, "manualAllocation", strategy.manualAllocation(allocation, {"from": gov})))
+
+    regressions.append(gas_baseline.record(case, "withdraw", vault.withdraw(amount // 2, {"from": whale})))
+
+    regressions = [r for r in regressions if r]
+    assert not regressions, "\n".join(regressions)
+
+    missing = gas_baseline.missing(case)
+    if missing:
+        pytest.skip(missing)
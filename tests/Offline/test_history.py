@@ -0,0 +1,32 @@
+from brownie import chain
+from history import History, iron_bank_source, plugin_source, record, replay
+from history.recorder import KIND_FIELDS
+from lender_models import lender_state_from_chain
+
+
+def test_record_and_replay(smallrunningstrategy, ironbank, ironToken, amount, tmp_path, GenericCompound, GenericCream, GenericDyDx, EthCream, EthCompound, AlphaHomo):
+    addresses = [smallrunningstrategy.lenders(i) for i in range(smallrunningstrategy.numLenders())]
+    plugins = [c for container in [GenericCompound, GenericCream, GenericDyDx, EthCream, EthCompound, AlphaHomo] for c in container if c.address in addresses]
+
+    start = chain.height
+    chain.mine(20)
+    sources = {f"lender{i}": plugin_source(plugin) for i, plugin in enumerate(plugins)}
+    sources["ironbank"] = iron_bank_source(ironbank, ironToken)
+    blocks = range(start, chain.height + 1, 5)
+    record(tmp_path, blocks, sources)
+
+    history = History.open(tmp_path)
+    assert list(history.blocks) == list(blocks)
+    assert (history.timestamps[1:] >= history.timestamps[:-1]).all()
+
+    # nothing has moved since the last row so it is the chain's current state
+    for i, plugin in enumerate(plugins):
+        _, state = lender_state_from_chain(plugin)
+        kind = history.sources[f"lender{i}"]["kind"]
+        recorded = history.state(f"lender{i}", len(history) - 1)
+        assert all(getattr(recorded, f) == getattr(state, f) for f in KIND_FIELDS[kind])
+
+    result = replay(history, [(plugin._name, f"lender{i}") for i, plugin in enumerate(plugins)], amount, iron_bank="ironbank", credit_limit=1_000_000 * 10 ** 18)
+    assert len(result.net_assets) == len(history)
+    assert result.net_assets[-1] >= result.net_assets[0]
+    assert result.apr >= 0
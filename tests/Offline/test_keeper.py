@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+from brownie import web3
+from scripts.keeper import Keeper, KeeperStrategy, RpcPool
+
+
+@pytest.fixture
+def mock_strategies(accounts, MockKeeperStrategy):
+    yield [accounts[0].deploy(MockKeeperStrategy) for _ in range(6)]
+
+
+def poll(strategies, size=3, **kwargs):
+    async def run():
+        rpc = RpcPool(web3.provider.endpoint_uri, size=size)
+        try:
+            return await Keeper(rpc, [KeeperStrategy(s.address, **kwargs) for s in strategies]).poll()
+        finally:
+            rpc.close()
+
+    return asyncio.run(run())
+
+
+def test_nothing_due(mock_strategies):
+    assert poll(mock_strategies) == []
+
+
+def test_jobs_ranked_by_profit(mock_strategies, accounts, MockKeeperStrategy):
+    harvest_small, harvest_big, tend, tend_and_harvest, idle, broke = mock_strategies
+    harvest_small.setTriggers(True, False)
+    harvest_small.setAssets(102e18, 100e18)
+    harvest_big.setTriggers(True, False)
+    harvest_big.setAssets(110e18, 100e18)
+
+    # moving 365 eth for a 1e18 apr gain is worth a day of 1 eth
+    tend.setTriggers(False, True)
+    tend.setLenderNavs([0, 365e18])
+    tend.setAdjustPosition(1, 0, 0, 1e18)
+
+    tend_and_harvest.setTriggers(True, True)
+    tend_and_harvest.setAssets(103e18, 100e18)
+
+    jobs = poll(mock_strategies)
+    assert [(job.strategy.address, job.action) for job in jobs] == [
+        (harvest_big.address, "harvest"),
+        (tend_and_harvest.address, "harvest"),
+        (harvest_small.address, "harvest"),
+        (tend.address, "tend"),
+    ]
+    assert len({job.block for job in jobs}) == 1
+    assert all(job.call_cost > 0 for job in jobs)
+    assert jobs[0].profit == 10e18 - jobs[0].call_cost
+
+    for job in jobs:
+        getattr(MockKeeperStrategy.at(job.strategy.address), job.action)({"from": accounts[0]})
+    assert poll(mock_strategies) == []
+    assert harvest_big.harvests() == 1 and tend.tends() == 1
+
+
+def test_want_price_scales_profit(mock_strategies):
+    strategy = mock_strategies[0]
+    strategy.setTriggers(True, False)
+    strategy.setAssets(2_000e6, 1_000e6)
+
+    # 1000 usdc at 0.0005 eth each
+    (job,) = poll([strategy], eth_per_want=5 * 10 ** 26)
+    assert job.profit == 5 * 10 ** 17 - job.call_cost
@@ -0,0 +1,29 @@
+import numpy as np
+from lender_models import lender_state_from_chain, plugin_apr, plugin_apr_after_deposit
+
+
+def plugins(strategy, containers):
+    addresses = [strategy.lenders(i) for i in range(strategy.numLenders())]
+    return [c for container in containers for c in container if c.address in addresses]
+
+
+def assert_models_match(strategy, containers, amount):
+    amounts = [0, 1, amount // 100, amount, amount * 10, amount * 1000]
+    for plugin in plugins(strategy, containers):
+        name, state = lender_state_from_chain(plugin)
+
+        apr, reverted = plugin_apr(name, state)
+        assert not reverted
+        assert apr == plugin.apr()
+
+        aprs, reverted = plugin_apr_after_deposit(name, state, amounts)
+        assert not np.asarray(reverted).any()
+        assert list(aprs) == [plugin.aprAfterDeposit(a) for a in amounts]
+
+
+def test_models_fresh(strategy, amount, GenericCompound, GenericCream, GenericDyDx, EthCream, EthCompound, AlphaHomo):
+    assert_models_match(strategy, [GenericCompound, GenericCream, GenericDyDx, EthCream, EthCompound, AlphaHomo], amount)
+
+
+def test_models_running(smallrunningstrategy, amount, GenericCompound, GenericCream, GenericDyDx, EthCream, EthCompound, AlphaHomo):
+    assert_models_match(smallrunningstrategy, [GenericCompound, GenericCream, GenericDyDx, EthCream, EthCompound, AlphaHomo], amount)
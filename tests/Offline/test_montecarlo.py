@@ -0,0 +1,35 @@
+from ironbank_model import market_from_chain
+from ironbank_model.chain import _oracle_price
+from lender_models import lender_state_from_chain
+from montecarlo import Demand, simulate
+
+
+def test_simulate_from_chain(strategy, ironbank, ironToken, amount, GenericCompound, GenericCream, GenericDyDx, EthCream, EthCompound, AlphaHomo):
+    addresses = [strategy.lenders(i) for i in range(strategy.numLenders())]
+    plugins = [c for container in [GenericCompound, GenericCream, GenericDyDx, EthCream, EthCompound, AlphaHomo] for c in container if c.address in addresses]
+
+    markets = {f"lender{i}": lender_state_from_chain(plugin)[1] for i, plugin in enumerate(plugins)}
+    markets["ironbank"] = market_from_chain(ironToken)
+    demand = {name: Demand(0.6) for name in markets}
+    cadences = [(6500, None), (6500, 1300)]
+
+    results = simulate(
+        markets,
+        demand,
+        [(plugin._name, f"lender{i}") for i, plugin in enumerate(plugins)],
+        amount,
+        cadences,
+        paths=4,
+        rows=130,
+        block_step=100,
+        prices={"ironbank": _oracle_price(ironbank, ironToken)},
+        workers=2,
+        iron_bank="ironbank",
+        credit_limit=1_000_000 * 10 ** 18,
+    )
+
+    for cadence in cadences:
+        for interval in results[cadence].values():
+            assert interval.low <= interval.mean <= interval.high
+    # tending on top of harvests only adds keeper calls
+    assert results[(6500, 1300)]["keeper_gas"].mean > results[(6500, None)]["keeper_gas"].mean
@@ -0,0 +1,396 @@
+import brownie
+from brownie import Wei
+from useful_methods import genericStateOfStrat, genericStateOfVault
+
+
+def test_mock_markets(protocol, chain, cUsdc, crEth, ironWeth, lendingModel, solo, alphaBank, comptroller, comp, creamdev):
+    # the cTokens quote what their model gives for their own state
+    for ctoken in [cUsdc, crEth]:
+        cash, borrows, reserves = ctoken.getCash(), ctoken.totalBorrows(), ctoken.totalReserves()
+        supplyRate = lendingModel.getSupplyRate(cash, borrows, reserves, ctoken.reserveFactorMantissa())
+        assert ctoken.supplyRatePerBlock() == supplyRate
+        assert supplyRate > 0
+    assert ironWeth.borrowRatePerBlock() > 0
+
+    soloIndex = solo.getMarketCurrentIndex(0)
+    supplyBefore = cUsdc.exchangeRateStored()
+    chain.sleep(3600)
+    chain.mine(100)
+
+    assert solo.getMarketCurrentIndex(0)[1] > soloIndex[1]
+    assert alphaBank.pendingInterest(0) > 0
+    cUsdc.accrueInterest({"from": creamdev})
+    assert cUsdc.exchangeRateStored() > supplyBefore
+
+    # suppliers earn comp
+    comptroller.claimComp(creamdev, [cUsdc], {"from": creamdev})
+    assert comp.balanceOf(creamdev) > 0
+
+
+def test_normal_activity(smallrunningstrategy, vault, currency, whale, strategist, chain):
+    strategy = smallrunningstrategy
+
+    navs = [status[1] for status in strategy.lendStatuses()]
+    assert sum(navs) > 0
+    startingAssets = vault.totalAssets()
+
+    for i in range(5):
+        chain.sleep(6 * 3600)
+        chain.mine(1000)
+        strategy.harvest({"from": strategist})
+        genericStateOfStrat(strategy, currency, vault)
+        genericStateOfVault(vault, currency)
+
+    assert vault.totalAssets() > startingAssets
+
+    before = currency.balanceOf(whale)
+    vault.withdraw({"from": whale})
+    assert currency.balanceOf(whale) - before > startingAssets * 0.99
+
+
+def test_iron_bank_credit(smallrunningstrategy, ironbank, creamdev, strategist):
+    strategy = smallrunningstrategy
+
+    debt = strategy.ironBankOutstandingDebtStored()
+    assert debt > 0
+
+    # a credit limit of 0 leaves the whole debt as shortfall
+    ironbank._setCreditLimit(strategy, 0, {"from": creamdev})
+    strategy.harvest({"from": strategist})
+    assert strategy.ironBankOutstandingDebtStored() < debt / 10
+
+
+def test_remove_lenders(smallrunningstrategy, currency, weth, cUsdc, crUsdc, cEth, crEth, gov):
+    strategy = smallrunningstrategy
+    markets = {"Compound": cEth, "Cream": crEth} if currency == weth else {"Compound": cUsdc, "Cream": crUsdc}
+
+    for status in strategy.lendStatuses():
+        strategy.safeRemoveLender(status[3], {"from": gov})
+        # the whole cToken balance is redeemed, not just the underlying it was worth
+        if status[0] in markets:
+            assert markets[status[0]].balanceOf(status[3]) == 0
+
+    assert strategy.numLenders() == 0
+    assert strategy.lentTotalAssets() == 0
+    assert currency.balanceOf(strategy) > 0
+
+
+def test_manual_allocation(smallrunningstrategy, currency, whale, gov):
+    strategy = smallrunningstrategy
+    lenders = [status[3] for status in strategy.lendStatuses()]
+
+    # everything to the first lender
+    strategy.manualAllocation([(lenders[0], 1000)], {"from": gov})
+    statuses = strategy.lendStatuses()
+    assert statuses[0][1] > 0
+    assert all(status[1] < 10 for status in statuses[1:])
+    assert currency.balanceOf(strategy) == 0
+
+    # loose want under the tolerance is still deposited when every lender is on target
+    nav = statuses[0][1]
+    loose = strategy.estimatedTotalAssets() // 2000
+    currency.transfer(strategy, loose, {"from": whale})
+    strategy.manualAllocation([(lenders[0], 1000)], {"from": gov})
+    assert currency.balanceOf(strategy) == 0
+    assert strategy.lendStatuses()[0][1] > nav
+
+    with brownie.reverts("SHARE!=1000"):
+        strategy.manualAllocation([(lenders[0], 500)], {"from": gov})
+
+
+def test_manual_allocation_partial_move(smallrunningstrategy, gov):
+    strategy = smallrunningstrategy
+    lenders = [status[3] for status in strategy.lendStatuses()]
+    shares = [1000 // len(lenders)] * len(lenders)
+    shares[0] += 1000 - sum(shares)
+    strategy.manualAllocation(list(zip(lenders, shares)), {"from": gov})
+
+    # move 10% from the first lender to the second. the rest keep their share and must not be touched
+    navs = [status[1] for status in strategy.lendStatuses()]
+    shares[0] -= 100
+    shares[1] += 100
+    tx = strategy.manualAllocation(list(zip(lenders, shares)), {"from": gov})
+
+    after = [status[1] for status in strategy.lendStatuses()]
+    assert after[0] < navs[0]
+    assert after[1] > navs[1]
+    assert after[2:] == navs[2:]
+    moves = {c["to"] for c in tx.subcalls if c["to"] in lenders and c["function"].split(".")[-1].split("(")[0] in ("withdraw", "withdrawAll", "deposit")}
+    assert moves == set(lenders[:2])
+
+
+def test_dydx_balance(smallrunningstrategy, solo, gov, GenericDyDx):
+    strategy = smallrunningstrategy
+    (dydx,) = [GenericDyDx.at(status[3]) for status in strategy.lendStatuses() if status[0] == "DyDx"]
+    strategy.manualAllocation([(dydx, 1000)], {"from": gov})
+
+    # the per market query agrees with scanning every market's balance
+    tokens, _, balances = solo.getAccountBalances((dydx, 0))
+    assert dydx.underlyingBalanceStored() == balances[dydx.dydxMarketId()][1] > 0
+    assert tokens[dydx.dydxMarketId()] == dydx.want()
+
+
+def test_alpha_bank_view(smallrunningstrategy, currency, weth, alphaBank, amount, chain, AlphaHomo):
+    if currency != weth:
+        return
+    strategy = smallrunningstrategy
+    (alpha,) = [AlphaHomo.at(status[3]) for status in strategy.lendStatuses() if status[0] == "Alpha Homo"]
+    chain.mine(100)
+
+    # the combined view reads the bank once and agrees with every single getter
+    nav, apr, apr_after, eth_per_share = alpha.bankView(amount)
+    assert nav == alpha.nav()
+    assert apr == alpha.apr()
+    assert apr_after == alpha.aprAfterDeposit(amount)
+    assert nav == alpha.underlyingBalanceStored() + currency.balanceOf(alpha)
+    # share price is rounded to 1e-18 eth so only agrees with the stored balance to within a wei per share
+    assert abs(alphaBank.balanceOf(alpha) * eth_per_share // 10 ** 18 - alpha.underlyingBalanceStored()) <= alphaBank.balanceOf(alpha) // 10 ** 18 + 1
+
+
+def test_compound_comp_harvest(smallrunningstrategy, currency, weth, comp, comptroller, vault, whale, keeper, gov, chain, GenericCompound):
+    if currency == weth:
+        return
+    strategy = smallrunningstrategy
+    (compound,) = [GenericCompound.at(status[3]) for status in strategy.lendStatuses() if status[0] == "Compound"]
+    strategy.manualAllocation([(compound, 1000)], {"from": gov})
+    chain.mine(1000)
+
+    # user withdrawals leave comp accruing instead of claiming and swapping it
+    vault.withdraw(vault.balanceOf(whale) // 100, {"from": whale})
+    vault.withdraw(vault.balanceOf(whale) // 100, {"from": whale})
+    assert comp.balanceOf(compound) == 0
+    assert comptroller.compAccrued(compound) > compound.minCompToSell()
+
+    # sold only once it covers the keeper's gas many times over
+    assert not compound.harvestCompTrigger(Wei("1 ether"))
+    assert compound.harvestCompTrigger(Wei("0.0001 ether"))
+
+    with brownie.reverts("!keepers"):
+        compound.harvestComp(0, {"from": whale})
+    with brownie.reverts("INSUFFICIENT_OUTPUT_AMOUNT"):
+        compound.harvestComp(2 ** 255, {"from": keeper})
+
+    # the keeper can't skip the trigger or lower it with its own gas price
+    with brownie.reverts("!management"):
+        compound.setCompGasPrice(0, {"from": keeper})
+    compound.setCompGasPrice("1000 gwei", {"from": gov})
+    with brownie.reverts("!worth selling"):
+        compound.harvestComp(1, {"from": keeper, "gas_price": 0})
+    compound.setCompGasPrice(0, {"from": gov})
+    minCompToSell = compound.minCompToSell()
+    compound.setMinCompToSell(2 ** 255, {"from": gov})
+    with brownie.reverts("!worth selling"):
+        compound.harvestComp(1, {"from": keeper})
+    compound.setMinCompToSell(minCompToSell, {"from": gov})
+
+    nav = compound.nav()
+    compound.harvestComp(1, {"from": keeper})
+    assert comp.balanceOf(compound) == 0
+    assert compound.nav() > nav
+    assert currency.balanceOf(compound) == 0
+
+    # comp accrued before removal stays with the lender and is sold back to the strategy
+    chain.mine(1000)
+    strategy.safeRemoveLender(compound, {"from": gov})
+    assert comp.balanceOf(strategy) == 0
+    loose = currency.balanceOf(strategy)
+    compound.harvestComp(1, {"from": keeper})
+    assert currency.balanceOf(strategy) > loose
+    assert currency.balanceOf(compound) == 0
+
+
+def test_lender_state(smallrunningstrategy, amount, chain, GenericCompound, GenericCream, GenericDyDx, EthCream, EthCompound, AlphaHomo):
+    strategy = smallrunningstrategy
+    chain.mine(10)
+    containers = [GenericCompound, GenericCream, GenericDyDx, EthCream, EthCompound, AlphaHomo]
+    addresses = [strategy.lenders(i) for i in range(strategy.numLenders())]
+    plugins = [c for container in containers for c in container if c.address in addresses]
+    assert len(plugins) == len(addresses)
+
+    # the combined view is the five getters in one call. with nothing to deposit it skips the quote and gives apr
+    for plugin in plugins:
+        assert plugin.lenderState(amount) == (plugin.nav(), plugin.apr(), plugin.hasAssets(), plugin.weightedApr(), plugin.aprAfterDeposit(amount))
+        assert plugin.lenderState(0) == (plugin.nav(), plugin.apr(), plugin.hasAssets(), plugin.weightedApr(), plugin.apr())
+
+
+def test_clone_lenders(smallrunningstrategy, currency, weth, cUsdc, crUsdc, strategist, gov, GenericCompound, GenericCream):
+    if currency == weth:
+        return
+    strategy = smallrunningstrategy
+    lenders = {status[0]: status[3] for status in strategy.lendStatuses()}
+
+    for container, name, clone_method, market in [(GenericCompound, "Compound", "cloneCompoundLender", cUsdc), (GenericCream, "Cream", "cloneCreamLender", crUsdc)]:
+        original = container.at(lenders[name])
+        tx = getattr(original, clone_method)(strategy, f"{name} clone", market, {"from": strategist})
+        clone = container.at(tx.events["Cloned"]["clone"])
+
+        # a minimal proxy costs a fraction of a full deployment
+        deployment = strategist.deploy(container, strategy, name, market).tx.gas_used
+        assert tx.gas_used < deployment / 2
+
+        # the clone sets itself up like the constructor would
+        assert clone.strategy() == strategy
+        assert clone.cToken() == market
+        assert clone.lenderName() == f"{name} clone"
+        assert clone.dust() == original.dust()
+        with brownie.reverts("Lender already initialized"):
+            clone.initialize(strategy, "again", market, {"from": strategist})
+        with brownie.reverts("Lender already initialized"):
+            original.initialize(strategy, "again", market, {"from": strategist})
+
+        strategy.addLender(clone, {"from": gov})
+        strategy.manualAllocation([(clone, 1000)], {"from": gov})
+        assert clone.nav() > 0
+        assert clone.lenderState(0)[0] == clone.nav()
+        if container == GenericCompound:
+            assert clone.minCompToSell() == original.minCompToSell() > 0
+
+
+def test_apr_after_withdraw(smallrunningstrategy, amount, GenericCompound, GenericCream, GenericDyDx, EthCream, EthCompound, AlphaHomo):
+    strategy = smallrunningstrategy
+    containers = [GenericCompound, GenericCream, GenericDyDx, EthCream, EthCompound, AlphaHomo]
+    addresses = [strategy.lenders(i) for i in range(strategy.numLenders())]
+    plugins = [c for container in containers for c in container if c.address in addresses]
+
+    # both curves start from the same point and withdrawing never lowers the rate
+    for plugin in plugins:
+        assert plugin.aprAfterWithdraw(0) == plugin.aprAfterDeposit(0)
+        assert plugin.aprAfterWithdraw(amount // 100) >= plugin.aprAfterWithdraw(0) >= plugin.aprAfterDeposit(amount // 100)
+
+
+def test_debt_decrease_estimate(smallrunningstrategy, vault):
+    strategy = smallrunningstrategy
+    debt = vault.strategies(strategy).dict()["totalDebt"]
+
+    # a small cut comes out of the lender it costs least so the estimate stays close to today's rate
+    current = strategy.estimatedFutureAPR(debt)
+    cut = strategy.estimatedFutureAPR(debt * 99 // 100)
+    assert cut > 0
+    assert abs(cut - current) < current // 10
+
+
+def test_cached_want_price(smallrunningstrategy, currency, weth, router, vault, gov, keeper, creamdev, whale, chain, MockUniswapPair):
+    strategy = smallrunningstrategy
+    strategy.harvest({"from": keeper})
+    if currency == weth:
+        assert strategy.wantPair() == brownie.ZERO_ADDRESS
+        assert strategy.wantPerEth() == 0
+        return
+
+    pair = MockUniswapPair.at(strategy.wantPair())
+    assert pair == router.getPair(weth, currency)
+    assert strategy.priceTimestampLast() > 0
+
+    # the average needs a window of at least twapPeriod
+    chain.sleep(strategy.twapPeriod() + 1)
+    strategy.harvest({"from": keeper})
+    spot = router.getAmountsOut(1e18, [weth, currency])[1]
+    assert abs(strategy.wantPerEth() - spot) <= 1
+    assert strategy.wantPriceBlock() == chain.height
+
+    # a call cost the profit covers comfortably at the averaged price and not at all at 1000x it
+    currency.transfer(strategy, 1000 * 10 ** currency.decimals(), {"from": whale})
+    profit = strategy.estimatedTotalAssets() - vault.strategies(strategy).dict()["totalDebt"]
+    budget = profit + vault.creditAvailable(strategy)
+    call_cost = budget * 10 ** 18 // (strategy.wantPerEth() * 1000)
+    assert strategy.harvestTrigger(call_cost)
+
+    # the pool moves. inside the staleness window the triggers keep the average
+    router.setRate(weth, currency, spot * 1000, {"from": creamdev})
+    assert strategy.harvestTrigger(call_cost)
+
+    with brownie.reverts("!authorized"):
+        strategy.setWantPriceWindows(1800, 10, {"from": creamdev})
+    strategy.setWantPriceWindows(1800, 10, {"from": gov})
+
+    # past it they average from the last observation, which by now is almost all the new price
+    chain.sleep(3600)
+    chain.mine(11)
+    assert not strategy.harvestTrigger(call_cost)
+
+    # a broken pair keeps the old average and harvest still goes through
+    cached = strategy.wantPerEth()
+    pair.setBroken(True, {"from": creamdev})
+    strategy.harvest({"from": keeper})
+    assert strategy.wantPerEth() == cached
+
+
+def test_rebalance_stops_where_aprs_cross(strategist, keeper, gov, vault, currency, weth, whale, amount, ironToken, ironbank, creamdev, cUsdc, crUsdc, Strategy, GenericCompound, GenericCream):
+    if currency == weth:
+        return
+    # two lenders on the same rate model and no iron bank so only the rebalance moves money
+    strategy = strategist.deploy(Strategy, vault, ironToken)
+    strategy.setKeeper(keeper)
+    compound = strategist.deploy(GenericCompound, strategy, "Compound", cUsdc)
+    cream = strategist.deploy(GenericCream, strategy, "Cream", crUsdc)
+    strategy.addLender(compound, {"from": gov})
+    strategy.addLender(cream, {"from": gov})
+    vault.addStrategy(strategy, 10_000, 2 ** 256 - 1, 1000, {"from": gov})
+    ironbank._setCreditLimit(strategy, 0, {"from": creamdev})
+    currency.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    strategy.harvest({"from": gov})
+
+    # everything in the smaller market, which now pays less
+    strategy.manualAllocation([(cream, 1000)], {"from": gov})
+    nav = cream.nav()
+    gap = compound.apr() - cream.apr()
+    assert gap > 0
+    # moving all of it would overshoot: cream back at its seeded rate and compound diluted below it
+    assert compound.aprAfterDeposit(nav) < cream.aprAfterWithdraw(nav)
+
+    strategy.harvest({"from": keeper})
+
+    # part of the balance moved and the two rates now meet to within a bisection step
+    assert 0 < cream.nav() < nav
+    assert abs(compound.apr() - cream.apr()) < gap // 10
+
+
+def _plugins(strategy, containers):
+    # plugin contracts in lender order
+    addresses = [strategy.lenders(i) for i in range(strategy.numLenders())]
+    found = {c.address: c for container in containers for c in container if c.address in addresses}
+    return [found[a] for a in addresses]
+
+
+def test_snapshot_decisions(smallrunningstrategy, currency, vault, whale, gov, chain, GenericCompound, GenericCream, GenericDyDx, EthCream, EthCompound, AlphaHomo):
+    strategy = smallrunningstrategy
+    plugins = _plugins(strategy, [GenericCompound, GenericCream, GenericDyDx, EthCream, EthCompound, AlphaHomo])
+    vault.deposit(vault.totalAssets() // 100, {"from": whale})
+    strategy.harvest({"from": gov})
+    chain.mine(10)
+
+    # the snapshot picks the same lenders the single getters would
+    loose = currency.balanceOf(strategy)
+    quotes = [p.aprAfterDeposit(loose) if loose else p.apr() for p in plugins]
+    with_assets = [i for i, p in enumerate(plugins) if p.hasAssets()]
+    lowest = min(with_assets, key=lambda i: plugins[i].apr())
+    highest = max(range(len(plugins)), key=lambda i: quotes[i])
+    potential = plugins[highest].aprAfterDeposit(plugins[lowest].nav() + loose)
+    assert strategy.estimateAdjustPosition() == (lowest, plugins[lowest].apr(), highest, potential)
+    assert strategy.lentTotalAssets() == sum(p.nav() for p in plugins)
+
+
+def test_snapshot_refreshed_after_withdraw(smallrunningstrategy, vault, whale, ironbank, creamdev, strategist, gov):
+    strategy = smallrunningstrategy
+    n = strategy.numLenders()
+    lenders = [strategy.lenders(i) for i in range(n)]
+    shares = [1000 // n] * n
+    shares[0] += 1000 - sum(shares)
+    strategy.manualAllocation(list(zip(lenders, shares)), {"from": gov})
+
+    def lender_calls(tx):
+        calls = [(c["to"], c["function"].split(".")[-1].split("(")[0]) for c in tx.subcalls if c["to"] in lenders]
+        withdrawals = [k for k, (_, fn) in enumerate(calls) if fn == "withdraw"]
+        refreshed = [k for k in withdrawals if k + 1 < len(calls) and calls[k + 1] == (calls[k][0], "lenderState")]
+        return withdrawals, refreshed
+
+    # half the vault drains more than one lender. nothing reuses the snapshot so it is not read again
+    withdrawals, refreshed = lender_calls(vault.withdraw(vault.balanceOf(whale) // 2, {"from": whale}))
+    assert len(withdrawals) > 1
+    assert refreshed == []
+
+    # repaying the iron bank in adjustPosition reuses the snapshot for the deposit, so lenders are read again
+    ironbank._setCreditLimit(strategy, 0, {"from": creamdev})
+    withdrawals, refreshed = lender_calls(strategy.harvest({"from": strategist}))
+    assert len(refreshed) > 0
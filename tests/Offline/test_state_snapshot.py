@@ -0,0 +1,31 @@
+from brownie import chain
+from state_snapshot import read_state, strategy_snapshot
+
+
+def test_snapshot_matches_calls(smallrunningstrategy, vault, currency):
+    strategy = smallrunningstrategy
+    s, v = read_state(strategy, vault, currency)
+
+    assert s.block == v.block == chain.height
+    assert s.name == strategy.name()
+    assert s.want == currency.balanceOf(strategy)
+    assert s.estimated_total_assets == strategy.estimatedTotalAssets()
+    assert s.params.totalDebt == vault.strategies(strategy)[5]
+    assert s.current_supply_rate == strategy.currentSupplyRate()
+    assert s.iron_bank_debt == strategy.ironBankOutstandingDebtStored()
+    assert [(l.address, l.assets) for l in s.lenders] == [(l[3], l[1]) for l in strategy.lendStatuses()]
+
+    assert v.total_assets == vault.totalAssets()
+    assert v.loose == currency.balanceOf(vault)
+
+
+def test_snapshot_pinned_block(smallrunningstrategy, vault, currency, strategist):
+    strategy = smallrunningstrategy
+    before = strategy_snapshot(strategy, currency, vault)
+
+    chain.sleep(6 * 3600)
+    chain.mine(1000)
+    strategy.harvest({"from": strategist})
+
+    assert strategy_snapshot(strategy, currency, vault, block=before.block) == before
+    assert strategy_snapshot(strategy, currency, vault).params.totalGain > before.params.totalGain
@@ -94,4 +94,91 @@ def test_migrate(smallrunningstrategy, ironbank,AlphaHomo, ironWeth,Strategy, cr
     strategy2.tend({'from': strategist})
     
     assert strategy2.ironBankOutstandingDebtStored() > 0
-    genericStateOfStrat(strategy2, currency, vault)
\ No newline at end of file
+    genericStateOfStrat(strategy2, currency, vault)
+
+def test_binary_search_credit(smallrunningstrategy, gov, chain, vault, currency, whale, strategist):
+    strategy = smallrunningstrategy
+
+    linear = strategy.internalCreditOfficer()
+
+    strategy.setCreditSearch(10, True, {'from': strategist})
+    assert strategy.binarySearchCredit() == True
+    #same step so bisection must land on the same increment
+    assert strategy.internalCreditOfficer() == linear
+
+    #much finer granularity for the same number of rate checks
+    strategy.setCreditSearch(10_000, True, {'from': strategist})
+    borrowMore, amount = strategy.internalCreditOfficer()
+    assert borrowMore == linear[0]
+
+    strategy.tend({'from': strategist})
+    genericStateOfStrat(strategy, currency, vault)
+
+    with brownie.reverts("!step"):
+        strategy.setCreditSearch(0, True, {'from': strategist})
+
+
+def test_local_jump_rate_model(smallrunningstrategy, ironWeth, interface, currency):
+    strategy = smallrunningstrategy
+    model = interface.JumpRateModelI(ironWeth.interestRateModel())
+
+    base = model.baseRatePerBlock()
+    multiplier = model.multiplierPerBlock()
+    jump = model.jumpMultiplierPerBlock()
+    kink = model.kink()
+
+    cash = currency.balanceOf(ironWeth)
+    borrows = ironWeth.totalBorrows()
+    reserves = ironWeth.totalReserves()
+
+    #the maths the strategy uses in its credit officer loop
+    def jumpRate(cash, borrows):
+        util = 0 if borrows == 0 else borrows * 10**18 // (cash + borrows - reserves)
+        if util <= kink:
+            return util * multiplier // 10**18 + base
+        normal = kink * multiplier // 10**18 + base
+        return (util - kink) * jump // 10**18 + normal
+
+    for amount in [0, cash // 10, cash // 2, cash - 1]:
+        assert jumpRate(cash - amount, borrows + amount) == strategy.ironBankBorrowRate(amount, False)
+        assert jumpRate(cash - amount, borrows + amount) == model.getBorrowRate(cash - amount, borrows + amount, reserves)
+
+
+def _set_iron_bank_model(ironWeth, model, accounts):
+    # the market admin swaps the model. the strategy reads it fresh on every call
+    abi = [
+        {"name": "admin", "type": "function", "stateMutability": "view", "inputs": [], "outputs": [{"name": "", "type": "address"}]},
+        {"name": "_setInterestRateModel", "type": "function", "stateMutability": "nonpayable", "inputs": [{"name": "newInterestRateModel", "type": "address"}], "outputs": [{"name": "", "type": "uint256"}]},
+    ]
+    market = brownie.Contract.from_abi("IronBankToken", ironWeth.address, abi)
+    market._setInterestRateModel(model, {'from': accounts.at(market.admin(), force=True)})
+
+
+def test_local_model_checked_past_kink(smallrunningstrategy, ironWeth, MockRateModelProxy, accounts, strategist, currency):
+    strategy = smallrunningstrategy
+    proxy = strategist.deploy(MockRateModelProxy, ironWeth.interestRateModel())
+    _set_iron_bank_model(ironWeth, proxy, accounts)
+
+    cash = currency.balanceOf(ironWeth)
+    borrows = ironWeth.totalBorrows()
+    reserves = ironWeth.totalReserves()
+
+    #a jump multiplier that is only wrong past the kink. the strategy has to notice and ask the model
+    proxy.setJumpSkew(10**12, {'from': strategist})
+    for amount in [0, cash // 2, cash - 1]:
+        assert strategy.ironBankBorrowRate(amount, False) == proxy.getBorrowRate(cash - amount, borrows + amount, reserves)
+
+
+def test_local_model_credit_officer(smallrunningstrategy, ironWeth, MockRateModelProxy, accounts, strategist):
+    strategy = smallrunningstrategy
+    proxy = strategist.deploy(MockRateModelProxy, ironWeth.interestRateModel())
+    _set_iron_bank_model(ironWeth, proxy, accounts)
+
+    #toggling the proxy leaves the market untouched so both paths see the same state
+    for step, binary in [(10, False), (10, True), (10_000, True)]:
+        strategy.setCreditSearch(step, binary, {'from': strategist})
+        proxy.setOpaque(False, {'from': strategist})
+        local = strategy.internalCreditOfficer()
+        proxy.setOpaque(True, {'from': strategist})
+        remote = strategy.internalCreditOfficer()
+        assert local == remote
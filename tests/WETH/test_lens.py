@@ -0,0 +1,47 @@
+from brownie import Wei
+from useful_methods import genericStateOfStrat
+import brownie
+
+
+def test_lens_matches_strategy(smallrunningstrategy, StrategyLens, vault, currency, gov, rando):
+    strategy = smallrunningstrategy
+    lens = rando.deploy(StrategyLens)
+    callCost = 1000000 * 30 * 1e9
+
+    report, vaultState = lens.fullReport(strategy, vault, callCost)
+
+    assert report["name"] == strategy.name()
+    assert report["decimals"] == currency.decimals()
+    assert report["looseWant"] == currency.balanceOf(strategy)
+    assert report["estimatedTotalAssets"] == strategy.estimatedTotalAssets()
+    assert report["params"] == vault.strategies(strategy)
+    assert report["ironBankBorrowRate"] == strategy.ironBankBorrowRate(0, True)
+    assert report["currentSupplyRate"] == strategy.currentSupplyRate()
+    assert report["ironBankDebt"] == strategy.ironBankOutstandingDebtStored()
+    assert (report["borrowMore"], report["creditAmount"]) == strategy.internalCreditOfficer()
+    assert report["harvestTrigger"] == strategy.harvestTrigger(callCost)
+    assert report["tendTrigger"] == strategy.tendTrigger(callCost)
+    assert not report["harvestTriggerFailed"] and not report["tendTriggerFailed"]
+    assert report["emergencyExit"] == strategy.emergencyExit()
+    assert report["lendStatuses"] == strategy.lendStatuses()
+
+    assert vaultState["totalAssets"] == vault.totalAssets()
+    assert vaultState["totalDebt"] == vault.totalDebt()
+    assert vaultState["looseWant"] == currency.balanceOf(vault)
+
+    with brownie.reverts("WRONG VAULT"):
+        lens.fullReport(strategy, rando, callCost)
+
+    genericStateOfStrat(strategy, currency, vault)
+
+
+def test_lens_survives_reverting_reads(StrategyLens, Strategy, ironWeth, vault, strategist, rando):
+    # nothing lent and nothing loose, so currentSupplyRate divides by zero
+    strategy = strategist.deploy(Strategy, vault, ironWeth)
+    lens = rando.deploy(StrategyLens)
+    with brownie.reverts():
+        strategy.currentSupplyRate()
+
+    report, _ = lens.fullReport(strategy, vault, 1000000 * 30 * 1e9)
+    assert report["currentSupplyRate"] == lens.FAILED()
+    assert report["lendStatuses"] == []
@@ -38,3 +38,56 @@ def test_manual_override_weth(strategy, chain, vault, currency, interface, whale
         with brownie.reverts("!management"):
             plugin.withdraw(1,{"from": rando})
 
+
+
+def test_manual_allocation_weth(strategy, chain, vault, currency, whale, strategist, gov):
+    decimals = currency.decimals()
+    deposit_limit = 100_000_000 *(10 ** decimals)
+    vault.addStrategy(strategy, deposit_limit, deposit_limit, 500, {"from": gov})
+
+    currency.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(1000 *(10 ** decimals), {"from": whale})
+    strategy.harvest({"from": strategist})
+
+    status = strategy.lendStatuses()
+    total = strategy.estimatedTotalAssets()
+
+    with brownie.reverts("DUPLICATE"):
+        strategy.manualAllocation([(status[0][3], 500), (status[0][3], 500)], {"from": strategist})
+    with brownie.reverts("SHARE!=1000"):
+        strategy.manualAllocation([(status[0][3], 500)], {"from": strategist})
+
+    strategy.manualAllocation([(status[0][3], 700), (status[1][3], 300)], {"from": strategist})
+    status = strategy.lendStatuses()
+
+    assert status[0][1] >= total * 0.699
+    assert status[1][1] >= total * 0.299
+    for s in status[2:]:
+        assert s[1] < 1e12
+
+    #moving 10% only touches two lenders
+    tx = strategy.manualAllocation([(status[0][3], 600), (status[1][3], 400)], {"from": strategist})
+    assert strategy.lendStatuses()[1][1] >= total * 0.399
+    print("gas used for 10% rebalance:", tx.gas_used)
+
+
+def test_apr_curves(strategy, vault, currency, interface, whale, strategist, gov):
+    decimals = currency.decimals()
+    vault.addStrategy(strategy, 10_000, 100_000_000 *(10 ** decimals), 500, {"from": gov})
+    currency.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(1000 *(10 ** decimals), {"from": whale})
+    strategy.harvest({"from": strategist})
+
+    amounts = [0, 10 *(10 ** decimals), 1000 *(10 ** decimals)]
+    debtLimits = [0, 500 *(10 ** decimals), 2000 *(10 ** decimals)]
+    lenderAprs, futureAprs = strategy.aprCurves(amounts, debtLimits)
+
+    status = strategy.lendStatuses()
+    assert len(lenderAprs) == len(status)
+    for i, s in enumerate(status):
+        plugin = interface.IGeneric(s[3])
+        for j, amount in enumerate(amounts):
+            assert lenderAprs[i][j] == plugin.aprAfterDeposit(amount)
+
+    for k, limit in enumerate(debtLimits):
+        assert futureAprs[k] == strategy.estimatedFutureAPR(limit)
@@ -282,3 +282,26 @@ def test_debt_increment_weth(weth,Strategy,ironbank, ironWeth,creamdev, chain,re
         for j in status:
             print(f"Lender: {j[0]}, Deposits: {formS.format(j[1]/1e18)}, APR: {form.format(j[2]/1e18)}")
     
+
+
+def test_water_fill(strategy, chain, vault, currency, whale, strategist, gov):
+    deposit_limit = 100_000_000 *1e18
+    vault.addStrategy(strategy, 10_000, deposit_limit, 500, {"from": gov})
+    currency.approve(vault, 2 ** 256 - 1, {"from": whale})
+
+    with brownie.reverts("!chunks"):
+        strategy.setDepositChunks(0, {"from": strategist})
+    with brownie.reverts("!chunks"):
+        strategy.setDepositChunks(strategy.MAXDEPOSITCHUNKS() + 1, {"from": strategist})
+    strategy.setDepositChunks(20, {"from": strategist})
+
+    vault.deposit(10_000 *1e18, {"from": whale})
+    strategy.harvest({"from": strategist})
+
+    status = strategy.lendStatuses()
+    funded = [s for s in status if s[1] > 0]
+    #a big deposit is spread over more than one lender in a single harvest
+    assert len(funded) > 1
+    assert strategy.estimatedTotalAssets() >= 10_000 *1e18 *0.9999
+
+    genericStateOfStrat(strategy, currency, vault)
@@ -145,3 +145,26 @@ def test_withdrawals_weth_work(currency,interface, chain, whale,gov,strategist,r
     balanceAfter = currency.balanceOf(whale)
     withdrawn = balanceAfter - balanceBefore
     assert withdrawn > expectedout*0.99 and withdrawn < expectedout*1.01
+
+
+def test_withdraw_across_all_lenders(currency, chain, whale, gov, strategist, vault, strategy):
+    decimals = currency.decimals()
+    currency.approve(vault, 2 ** 256 - 1, {"from": whale} )
+    vault.addStrategy(strategy, 10_000, 1_000_000_000 *1e18, 1000, {"from": gov})
+
+    vault.deposit(1000 *(10 ** decimals), {"from": whale})
+    strategy.harvest({"from": strategist})
+
+    #spread evenly so a big withdrawal has to visit every lender
+    status = strategy.lendStatuses()
+    shares = [1000 // len(status)] * len(status)
+    shares[0] += 1000 - sum(shares)
+    strategy.manualAllocation([(s[3], share) for s, share in zip(status, shares)], {"from": strategist})
+
+    balanceBefore = currency.balanceOf(whale)
+    vault.withdraw(vault.balanceOf(whale), {"from": whale})
+    withdrawn = currency.balanceOf(whale) - balanceBefore
+
+    #no iteration cap so a single withdrawal empties every lender
+    assert withdrawn > 1000 *(10 ** decimals) * 0.99
+    assert strategy.lentTotalAssets() < 1000 *(10 ** decimals) * 0.01
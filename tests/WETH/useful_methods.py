@@ -1,44 +1,46 @@
 import brownie
 import requests
+from state_snapshot import strategy_snapshot, vault_snapshot
 
 def genericStateOfStrat(strategy, currency, vault):
-    decimals = currency.decimals()
-    print(f"\n----state of {strategy.name()}----")
+    s = strategy_snapshot(strategy, currency, vault)
+    decimals = s.decimals
+    print(f"\n----state of {s.name}----")
 
-    print("Want:", currency.balanceOf(strategy)/  (1 ** decimals))
-    print("Total assets estimate:", strategy.estimatedTotalAssets()/  (10 ** decimals))
-    strState = vault.strategies(strategy)
-    totalDebt = strState[5]/  (10 ** decimals)
-    debtLimit = strState[2]/  (10 ** decimals)
-    esassets =strategy.estimatedTotalAssets()+1
+    print("Want:", s.want/  (1 ** decimals))
+    print("Total assets estimate:", s.estimated_total_assets/  (10 ** decimals))
+    totalDebt = s.params.totalDebt/  (10 ** decimals)
+    debtLimit = s.params.debtLimit/  (10 ** decimals)
+    esassets = s.estimated_total_assets+1
 
-    totalReturns = strState[6]/  (10 ** decimals)
+    totalReturns = s.params.totalGain/  (10 ** decimals)
     print(f"Total Strategy Debt: {totalDebt:.5f}")
     print(f"Strategy Debt Limit: {debtLimit:.5f}")
     print(f"Total Strategy Returns: {totalReturns:.5f}")
     blocksPerYear = 2628333
-    ironapr = strategy.ironBankBorrowRate(0, True)*blocksPerYear/1e18
+    ironapr = (s.iron_bank_borrow_rate or 0)*blocksPerYear/1e18
 
-    apr= strategy.currentSupplyRate()*blocksPerYear/1e18
-    irondebt = strategy.ironBankOutstandingDebtStored()
+    apr= (s.current_supply_rate or 0)*blocksPerYear/1e18
+    irondebt = s.iron_bank_debt
     leverage = (irondebt*(apr-ironapr) + esassets*apr)/esassets
 
     print('Iron Bank Debt:', irondebt/  (10 ** decimals))  
-    print('Basic APR:', {:.2%}.format(apr))
+    print('Basic APR:', "{:.2%}".format(apr))
     print('Iron APR:',ironapr)
     print('Full APR:',leverage)
-    print("Harvest Trigger:", strategy.harvestTrigger(1000000 * 30 * 1e9))
+    print("Harvest Trigger:", s.harvest_trigger)
     print(
-        "Tend Trigger:", strategy.tendTrigger(1000000 * 30 * 1e9)
+        "Tend Trigger:", s.tend_trigger
     )  # 1m gas at 30 gwei
-    print("Emergency Exit:", strategy.emergencyExit())
+    print("Emergency Exit:", s.emergency_exit)
 
 
 def genericStateOfVault(vault, currency):
-    decimals = currency.decimals()
-    print(f"\n----state of {vault.name()} vault----")
-    balance = vault.totalAssets()/  (10 ** decimals)
+    v = vault_snapshot(vault, currency)
+    decimals = v.decimals
+    print(f"\n----state of {v.name} vault----")
+    balance = v.total_assets/  (10 ** decimals)
     print(f"Total Assets: {balance:.5f}")
-    balance = vault.totalDebt()/  (10 ** decimals)
-    print("Loose balance in vault:", currency.balanceOf(vault)/  (10 ** decimals))
+    balance = v.total_debt/  (10 ** decimals)
+    print("Loose balance in vault:", v.loose/  (10 ** decimals))
     print(f"Total Debt: {balance:.5f}")
@@ -0,0 +1,8 @@
+"""Per (contract, function) gas profile of a transaction's external calls.
+
+Walks a brownie transaction trace frame by frame and totals call count, self
+gas and cumulative gas for every external function that was entered.
+"""
+from .profile import CallStats, profile_trace, profile_tx, format_table, to_json
+
+__all__ = ["CallStats", "profile_trace", "profile_tx", "format_table", "to_json"]
@@ -0,0 +1,86 @@
+import json
+from dataclasses import asdict, dataclass
+
+
+@dataclass
+class CallStats:
+    """Totals for one (contract, function). gas excludes nested external calls, cumulative_gas includes them."""
+
+    contract: str
+    function: str
+    count: int = 0
+    gas: int = 0
+    cumulative_gas: int = 0
+
+
+def _frame_gas(first, last):
+    # gas left entering the frame minus gas left after its last op
+    return first["gas"] - (last["gas"] - last["gasCost"])
+
+
+def profile_trace(trace):
+    """Stats keyed by (contract, function) from an expanded brownie trace (tx.trace).
+
+    A frame starts wherever the depth increases and ends on the last step
+    before it drops back. Recursive entries of the same function only count
+    their outermost frame towards cumulative_gas.
+    """
+    stats = {}
+    # open frames: [key, first step, last step, gas used by child frames]
+    stack = []
+    open_keys = {}
+
+    def close():
+        key, first, last, child_gas = stack.pop()
+        total = _frame_gas(first, last)
+        entry = stats[key]
+        entry.gas += total - child_gas
+        open_keys[key] -= 1
+        if not open_keys[key]:
+            entry.cumulative_gas += total
+        if stack:
+            stack[-1][3] += total
+
+    # geth counts depth from 1, brownie from 0
+    base = trace[0]["depth"] - 1 if trace else 0
+    for step in trace:
+        depth = step["depth"] - base
+        while stack and depth < len(stack):
+            close()
+        if depth > len(stack):
+            contract, _, function = step["fn"].partition(".")
+            key = (step.get("contractName") or contract, function or step["fn"])
+            if key not in stats:
+                stats[key] = CallStats(*key)
+            stats[key].count += 1
+            open_keys[key] = open_keys.get(key, 0) + 1
+            stack.append([key, step, step, 0])
+        stack[-1][2] = step
+    while stack:
+        close()
+
+    return stats
+
+
+def profile_tx(tx):
+    """Profile a brownie TransactionReceipt. Needs a node with debug_traceTransaction."""
+    return profile_trace(tx.trace)
+
+
+def _sorted(stats, sort):
+    return sorted(stats.values(), key=lambda s: getattr(s, sort), reverse=True)
+
+
+def format_table(stats, sort="cumulative_gas", limit=None):
+    """Plain text table, heaviest first."""
+    rows = _sorted(stats, sort)[:limit]
+    width = max([len(f"{s.contract}.{s.function}") for s in rows] + [len("function")])
+    lines = [f"{'function':<{width}}  {'calls':>6}  {'gas':>10}  {'cumulative':>10}"]
+    for s in rows:
+        lines.append(f"{s.contract + '.' + s.function:<{width}}  {s.count:>6}  {s.gas:>10}  {s.cumulative_gas:>10}")
+    return "\n".join(lines)
+
+
+def to_json(stats, sort="cumulative_gas", **kwargs):
+    """JSON list of CallStats, heaviest first."""
+    return json.dumps([asdict(s) for s in _sorted(stats, sort)], **kwargs)
@@ -0,0 +1,8 @@
+"""Gas baselines for the strategy's keeper and user entry points.
+
+Records gas per (case, action), compares it with a JSON baseline and reports
+anything that grew past a tolerance.
+"""
+from .baseline import BASELINE_PATH, GasBaseline
+
+__all__ = ["BASELINE_PATH", "GasBaseline"]
@@ -0,0 +1,58 @@
+import json
+import os
+from pathlib import Path
+
+BASELINE_PATH = Path(__file__).parent / "baselines.json"
+# allowed growth over the baseline before a measurement counts as a regression
+DEFAULT_TOLERANCE = 0.02
+
+
+class GasBaseline:
+    """Gas measurements against a stored baseline.
+
+    GAS_TOLERANCE overrides the allowed growth. GAS_UPDATE=1 overwrites the
+    baseline with this run's numbers instead of comparing, and is the only way
+    a case gets into the baseline. Actions without a baseline are listed by
+    missing() so the caller can skip them rather than pass or fail.
+    """
+
+    def __init__(self, path=BASELINE_PATH, tolerance=None, update=None):
+        self.path = Path(path)
+        self.tolerance = float(os.environ.get("GAS_TOLERANCE", DEFAULT_TOLERANCE)) if tolerance is None else tolerance
+        self.update = os.environ.get("GAS_UPDATE") == "1" if update is None else update
+        self.baseline = json.loads(self.path.read_text()) if self.path.exists() else {}
+        self.measured = {}
+
+    def record(self, case, action, tx):
+        """Store tx.gas_used. Returns a message if it regressed, else None."""
+        gas = tx.gas_used
+        self.measured.setdefault(case, {})[action] = gas
+
+        if self.update:
+            return None
+        expected = self.baseline.get(case, {}).get(action)
+        if expected is None:
+            return None
+        if gas > expected * (1 + self.tolerance):
+            return f"{case} {action}: {gas} gas, baseline {expected} (+{(gas - expected) / expected:.1%})"
+        return None
+
+    def missing(self, case):
+        """Message naming the measured actions of case with no baseline, or None."""
+        if self.update:
+            return None
+        actions = [action for action in self.measured.get(case, {}) if action not in self.baseline.get(case, {})]
+        if not actions:
+            return None
+        return f"{case} {', '.join(actions)}: no baseline. Record it with GAS_UPDATE=1"
+
+    def save(self):
+        """Merge this run's numbers into the baseline file. Does nothing unless updating."""
+        if not self.update:
+            return self.baseline
+        merged = {case: dict(actions) for case, actions in self.baseline.items()}
+        for case, actions in self.measured.items():
+            merged.setdefault(case, {}).update(actions)
+        if merged != self.baseline:
+            self.path.write_text(json.dumps(merged, indent=2, sort_keys=True) + "\n")
+        return merged
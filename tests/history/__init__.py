@@ -0,0 +1,25 @@
+"""Recorded lender market history and an offline replay of the strategy.
+
+The recorder reads every market the strategy depends on at a range of blocks into
+memory mapped uint256 columns. The replay runs the harvest logic over them with the
+integer lender and credit officer models, without a node.
+"""
+from .columns import ColumnStore, from_limbs, to_limbs
+from .recorder import Source, alpha_source, ctoken_source, iron_bank_source, plugin_source, record, solo_source
+from .replay import History, ReplayResult, replay
+
+__all__ = [
+    "ColumnStore",
+    "from_limbs",
+    "to_limbs",
+    "Source",
+    "alpha_source",
+    "ctoken_source",
+    "iron_bank_source",
+    "plugin_source",
+    "record",
+    "solo_source",
+    "History",
+    "ReplayResult",
+    "replay",
+]
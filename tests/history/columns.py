@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+# uint256 values are stored as four little endian uint64 limbs
+LIMBS = 4
+LIMB_MASK = 2 ** 64 - 1
+
+
+def to_limbs(values):
+    """(n, 4) uint64 limbs of a sequence of ints below 2**256."""
+    values = [int(v) for v in values]
+    return np.array([[(v >> (64 * k)) & LIMB_MASK for k in range(LIMBS)] for v in values], dtype=np.uint64).reshape(-1, LIMBS)
+
+
+def from_limbs(limbs):
+    """Object array of python ints from (..., 4) uint64 limbs."""
+    limbs = np.asarray(limbs)
+    value = limbs[..., 0].astype(object)
+    for k in range(1, LIMBS):
+        value = value + (limbs[..., k].astype(object) << (64 * k))
+    return value
+
+
+class ColumnStore:
+    """A directory of .npy columns, one file per source field, described by meta.json.
+
+    Columns are uint256 limbs indexed by row. blocks.npy and timestamps.npy hold the
+    block each row was read at. Files are opened as memory maps so history larger
+    than memory can be written row by row and read back without loading it all.
+    """
+
+    def __init__(self, path, meta, mode="r"):
+        self.path = Path(path)
+        self.meta = meta
+        self.mode = mode
+        self._columns = {}
+
+    @classmethod
+    def create(cls, path, rows, sources):
+        """New store for rows rows. sources maps name => {"kind", "fields", "params"}."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        meta = {"rows": rows, "filled": 0, "sources": sources}
+        store = cls(path, meta, mode="r+")
+        store._columns["blocks"] = open_memmap(path / "blocks.npy", mode="w+", dtype=np.uint64, shape=(rows,))
+        store._columns["timestamps"] = open_memmap(path / "timestamps.npy", mode="w+", dtype=np.uint64, shape=(rows,))
+        for name, source in sources.items():
+            for field in source["fields"]:
+                store._columns[(name, field)] = open_memmap(path / f"{name}.{field}.npy", mode="w+", dtype=np.uint64, shape=(rows, LIMBS))
+        store.flush()
+        return store
+
+    @classmethod
+    def open(cls, path, mode="r"):
+        path = Path(path)
+        return cls(path, json.loads((path / "meta.json").read_text()), mode)
+
+    def _column(self, key):
+        if key not in self._columns:
+            name = key if isinstance(key, str) else f"{key[0]}.{key[1]}"
+            self._columns[key] = np.load(self.path / f"{name}.npy", mmap_mode=self.mode)
+        return self._columns[key]
+
+    @property
+    def rows(self):
+        return self.meta["filled"]
+
+    @property
+    def blocks(self):
+        return self._column("blocks")[: self.rows]
+
+    @property
+    def timestamps(self):
+        return self._column("timestamps")[: self.rows]
+
+    def write_row(self, row, block, timestamp, values):
+        """values maps source name => {field: int}."""
+        self._column("blocks")[row] = block
+        self._column("timestamps")[row] = timestamp
+        for name, fields in values.items():
+            for field, value in fields.items():
+                self._column((name, field))[row] = to_limbs([value])[0]
+        self.meta["filled"] = max(self.meta["filled"], row + 1)
+
+    def column(self, source, field):
+        """The filled part of a column as python ints."""
+        return from_limbs(self._column((source, field))[: self.rows])
+
+    def flush(self):
+        for column in self._columns.values():
+            if isinstance(column, np.memmap):
+                column.flush()
+        (self.path / "meta.json").write_text(json.dumps(self.meta, indent=2))
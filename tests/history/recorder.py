@@ -0,0 +1,102 @@
+from dataclasses import dataclass, fields
+from typing import Callable
+
+from ironbank_model import IronBankMarket, market_from_chain
+from lender_models import AlphaBankState, CTokenState, SoloMarketState, alpha_state_from_chain, ctoken_state_from_chain, solo_state_from_chain
+from lender_models.chain import interest_setter_from_chain
+
+from .columns import ColumnStore
+
+# state dataclass each kind of source is rebuilt into. fields not listed here are kept in meta params
+KIND_STATES = {
+    "ctoken": CTokenState,
+    "solo": SoloMarketState,
+    "alpha": AlphaBankState,
+    "ironbank": IronBankMarket,
+}
+KIND_FIELDS = {
+    "ctoken": [f.name for f in fields(CTokenState)],
+    "solo": ["borrow_par", "supply_par", "borrow_index", "supply_index"],
+    "alpha": ["balance", "glb_debt_val", "reserve_pool"],
+    "ironbank": [f.name for f in fields(IronBankMarket)] + ["price"],
+}
+
+
+@dataclass
+class Source:
+    """One protocol to record. read(block) returns {field: int} for the kind's fields."""
+
+    kind: str
+    read: Callable
+    params: dict
+
+
+def _values(state, kind):
+    return {name: getattr(state, name) for name in KIND_FIELDS[kind] if hasattr(state, name)}
+
+
+def ctoken_source(ctoken):
+    return Source("ctoken", lambda block: _values(ctoken_state_from_chain(ctoken, block), "ctoken"), {})
+
+
+def solo_source(market_id, block=None):
+    """A Solo market. The interest setter is read once, at block, and kept as params."""
+    from brownie import interface
+    from lender_models.chain import SOLO
+
+    setter = interest_setter_from_chain(interface.ISoloMargin(SOLO).getMarketInterestSetter(market_id, block_identifier=block), block)
+    params = {"max_apr": setter.max_apr, "coefficients": list(setter.coefficients)}
+    return Source("solo", lambda block: _values(solo_state_from_chain(market_id, setter, block), "solo"), params)
+
+
+def alpha_source(bank):
+    """The Alpha Homora bank. Replays rate it with the TripleSlopeModel."""
+    return Source("alpha", lambda block: _values(alpha_state_from_chain(bank, block=block), "alpha"), {})
+
+
+def iron_bank_source(iron_bank, iron_bank_token):
+    """The Iron Bank market the strategy borrows from, with the oracle price of its underlying."""
+    from brownie import interface
+
+    def read(block):
+        values = _values(market_from_chain(iron_bank_token, block), "ironbank")
+        oracle = interface.PriceOracle(iron_bank.oracle(block_identifier=block))
+        values["price"] = oracle.getUnderlyingPrice(iron_bank_token, block_identifier=block)
+        return values
+
+    return Source("ironbank", read, {})
+
+
+def plugin_source(plugin):
+    """The source a deployed lender plugin reads its rates from."""
+    name = plugin._name
+    if name in ("GenericCompound", "GenericCream", "EthCream", "EthCompound"):
+        return ctoken_source(plugin.cToken())
+    if name == "GenericDyDx":
+        return solo_source(plugin.dydxMarketId())
+    if name == "AlphaHomo":
+        return alpha_source(plugin.bank())
+    raise ValueError(f"no source for {name}")
+
+
+def record(path, blocks, sources, flush_every=100):
+    """Read every source at every block into a ColumnStore at path.
+
+    sources maps a name => Source. Rows are flushed every flush_every blocks so an
+    interrupted recording keeps what it has read.
+    """
+    from brownie import web3
+
+    blocks = list(blocks)
+    store = ColumnStore.create(
+        path,
+        len(blocks),
+        {name: {"kind": s.kind, "fields": KIND_FIELDS[s.kind], "params": s.params} for name, s in sources.items()},
+    )
+    for row, block in enumerate(blocks):
+        timestamp = web3.eth.get_block(block).timestamp
+        store.write_row(row, block, timestamp, {name: s.read(block) for name, s in sources.items()})
+        if (row + 1) % flush_every == 0:
+            store.flush()
+    store.flush()
+    return store
@@ -0,0 +1,283 @@
+from dataclasses import dataclass, field
+from functools import cmp_to_key
+
+import numpy as np
+
+from ironbank_model import credit_officer
+from ironbank_model.jump_rate import borrow_rate
+from ironbank_model.uint import WAD
+from lender_models import PLUGIN_APR_BLOCKS, PolynomialInterestSetter, plugin_apr_after_deposit
+from lender_models.compound import BLOCKS_PER_YEAR
+
+from .columns import ColumnStore
+from .recorder import KIND_FIELDS, KIND_STATES
+
+# the contract bisects REBALANCESTEPS times. a grid of 2**6 points finds the same amount in one model call
+REBALANCE_POINTS = 2 ** 6
+UINT_MAX = 2 ** 256 - 1
+
+
+class History:
+    """Market history as python int columns, with per row state snapshots.
+
+    sources maps a name => {"kind", "fields", "params"} as in a ColumnStore and
+    columns maps a name => {field: sequence of ints}.
+    """
+
+    def __init__(self, blocks, timestamps, sources, columns):
+        self.blocks = np.asarray(blocks, dtype=np.int64)
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.sources = sources
+        self.columns = columns
+
+    @classmethod
+    def open(cls, path):
+        """Decode a recorded ColumnStore."""
+        store = ColumnStore.open(path)
+        sources = store.meta["sources"]
+        columns = {name: {f: store.column(name, f) for f in source["fields"]} for name, source in sources.items()}
+        return cls(store.blocks, store.timestamps, sources, columns)
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def state(self, name, row):
+        """The source's state dataclass at row."""
+        source = self.sources[name]
+        kind = source["kind"]
+        values = {f: self.columns[name][f][row] for f in KIND_FIELDS[kind] if f != "price"}
+        if kind == "solo":
+            values["interest_setter"] = PolynomialInterestSetter(**source["params"])
+        return KIND_STATES[kind](**values)
+
+    def price(self, name, row):
+        return self.columns[name]["price"][row]
+
+
+@dataclass
+class ReplayResult:
+    """Per harvest or tend: block, net assets, iron bank debt, navs and the per block supply and borrow rates
+    after the call. Profit is per harvest. Totals for the run are the counts of moves, harvests and tends."""
+
+    blocks: list = field(default_factory=list)
+    net_assets: list = field(default_factory=list)
+    profits: list = field(default_factory=list)
+    iron_bank_debt: list = field(default_factory=list)
+    navs: list = field(default_factory=list)
+    supply_rates: list = field(default_factory=list)
+    borrow_rates: list = field(default_factory=list)
+    moves: int = 0
+    harvests: int = 0
+    tends: int = 0
+
+    @property
+    def apr(self):
+        """Realised net APR over the run, annualised on BLOCKS_PER_YEAR."""
+        elapsed = int(self.blocks[-1] - self.blocks[0])
+        if elapsed == 0 or not self.net_assets[0]:
+            return 0.0
+        return (self.net_assets[-1] - self.net_assets[0]) / self.net_assets[0] * BLOCKS_PER_YEAR / elapsed
+
+
+class _Lender:
+    # one plugin lending into a recorded source. rates are read as if the recorded market excluded us
+    def __init__(self, plugin, source):
+        self.plugin = plugin
+        self.source = source
+        self.nav = 0
+        self._state = None
+        self._aprs = {}
+
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, state):
+        self._state = state
+        self._aprs = {}
+
+    def apr_at(self, navs):
+        aprs, _ = plugin_apr_after_deposit(self.plugin, self._state, navs)
+        return aprs
+
+    def apr_after_deposit(self, amount):
+        # harvest logic asks for the same few points many times. one model call each per row
+        nav = self.nav + amount
+        if nav not in self._aprs:
+            self._aprs[nav] = int(self.apr_at(nav))
+        return self._aprs[nav]
+
+    def apr(self):
+        return self.apr_after_deposit(0)
+
+    def rate_per_block(self):
+        return self.apr() // PLUGIN_APR_BLOCKS[self.plugin]
+
+
+def replay(
+    history,
+    lenders,
+    deposit,
+    harvest_every=1,
+    tend_every=None,
+    iron_bank=None,
+    credit_limit=0,
+    max_leverage=4,
+    step=10,
+    binary_search=False,
+    debt_threshold=10 ** 15,
+):
+    """Run the strategy's harvest and tend logic over recorded history.
+
+    lenders is a list of (plugin contract name, source name). Every harvest_every rows
+    interest accrues at each lender's rate, prepareReturn books the profit back as
+    vault debt, the credit officer borrows from or repays the iron_bank source, and
+    adjustPosition moves from the lowest to the highest lender and deposits loose want.
+    Every tend_every rows in between a tend runs the same without prepareReturn.
+
+    The recorded markets are taken to exclude the strategy, so its own navs are added
+    when rates are read. Withdrawal APRs are read from the models, as the lenders'
+    aprAfterWithdraw does.
+    """
+    lenders = [_Lender(plugin, source) for plugin, source in lenders]
+    rows = set(range(0, len(history), harvest_every))
+    if tend_every:
+        rows |= set(range(0, len(history), tend_every))
+
+    loose = int(deposit)
+    vault_debt = int(deposit)
+    debt = 0
+    debt_rate = 0
+    result = ReplayResult()
+
+    previous = None
+    for row in sorted(rows):
+        elapsed = int(history.blocks[row] - history.blocks[previous]) if previous is not None else 0
+        for lender in lenders:
+            if lender.state is not None:
+                lender.nav += lender.nav * lender.rate_per_block() * elapsed // WAD
+            lender.state = history.state(lender.source, row)
+        debt += debt * debt_rate * elapsed // WAD
+        previous = row
+
+        total = loose + sum(lender.nav for lender in lenders)
+        net = total - debt if total > debt else 0
+        if row % harvest_every == 0:
+            # prepareReturn. profit is lent straight back to us by the vault
+            result.profits.append(net - vault_debt)
+            vault_debt = net
+            result.harvests += 1
+        else:
+            result.tends += 1
+
+        if iron_bank is not None:
+            loose, debt = _credit(history, iron_bank, row, lenders, loose, debt, vault_debt, credit_limit, max_leverage, step, binary_search, debt_threshold)
+            market = history.state(iron_bank, row)
+            debt_rate = int(borrow_rate(market.cash, market.borrows, market.reserves, market.base_rate, market.multiplier, market.jump_multiplier, market.kink)[0])
+
+        if lenders:
+            loose, moved = _adjust(lenders, loose, debt_threshold)
+            result.moves += moved
+
+        lent = sum(lender.nav for lender in lenders)
+        result.blocks.append(int(history.blocks[row]))
+        result.net_assets.append(net)
+        result.iron_bank_debt.append(debt)
+        result.navs.append([lender.nav for lender in lenders])
+        result.supply_rates.append(sum(lender.rate_per_block() * lender.nav for lender in lenders) // lent if lent else 0)
+        result.borrow_rates.append(debt_rate)
+
+    return result
+
+
+def _current_supply_rate(lenders, loose):
+    total = loose + sum(lender.nav for lender in lenders)
+    if total == 0:
+        return 0
+    return sum(lender.apr() * lender.nav for lender in lenders) // total
+
+
+def _withdraw_some(lenders, amount):
+    # least apr * nav given up per unit taken first, like _withdrawalQueue. each lender quoted once for its take
+    queue = []
+    for i, lender in enumerate(lenders):
+        if lender.nav == 0:
+            continue
+        take = min(lender.nav, amount)
+        loss = max(lender.apr() * lender.nav - lender.apr_after_deposit(-take) * (lender.nav - take), 0)
+        queue.append((i, loss, take))
+    queue.sort(key=cmp_to_key(lambda a, b: (a[1] * b[2] > b[1] * a[2]) - (b[1] * a[2] > a[1] * b[2])))
+
+    freed = 0
+    for i, _, _ in queue:
+        if freed >= amount:
+            break
+        take = min(lenders[i].nav, amount - freed)
+        lenders[i].nav -= take
+        freed += take
+    return freed
+
+
+def _credit(history, iron_bank, row, lenders, loose, debt, vault_debt, credit_limit, max_leverage, step, binary_search, debt_threshold):
+    price = history.price(iron_bank, row)
+    borrowed = debt * price // WAD
+    decision = credit_officer(
+        market=history.state(iron_bank, row),
+        current_sr=_current_supply_rate(lenders, loose),
+        liquidity=max(credit_limit - borrowed, 0),
+        shortfall=max(borrowed - credit_limit, 0),
+        underlying_price=price,
+        outstanding_debt=debt,
+        total_debt=vault_debt,
+        max_leverage=max_leverage,
+        step=step,
+        debt_threshold=debt_threshold,
+        binary_search=binary_search,
+    )
+    amount = int(decision.amount)
+    if decision.borrow_more:
+        return loose + amount, debt + amount
+
+    if amount > loose:
+        loose += _withdraw_some(lenders, amount - loose)
+    repay = min(amount, loose, debt)
+    return loose - repay, debt - repay
+
+
+def _adjust(lenders, loose, debt_threshold):
+    lowest, lowest_apr = 0, UINT_MAX
+    for i, lender in enumerate(lenders):
+        if lender.nav > 0 and lender.apr() < lowest_apr:
+            lowest, lowest_apr = i, lender.apr()
+
+    highest, highest_apr = 0, 0
+    for i, lender in enumerate(lenders):
+        apr = lender.apr_after_deposit(loose)
+        if apr > highest_apr:
+            highest, highest_apr = i, apr
+
+    moved = 0
+    low, high = lenders[lowest], lenders[highest]
+    if lowest != highest and high.apr_after_deposit(low.nav + loose) > lowest_apr:
+        to_move = _rebalance_amount(low, high, loose)
+        if to_move >= low.nav or to_move > debt_threshold:
+            loose += to_move
+            low.nav -= to_move
+            moved = 1
+
+    high.nav += loose
+    return 0, moved
+
+
+def _rebalance_amount(low, high, loose):
+    # largest move that still leaves the destination paying more than the source
+    if high.apr_after_deposit(low.nav + loose) > low.apr_after_deposit(-low.nav):
+        return low.nav
+
+    amounts = [low.nav * k // REBALANCE_POINTS for k in range(REBALANCE_POINTS)]
+    better = high.apr_at([high.nav + loose + a for a in amounts]) > low.apr_at([low.nav - a for a in amounts])
+    better = np.asarray(better, dtype=bool)
+    # the walk stops at the first point that is not better, as bisection would
+    stop = int(np.argmin(better)) if not better.all() else REBALANCE_POINTS
+    return amounts[stop - 1] if stop > 0 else 0
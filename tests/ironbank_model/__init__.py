@@ -0,0 +1,20 @@
+"""Integer model of the strategy's Iron Bank credit officer.
+
+Mirrors Strategy.internalCreditOfficer and Strategy.ironBankBorrowRate with the same
+uint256 arithmetic, vectorized with numpy over market states and settings.
+"""
+from .jump_rate import IronBankMarket, utilization_rate, borrow_rate, supply_rate, iron_bank_borrow_rate
+from .credit import CreditDecision, credit_officer
+from .chain import market_from_chain, credit_inputs_from_chain
+
+__all__ = [
+    "IronBankMarket",
+    "utilization_rate",
+    "borrow_rate",
+    "supply_rate",
+    "iron_bank_borrow_rate",
+    "CreditDecision",
+    "credit_officer",
+    "market_from_chain",
+    "credit_inputs_from_chain",
+]
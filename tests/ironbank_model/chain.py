@@ -0,0 +1,45 @@
+from .jump_rate import IronBankMarket
+
+# Vault 0.3.0 StrategyParams index
+TOTAL_DEBT = 5
+
+
+def market_from_chain(iron_bank_token, block=None):
+    """State of an iron bank market with a JumpRateModelV2, read through brownie. Latest block unless one is given."""
+    from brownie import interface
+
+    model = interface.JumpRateModelI(iron_bank_token.interestRateModel(block_identifier=block))
+    return IronBankMarket(
+        cash=iron_bank_token.getCash(block_identifier=block),
+        borrows=iron_bank_token.totalBorrows(block_identifier=block),
+        reserves=iron_bank_token.totalReserves(block_identifier=block),
+        base_rate=model.baseRatePerBlock(block_identifier=block),
+        multiplier=model.multiplierPerBlock(block_identifier=block),
+        jump_multiplier=model.jumpMultiplierPerBlock(block_identifier=block),
+        kink=model.kink(block_identifier=block),
+    )
+
+
+def credit_inputs_from_chain(strategy, vault, iron_bank, iron_bank_token):
+    """Keyword arguments for credit_officer matching the strategy's current state."""
+    _, liquidity, shortfall = iron_bank.getAccountLiquidity(strategy)
+    return dict(
+        market=market_from_chain(iron_bank_token),
+        current_sr=strategy.currentSupplyRate(),
+        liquidity=liquidity,
+        shortfall=shortfall,
+        underlying_price=_oracle_price(iron_bank, iron_bank_token),
+        outstanding_debt=strategy.ironBankOutstandingDebtStored(),
+        total_debt=vault.strategies(strategy)[TOTAL_DEBT],
+        max_leverage=strategy.maxIronBankLeverage(),
+        step=strategy.step(),
+        debt_threshold=strategy.debtThreshold(),
+        binary_search=strategy.binarySearchCredit(),
+        emergency_exit=strategy.emergencyExit(),
+    )
+
+
+def _oracle_price(iron_bank, iron_bank_token):
+    from brownie import interface
+
+    return interface.PriceOracle(iron_bank.oracle()).getUnderlyingPrice(iron_bank_token)
@@ -0,0 +1,183 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .jump_rate import IronBankMarket, iron_bank_borrow_rate
+from .uint import WAD, broadcast, minimum, safe_div, select, uint, wrapping_sub
+
+
+@dataclass
+class CreditDecision:
+    """What Strategy.internalCreditOfficer returns for each state, and where the call would revert."""
+
+    borrow_more: np.ndarray
+    amount: np.ndarray
+    reverted: np.ndarray
+
+
+def credit_officer(
+    market,
+    current_sr,
+    liquidity,
+    shortfall,
+    underlying_price,
+    outstanding_debt,
+    total_debt,
+    max_leverage=4,
+    step=10,
+    debt_threshold=10 ** 15,
+    binary_search=False,
+    emergency_exit=False,
+):
+    """Strategy._internalCreditOfficer over arrays of states.
+
+    liquidity and shortfall are the comptroller's getAccountLiquidity values, total_debt is the vault's
+    totalDebt for the strategy and current_sr the strategy's currentSupplyRate. Every argument broadcasts
+    against the market so a state can be swept over grids of leverage and step.
+
+    Scalar inputs give 0-d outputs.
+
+    Rates are compared exactly as the contract compares them, supply rate against the per block borrow rate.
+
+    The borrow rate only rises as we borrow and only falls as we repay, so walking the increments and
+    bisecting them stop at the same one. Both settings of binary_search are answered by bisection.
+    """
+    values = broadcast(
+        market.cash,
+        market.borrows,
+        market.reserves,
+        market.base_rate,
+        market.multiplier,
+        market.jump_multiplier,
+        market.kink,
+        current_sr,
+        liquidity,
+        shortfall,
+        underlying_price,
+        outstanding_debt,
+        total_debt,
+        max_leverage,
+        step,
+        debt_threshold,
+    )
+    # the searches index the states still active so they need at least one dimension
+    scalar = values[0].ndim == 0
+    (
+        cash,
+        borrows,
+        reserves,
+        base_rate,
+        multiplier,
+        jump_multiplier,
+        kink,
+        current_sr,
+        liquidity,
+        shortfall,
+        underlying_price,
+        outstanding_debt,
+        total_debt,
+        max_leverage,
+        step,
+        debt_threshold,
+    ) = [np.atleast_1d(value) for value in values]
+    market = IronBankMarket(cash, borrows, reserves, base_rate, multiplier, jump_multiplier, kink)
+    emergency_exit = np.broadcast_to(np.asarray(emergency_exit, dtype=bool), cash.shape)
+
+    amount = uint(np.zeros(cash.shape))
+    reverted = np.zeros(cash.shape, dtype=bool)
+    active = np.ones(cash.shape, dtype=bool)
+
+    def finish(where, value):
+        nonlocal amount, active
+        where = where & active
+        amount = select(where, value, amount)
+        active = active & ~where
+
+    finish(emergency_exit, outstanding_debt)
+
+    finish(np.asarray(underlying_price == 0, dtype=bool), 0)
+    liquidity, _ = safe_div(liquidity * WAD, underlying_price)
+    shortfall, _ = safe_div(shortfall * WAD, underlying_price)
+
+    # repay debt if iron bank wants its money back
+    finish(np.asarray(shortfall > 0, dtype=bool), shortfall - 1)
+
+    remaining_credit = minimum(liquidity, cash)
+    iron_bank_br, rate_reverted = iron_bank_borrow_rate(market, 0, True)
+    reverted |= active & rate_reverted
+
+    max_credit_desired = total_debt * max_leverage
+    finish(np.asarray(max_credit_desired <= step, dtype=bool), 0)
+    min_increment, _ = safe_div(max_credit_desired, step)
+
+    # too much debt. overshoot in case of dust
+    too_much = np.asarray(max_credit_desired * 11 // 10 < outstanding_debt, dtype=bool) & active
+    amount = select(too_much, outstanding_debt - max_credit_desired, amount)
+    active &= ~too_much
+
+    borrowing = active & np.asarray(current_sr > iron_bank_br, dtype=bool)
+    repaying = active & ~borrowing
+
+    # unchecked in solidity. it only wraps when the debt is above max credit and then the min ignores it
+    remaining_credit = minimum(wrapping_sub(max_credit_desired, outstanding_debt), remaining_credit)
+    max_borrow_increments, _ = safe_div(remaining_credit, min_increment)
+    max_repay_increments, _ = safe_div(outstanding_debt, min_increment)
+
+    borrow_increments, borrow_reverted = _search_borrow_increments(market, current_sr, min_increment, max_borrow_increments, borrowing)
+    repay_increments, repay_reverted = _search_repay_increments(market, current_sr, min_increment, max_repay_increments, repaying)
+    reverted |= borrow_reverted | repay_reverted
+
+    increment = select(borrowing, borrow_increments, repay_increments) + 1
+    stepped = min_increment * (increment - 1)
+    amount = select(borrowing, stepped, amount)
+    # special case to repay all
+    amount = select(repaying, select(increment == 1, outstanding_debt, stepped), amount)
+
+    # we dont play with dust. the early returns above skip this
+    dust = (too_much | borrowing | repaying) & np.asarray(amount < debt_threshold, dtype=bool)
+    amount = select(dust, 0, amount)
+    decision = CreditDecision(borrow_more=borrowing, amount=uint(amount), reverted=reverted)
+    if scalar:
+        decision = CreditDecision(*(value.reshape(()) for value in (decision.borrow_more, decision.amount, decision.reverted)))
+    return decision
+
+
+def _search_borrow_increments(market, current_sr, min_increment, max_increments, searching):
+    # Strategy._searchBorrowIncrements. largest k with sr > rate after borrowing k increments
+    low = uint(np.zeros(searching.shape))
+    high = select(searching, max_increments, 0)
+    reverted = np.zeros(searching.shape, dtype=bool)
+
+    idx = np.flatnonzero(searching & np.asarray(low < high, dtype=bool))
+    while idx.size:
+        mid = low[idx] + (high[idx] - low[idx] + 1) // 2
+        rate, rate_reverted = iron_bank_borrow_rate(market.take(idx), min_increment[idx] * mid, False)
+        reverted[idx] |= rate_reverted
+
+        higher = np.asarray(current_sr[idx] > rate, dtype=bool)
+        low[idx] = select(higher, mid, low[idx])
+        high[idx] = select(higher, high[idx], mid - 1)
+        idx = idx[np.asarray(low[idx] < high[idx], dtype=bool)]
+
+    return low, reverted
+
+
+def _search_repay_increments(market, current_sr, min_increment, max_increments, searching):
+    # Strategy._searchRepayIncrements. smallest k in [1, max] with sr > rate after repaying k increments, else max
+    searching = searching & np.asarray(max_increments > 0, dtype=bool)
+    low = uint(select(searching, 1, 0))
+    high = select(searching, max_increments, 0)
+    reverted = np.zeros(searching.shape, dtype=bool)
+
+    idx = np.flatnonzero(searching & np.asarray(low < high, dtype=bool))
+    while idx.size:
+        mid = low[idx] + (high[idx] - low[idx]) // 2
+        rate, rate_reverted = iron_bank_borrow_rate(market.take(idx), min_increment[idx] * mid, True)
+        reverted[idx] |= rate_reverted
+
+        lower = np.asarray(current_sr[idx] > rate, dtype=bool)
+        high[idx] = select(lower, mid, high[idx])
+        low[idx] = select(lower, low[idx], mid + 1)
+        idx = idx[np.asarray(low[idx] < high[idx], dtype=bool)]
+
+    return low, reverted
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .uint import WAD, broadcast, safe_div, safe_sub, select, uint
+
+
+@dataclass
+class IronBankMarket:
+    """Iron bank market state and JumpRateModelV2 parameters. Any field can be an array."""
+
+    cash: object
+    borrows: object
+    reserves: object
+    base_rate: object
+    multiplier: object
+    jump_multiplier: object
+    kink: object
+
+    def __post_init__(self):
+        (
+            self.cash,
+            self.borrows,
+            self.reserves,
+            self.base_rate,
+            self.multiplier,
+            self.jump_multiplier,
+            self.kink,
+        ) = broadcast(self.cash, self.borrows, self.reserves, self.base_rate, self.multiplier, self.jump_multiplier, self.kink)
+
+    @property
+    def shape(self):
+        return self.cash.shape
+
+    def take(self, idx):
+        # the states at idx. fields are already uint so skip the conversion
+        market = object.__new__(IronBankMarket)
+        for name in self.__dataclass_fields__:
+            setattr(market, name, getattr(self, name)[idx])
+        return market
+
+
+def utilization_rate(cash, borrows, reserves):
+    """JumpRateModelV2.utilizationRate. Returns (util, reverted)."""
+    cash, borrows, reserves = broadcast(cash, borrows, reserves)
+    total, reverted = safe_sub(cash + borrows, reserves)
+    util, zero = safe_div(borrows * WAD, total)
+
+    has_borrows = np.asarray(borrows > 0, dtype=bool)
+    return select(has_borrows, util, 0), reverted | (has_borrows & zero)
+
+
+def borrow_rate(cash, borrows, reserves, base_rate, multiplier, jump_multiplier, kink):
+    """JumpRateModelV2.getBorrowRate per block. Returns (rate, reverted)."""
+    util, reverted = utilization_rate(cash, borrows, reserves)
+    base_rate, multiplier, jump_multiplier, kink = broadcast(base_rate, multiplier, jump_multiplier, kink)
+
+    normal_rate = kink * multiplier // WAD + base_rate
+    below_kink = np.asarray(util <= kink, dtype=bool)
+    rate = select(below_kink, util * multiplier // WAD + base_rate, (util - kink) * jump_multiplier // WAD + normal_rate)
+    return rate, reverted
+
+
+def supply_rate(cash, borrows, reserves, reserve_factor, base_rate, multiplier, jump_multiplier, kink):
+    """JumpRateModelV2.getSupplyRate per block. Returns (rate, reverted)."""
+    rate, reverted = borrow_rate(cash, borrows, reserves, base_rate, multiplier, jump_multiplier, kink)
+    util, _ = utilization_rate(cash, borrows, reserves)
+    reserve_factor = uint(reserve_factor)
+
+    one_minus_reserve_factor, factor_reverted = safe_sub(uint(WAD), reserve_factor)
+    rate_to_pool = rate * one_minus_reserve_factor // WAD
+    return util * rate_to_pool // WAD, reverted | factor_reverted
+
+
+def iron_bank_borrow_rate(market, amount, repay):
+    """Strategy._ironBankBorrowRate. Rate after we borrow or repay amount. Returns (rate, reverted).
+
+    repay can be a bool or a bool array matching the market.
+    """
+    amount = uint(amount)
+    repay = np.asarray(repay, dtype=bool)
+
+    borrow_cash, borrow_reverted = safe_sub(market.cash, amount)
+    repay_borrows, repay_reverted = safe_sub(market.borrows, amount)
+
+    cash = select(repay, market.cash + amount, borrow_cash)
+    borrows = select(repay, repay_borrows, market.borrows + amount)
+    reverted = np.where(repay, repay_reverted, borrow_reverted)
+
+    rate, rate_reverted = borrow_rate(
+        cash, borrows, market.reserves, market.base_rate, market.multiplier, market.jump_multiplier, market.kink
+    )
+    return rate, reverted | rate_reverted
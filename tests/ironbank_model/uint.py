@@ -0,0 +1,48 @@
+import numpy as np
+
+WAD = 10 ** 18
+UINT256 = 2 ** 256
+
+
+def uint(values):
+    # python ints in an object array. products of 1e18 scaled values overflow int64 long before uint256
+    # object arrays are taken to hold ints already. everything this package builds does
+    if isinstance(values, np.ndarray) and values.dtype == object:
+        return values
+    array = np.asarray(values, dtype=object)
+    if array.size == 0:
+        return array
+    return np.vectorize(int, otypes=[object])(array)
+
+
+def broadcast(*values):
+    return np.broadcast_arrays(*[uint(value) for value in values])
+
+
+def select(condition, a, b):
+    # np.where that keeps python ints. a plain int past int64 would overflow the default cast
+    return np.where(np.asarray(condition, dtype=bool), uint(a), uint(b))
+
+
+def safe_sub(a, b):
+    # SafeMath.sub. returns the difference and where it would have reverted
+    a, b = uint(a), uint(b)
+    reverted = np.asarray(a < b, dtype=bool)
+    return select(reverted, 0, a - b), reverted
+
+
+def safe_div(a, b):
+    # SafeMath.div. rounds down and reverts on zero
+    a, b = uint(a), uint(b)
+    reverted = np.asarray(b == 0, dtype=bool)
+    return select(reverted, 0, a // select(reverted, 1, b)), reverted
+
+
+def wrapping_sub(a, b):
+    # unchecked uint256 subtraction
+    return uint((uint(a) - uint(b)) % UINT256)
+
+
+def minimum(a, b):
+    a, b = uint(a), uint(b)
+    return select(a < b, a, b)
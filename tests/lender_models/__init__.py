@@ -0,0 +1,32 @@
+"""Integer models of every lender plugin's apr() and aprAfterDeposit().
+
+Each model takes a snapshot of the protocol the plugin lends to and evaluates the plugin's formula,
+including its units, over arrays of deposit sizes. One snapshot replaces an eth_call per point.
+"""
+from .compound import CTokenState, ctoken_apr, ctoken_apr_after_deposit, eth_compound_apr, eth_compound_apr_after_deposit
+from .dydx import PolynomialInterestSetter, SoloMarketState, dydx_apr_after_deposit
+from .alpha import AlphaBankState, TripleSlopeModel, alpha_apr_after_deposit
+from .plugins import PLUGIN_APR_BLOCKS, PLUGIN_MODELS, plugin_apr, plugin_apr_after_deposit
+from .chain import alpha_state_from_chain, ctoken_state_from_chain, solo_state_from_chain, lender_state_from_chain
+
+__all__ = [
+    "CTokenState",
+    "ctoken_apr",
+    "ctoken_apr_after_deposit",
+    "eth_compound_apr",
+    "eth_compound_apr_after_deposit",
+    "PolynomialInterestSetter",
+    "SoloMarketState",
+    "dydx_apr_after_deposit",
+    "AlphaBankState",
+    "TripleSlopeModel",
+    "alpha_apr_after_deposit",
+    "PLUGIN_APR_BLOCKS",
+    "PLUGIN_MODELS",
+    "plugin_apr",
+    "plugin_apr_after_deposit",
+    "alpha_state_from_chain",
+    "ctoken_state_from_chain",
+    "solo_state_from_chain",
+    "lender_state_from_chain",
+]
@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from ironbank_model.uint import WAD, broadcast, safe_div, select, uint
+
+SECONDS_IN_A_YEAR = 365 * 24 * 60 * 60
+# AlphaHomo scales the per second rate
+SECONDS_PER_BLOCK = 15
+
+
+class TripleSlopeModel:
+    """Alpha Homora's TripleSlopeModel.getInterestRate. Per second rate from debt and floating eth."""
+
+    def rate(self, debt, floating):
+        debt, floating = broadcast(debt, floating)
+        total = debt + floating
+        utilization, _ = safe_div(debt * 10000, total)
+
+        low = utilization * (10 * 10 ** 16) // 8000 // SECONDS_IN_A_YEAR
+        flat = uint(np.full(debt.shape, 10 * 10 ** 16 // SECONDS_IN_A_YEAR))
+        high = (10 * 10 ** 16 + (utilization - 9000) * (40 * 10 ** 16) // 1000) // SECONDS_IN_A_YEAR
+        capped = uint(np.full(debt.shape, 50 * 10 ** 16 // SECONDS_IN_A_YEAR))
+
+        return select(utilization < 8000, low, select(utilization < 9000, flat, select(utilization < 10000, high, capped)))
+
+
+@dataclass
+class AlphaBankState:
+    """Alpha bank eth balance, global debt and reserve pool as stored. config is anything with rate(debt, floating)."""
+
+    balance: int
+    glb_debt_val: int
+    reserve_pool: int
+    config: object = field(default_factory=TripleSlopeModel)
+
+    @property
+    def total_eth(self):
+        # Bank.totalETH without the interest pending since the last accrual
+        return uint(self.balance) + uint(self.glb_debt_val) - uint(self.reserve_pool)
+
+
+def alpha_apr_after_deposit(state, amount):
+    """AlphaHomo._aprAt. Utilisation is taken from the stored values before the deposit, as the plugin does. Returns (apr, reverted)."""
+    rate_per_sec = uint(state.config.rate(state.glb_debt_val, uint(state.balance) + uint(amount)))
+    utilisation, reverted = safe_div(WAD * uint(state.glb_debt_val), state.total_eth)
+
+    # 10% is kept as reserves
+    rate = rate_per_sec * 9 // 10 * utilisation // WAD
+    return rate * SECONDS_PER_BLOCK, reverted
@@ -0,0 +1,86 @@
+from .alpha import AlphaBankState
+from .compound import CTokenState
+from .dydx import PolynomialInterestSetter, SoloMarketState
+
+SOLO = "0x1E0447b19BB6EcFdAe1e4AE1694b0C3659614e4e"
+# a white paper model is a jump rate model that never reaches its kink
+NO_KINK = 2 ** 256 - 1
+
+
+def ctoken_state_from_chain(ctoken, block=None):
+    """Snapshot of a cToken market, read through brownie. block pins every call to that height."""
+    from brownie import interface
+
+    ctoken = interface.CTokenI(ctoken)
+    model = interface.JumpRateModelI(ctoken.interestRateModel(block_identifier=block))
+    try:
+        kink = model.kink(block_identifier=block)
+        jump_multiplier = model.jumpMultiplierPerBlock(block_identifier=block)
+    except Exception:
+        kink, jump_multiplier = NO_KINK, 0
+
+    return CTokenState(
+        cash=ctoken.getCash(block_identifier=block),
+        borrows=ctoken.totalBorrows(block_identifier=block),
+        reserves=ctoken.totalReserves(block_identifier=block),
+        reserve_factor=ctoken.reserveFactorMantissa(block_identifier=block),
+        total_supply=ctoken.totalSupply(block_identifier=block),
+        exchange_rate=ctoken.exchangeRateStored(block_identifier=block),
+        base_rate=model.baseRatePerBlock(block_identifier=block),
+        multiplier=model.multiplierPerBlock(block_identifier=block),
+        jump_multiplier=jump_multiplier,
+        kink=kink,
+    )
+
+
+def interest_setter_from_chain(address, block=None):
+    """Parameters of a polynomial setter laid out like MockInterestSetter. Pass your own model for anything else."""
+    from brownie import MockInterestSetter
+
+    setter = MockInterestSetter.at(address)
+    coefficients = []
+    while sum(coefficients) < 100:
+        coefficients.append(setter.coefficients(len(coefficients), block_identifier=block))
+    return PolynomialInterestSetter(max_apr=setter.maxAPR(block_identifier=block), coefficients=coefficients)
+
+
+def solo_state_from_chain(market_id, interest_setter=None, block=None):
+    """Snapshot of one Solo market. The setter is read as a polynomial setter unless one is given."""
+    from brownie import interface
+
+    solo = interface.ISoloMargin(SOLO)
+    total_par = solo.getMarketTotalPar(market_id, block_identifier=block)
+    index = solo.getMarketCurrentIndex(market_id, block_identifier=block)
+    if interest_setter is None:
+        interest_setter = interest_setter_from_chain(solo.getMarketInterestSetter(market_id, block_identifier=block), block)
+
+    return SoloMarketState(
+        borrow_par=total_par[0],
+        supply_par=total_par[1],
+        borrow_index=index[0],
+        supply_index=index[1],
+        interest_setter=interest_setter,
+    )
+
+
+def alpha_state_from_chain(bank, config=None, block=None):
+    """Snapshot of the Alpha Homora bank. Rates follow the TripleSlopeModel unless a config model is given."""
+    from brownie import interface, web3
+
+    bank = interface.Bank(bank)
+    state = AlphaBankState(balance=web3.eth.get_balance(bank.address, block), glb_debt_val=bank.glbDebtVal(block_identifier=block), reserve_pool=bank.reservePool(block_identifier=block))
+    if config is not None:
+        state.config = config
+    return state
+
+
+def lender_state_from_chain(plugin, interest_setter=None):
+    """The state a deployed plugin reads for apr(), keyed to PLUGIN_MODELS by contract name."""
+    name = plugin._name
+    if name in ("GenericCompound", "GenericCream", "EthCream", "EthCompound"):
+        return name, ctoken_state_from_chain(plugin.cToken())
+    if name == "GenericDyDx":
+        return name, solo_state_from_chain(plugin.dydxMarketId(), interest_setter)
+    if name == "AlphaHomo":
+        return name, alpha_state_from_chain(plugin.bank())
+    raise ValueError(f"no model for {name}")
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+
+from ironbank_model.jump_rate import borrow_rate, supply_rate
+from ironbank_model.uint import WAD, safe_div, safe_sub, uint
+
+# GenericCompound and GenericCream annualise. EthCream and EthCompound return the per block rate
+BLOCKS_PER_YEAR = 2_300_000
+
+
+@dataclass
+class CTokenState:
+    """A cToken market and its JumpRateModelV2. Fields can be arrays."""
+
+    cash: int
+    borrows: int
+    reserves: int
+    reserve_factor: int
+    total_supply: int
+    exchange_rate: int
+    base_rate: int
+    multiplier: int
+    jump_multiplier: int
+    kink: int
+
+    def model(self):
+        return self.base_rate, self.multiplier, self.jump_multiplier, self.kink
+
+
+def ctoken_apr_after_deposit(state, amount, blocks_per_year=BLOCKS_PER_YEAR):
+    """GenericCompound, GenericCream and (blocks_per_year=1) EthCream aprAfterDeposit. Returns (apr, reverted)."""
+    rate, reverted = supply_rate(uint(state.cash) + uint(amount), state.borrows, state.reserves, state.reserve_factor, *state.model())
+    return rate * blocks_per_year, reverted
+
+
+def ctoken_apr(state, blocks_per_year=BLOCKS_PER_YEAR):
+    """supplyRatePerBlock times the plugin's multiplier. Same as depositing nothing."""
+    return ctoken_apr_after_deposit(state, 0, blocks_per_year)
+
+
+def eth_compound_apr(state):
+    """EthCompound.apr. cETH's supplyRatePerBlock."""
+    return ctoken_apr(state, 1)
+
+
+def eth_compound_apr_after_deposit(state, amount):
+    """EthCompound.aprAfterDeposit. Borrow rate at the new cash, spread over underlying from the exchange rate."""
+    amount = uint(amount)
+    rate, reverted = borrow_rate(uint(state.cash) + amount, state.borrows, state.reserves, *state.model())
+
+    underlying = uint(state.total_supply) * uint(state.exchange_rate) // WAD + amount
+    borrows_per, zero = safe_div(WAD * uint(state.borrows), underlying)
+    one_minus_reserve_factor, factor_reverted = safe_sub(uint(WAD), uint(state.reserve_factor))
+
+    return rate * one_minus_reserve_factor * borrows_per // WAD // WAD, reverted | zero | factor_reverted
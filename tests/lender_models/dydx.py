@@ -0,0 +1,53 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from ironbank_model.uint import WAD, broadcast, safe_div, select, uint
+
+SECONDS_IN_A_YEAR = 365 * 24 * 60 * 60
+# GenericDyDx scales the per second rate
+SECONDS_PER_BLOCK = 12
+
+
+@dataclass
+class PolynomialInterestSetter:
+    """dYdX PolynomialInterestSetter. Coefficients are percentages of maxAPR, lowest power first."""
+
+    max_apr: int
+    coefficients: list = field(default_factory=lambda: [0, 10, 10, 0, 0, 0, 80])
+
+    def rate(self, borrow_wei, supply_wei):
+        borrow_wei, supply_wei = broadcast(borrow_wei, supply_wei)
+        max_rate = uint(self.max_apr) // SECONDS_IN_A_YEAR
+
+        result = uint(np.zeros(borrow_wei.shape))
+        polynomial = uint(np.full(borrow_wei.shape, WAD))
+        safe_supply = select(supply_wei == 0, 1, supply_wei)
+        for coefficient in self.coefficients:
+            result = result + polynomial * coefficient
+            polynomial = polynomial * borrow_wei // safe_supply
+
+        rate = result * uint(self.max_apr) // (WAD * 100) // SECONDS_IN_A_YEAR
+        rate = select(borrow_wei >= supply_wei, max_rate, rate)
+        return select(borrow_wei == 0, 0, rate)
+
+
+@dataclass
+class SoloMarketState:
+    """Solo totals for one market as par and index. interest_setter is anything with rate(borrow, supply)."""
+
+    borrow_par: int
+    supply_par: int
+    borrow_index: int
+    supply_index: int
+    interest_setter: object
+
+
+def dydx_apr_after_deposit(state, amount):
+    """GenericDyDx._apr. Returns (apr, reverted)."""
+    borrow = uint(state.borrow_par) * uint(state.borrow_index) // WAD
+    supply = uint(state.supply_par) * uint(state.supply_index) // WAD + uint(amount)
+
+    borrow_rate = uint(state.interest_setter.rate(borrow, supply))
+    lend_rate, reverted = safe_div(borrow_rate * borrow, supply)
+    return lend_rate * SECONDS_PER_BLOCK, reverted
@@ -0,0 +1,35 @@
+from functools import partial
+
+from .alpha import alpha_apr_after_deposit
+from .compound import BLOCKS_PER_YEAR, ctoken_apr, ctoken_apr_after_deposit, eth_compound_apr, eth_compound_apr_after_deposit
+from .dydx import dydx_apr_after_deposit
+
+# plugin contract name => (apr, aprAfterDeposit). each takes the state the plugin reads
+PLUGIN_MODELS = {
+    "GenericCompound": (ctoken_apr, ctoken_apr_after_deposit),
+    "GenericCream": (ctoken_apr, ctoken_apr_after_deposit),
+    "EthCream": (partial(ctoken_apr, blocks_per_year=1), partial(ctoken_apr_after_deposit, blocks_per_year=1)),
+    "EthCompound": (eth_compound_apr, eth_compound_apr_after_deposit),
+    "GenericDyDx": (partial(dydx_apr_after_deposit, amount=0), dydx_apr_after_deposit),
+    "AlphaHomo": (partial(alpha_apr_after_deposit, amount=0), alpha_apr_after_deposit),
+}
+
+# blocks each plugin's reported rate covers. divide by it for the rate per block
+PLUGIN_APR_BLOCKS = {
+    "GenericCompound": BLOCKS_PER_YEAR,
+    "GenericCream": BLOCKS_PER_YEAR,
+    "EthCream": 1,
+    "EthCompound": 1,
+    "GenericDyDx": 1,
+    "AlphaHomo": 1,
+}
+
+
+def plugin_apr(name, state):
+    """The plugin's apr() from a state snapshot. Returns (apr, reverted)."""
+    return PLUGIN_MODELS[name][0](state)
+
+
+def plugin_apr_after_deposit(name, state, amounts):
+    """The plugin's aprAfterDeposit() for every amount. Returns (aprs, reverted)."""
+    return PLUGIN_MODELS[name][1](state, amounts)
@@ -0,0 +1,10 @@
+"""Monte-Carlo of the strategy's yield under random borrow demand.
+
+Generates mean reverting utilisation paths for every lender and Iron Bank market,
+replays the strategy over them at several harvest and tend cadences and reports
+confidence intervals for net APR, Iron Bank spread and keeper gas.
+"""
+from .paths import Demand, demand_history, utilisation_path
+from .simulate import Interval, simulate, simulate_path
+
+__all__ = ["Demand", "demand_history", "utilisation_path", "Interval", "simulate", "simulate_path"]
@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from history import History
+from history.recorder import KIND_FIELDS, KIND_STATES
+
+STATE_KINDS = {state: kind for kind, state in KIND_STATES.items()}
+
+
+@dataclass
+class Demand:
+    """Borrow demand as mean reverting utilisation. Moves are per row in logit space."""
+
+    mean: float
+    reversion: float = 0.05
+    volatility: float = 0.05
+
+
+def utilisation_path(demand, start, rows, rng):
+    """rows utilisations starting at start, an Ornstein-Uhlenbeck walk on logit(utilisation)."""
+    logit = lambda u: np.log(u / (1 - u))
+    target = logit(np.clip(demand.mean, 1e-6, 1 - 1e-6))
+    x = np.empty(rows)
+    x[0] = logit(np.clip(start, 1e-6, 1 - 1e-6))
+    shocks = rng.normal(0, demand.volatility, rows)
+    for t in range(1, rows):
+        x[t] = x[t - 1] + demand.reversion * (target - x[t - 1]) + shocks[t]
+    return 1 / (1 + np.exp(-x))
+
+
+def _scale(total, fractions):
+    # exact ints from float fractions of an int total
+    return [int(total) * int(f * 10 ** 9) // 10 ** 9 for f in fractions]
+
+
+def _with_utilisation(kind, state, u):
+    # keep every deposit where it is and move borrowers. returns the columns that change
+    if kind in ("ctoken", "ironbank"):
+        total = int(state.cash) + int(state.borrows) - int(state.reserves)
+        borrows = _scale(total, u)
+        return {"borrows": borrows, "cash": [total - b + int(state.reserves) for b in borrows]}
+    if kind == "solo":
+        supply = int(state.supply_par) * int(state.supply_index) // int(state.borrow_index)
+        return {"borrow_par": _scale(supply, u)}
+    if kind == "alpha":
+        debt = _scale(state.total_eth, u)
+        return {"glb_debt_val": debt, "balance": [int(state.total_eth) - d + int(state.reserve_pool) for d in debt]}
+    raise ValueError(kind)
+
+
+def _utilisation(kind, state):
+    if kind in ("ctoken", "ironbank"):
+        total = int(state.cash) + int(state.borrows) - int(state.reserves)
+        return int(state.borrows) / total if total else 0.0
+    if kind == "solo":
+        supply = int(state.supply_par) * int(state.supply_index)
+        return int(state.borrow_par) * int(state.borrow_index) / supply if supply else 0.0
+    if kind == "alpha":
+        return int(state.glb_debt_val) / int(state.total_eth) if int(state.total_eth) else 0.0
+    raise ValueError(kind)
+
+
+def demand_history(markets, demand, rows, block_step, rng, prices=None, start_block=0, block_time=13):
+    """A synthetic History where every market's borrows follow its Demand.
+
+    markets maps a source name => state dataclass as read by the chain readers. Deposits,
+    rate models and indexes stay fixed. prices gives the oracle price of iron bank sources.
+    """
+    prices = prices or {}
+    blocks = start_block + block_step * np.arange(rows)
+    sources, columns = {}, {}
+    for name, state in markets.items():
+        kind = STATE_KINDS[type(state)]
+        params = {}
+        if kind == "solo":
+            params = {"max_apr": state.interest_setter.max_apr, "coefficients": list(state.interest_setter.coefficients)}
+        sources[name] = {"kind": kind, "fields": KIND_FIELDS[kind], "params": params}
+
+        fields = {f: getattr(state, f) for f in KIND_FIELDS[kind] if f != "price"}
+        if kind == "ironbank":
+            fields["price"] = prices[name]
+        column = {f: [int(v)] * rows for f, v in fields.items()}
+        u = utilisation_path(demand[name], _utilisation(kind, state), rows, rng) if name in demand else None
+        if u is not None:
+            column.update(_with_utilisation(kind, state, u))
+        columns[name] = column
+
+    return History(blocks, blocks * block_time, sources, columns)
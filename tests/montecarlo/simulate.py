@@ -0,0 +1,102 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from history import replay
+from ironbank_model.uint import WAD
+from lender_models.compound import BLOCKS_PER_YEAR
+
+from .paths import demand_history
+
+# rough offline gas per call. pass numbers from tests/gas_bench/baselines.json for the lender count you run
+HARVEST_GAS = 1_500_000
+TEND_GAS = 1_000_000
+# normal quantile for a two sided 95% interval
+Z95 = 1.96
+
+
+@dataclass
+class Interval:
+    """Mean of a metric over paths with a 95% confidence interval for that mean."""
+
+    mean: float
+    low: float
+    high: float
+
+    @classmethod
+    def of(cls, samples):
+        samples = np.asarray(samples, dtype=float)
+        mean = float(samples.mean())
+        half = float(Z95 * samples.std(ddof=1) / np.sqrt(len(samples))) if len(samples) > 1 else 0.0
+        return cls(mean, mean - half, mean + half)
+
+
+def _path_metrics(result, harvest_gas, tend_gas):
+    # iron bank spread is what each borrowed unit earns over its cost, annualised, while we hold debt
+    spreads = [s - b for s, b, d in zip(result.supply_rates, result.borrow_rates, result.iron_bank_debt) if d > 0]
+    return {
+        "apr": result.apr,
+        "iron_bank_spread": float(np.mean(spreads)) * BLOCKS_PER_YEAR / WAD if spreads else 0.0,
+        "keeper_gas": result.harvests * harvest_gas + result.tends * tend_gas,
+        "moves": result.moves,
+    }
+
+
+def simulate_path(seed, markets, demand, rows, block_step, prices, lenders, deposit, cadences, harvest_gas, tend_gas, replay_kwargs):
+    """One demand path replayed at every cadence. Returns {cadence: metrics}."""
+    history = demand_history(markets, demand, rows, block_step, np.random.default_rng(seed), prices)
+    metrics = {}
+    for harvest_blocks, tend_blocks in cadences:
+        result = replay(
+            history,
+            lenders,
+            deposit,
+            harvest_every=harvest_blocks // block_step,
+            tend_every=tend_blocks // block_step if tend_blocks else None,
+            **replay_kwargs,
+        )
+        metrics[(harvest_blocks, tend_blocks)] = _path_metrics(result, harvest_gas, tend_gas)
+    return metrics
+
+
+def simulate(
+    markets,
+    demand,
+    lenders,
+    deposit,
+    cadences,
+    paths=100,
+    rows=1000,
+    block_step=100,
+    prices=None,
+    seed=0,
+    workers=None,
+    harvest_gas=HARVEST_GAS,
+    tend_gas=TEND_GAS,
+    **replay_kwargs,
+):
+    """Monte-Carlo the strategy over random borrow demand.
+
+    markets maps source names to starting states and demand maps them to a Demand.
+    Each of paths paths runs rows rows, block_step blocks apart, and is replayed with
+    every (harvest blocks, tend blocks or None) cadence on the same path so cadences are
+    compared on equal luck. Paths run in a process pool of workers processes.
+
+    Returns {cadence: {metric: Interval}} for net apr, iron_bank_spread, keeper_gas and moves.
+    replay_kwargs go to history.replay, e.g. iron_bank and credit_limit.
+    """
+    for cadence in cadences:
+        if any(blocks and blocks % block_step for blocks in cadence):
+            raise ValueError(f"cadence {cadence} is not a multiple of {block_step} blocks")
+
+    seeds = np.random.SeedSequence(seed).generate_state(paths)
+    args = (markets, demand, rows, block_step, prices, lenders, deposit, cadences, harvest_gas, tend_gas, replay_kwargs)
+    with ProcessPoolExecutor(workers or os.cpu_count()) as pool:
+        results = list(pool.map(simulate_path, [int(s) for s in seeds], *[[a] * paths for a in args]))
+
+    return {
+        cadence: {metric: Interval.of([r[cadence][metric] for r in results]) for metric in results[0][cadence]}
+        for cadence in cadences
+    }
@@ -0,0 +1,19 @@
+"""Typed snapshots of a strategy, its vault and its lenders read in one eth_call.
+
+Every read is batched through the BatchReader lens at a single pinned block, so a
+state dump costs one RPC round trip instead of one per field.
+"""
+from .batch import Batch, BatchCallFailed
+from .snapshot import LenderSnapshot, StrategyParams, StrategySnapshot, VaultSnapshot, read_state, strategy_snapshot, vault_snapshot
+
+__all__ = [
+    "Batch",
+    "BatchCallFailed",
+    "LenderSnapshot",
+    "StrategyParams",
+    "StrategySnapshot",
+    "VaultSnapshot",
+    "read_state",
+    "strategy_snapshot",
+    "vault_snapshot",
+]
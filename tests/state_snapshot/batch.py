@@ -0,0 +1,43 @@
+from eth_abi import decode_abi
+
+
+class BatchCallFailed(Exception):
+    pass
+
+
+class Batch:
+    """Collects brownie contract calls and runs them as one eth_call through BatchReader.
+
+    add() returns the position of the call's result in execute()'s list. Calls added
+    with allow_failure give None when they revert.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def add(self, method, *args, allow_failure=False):
+        self.calls.append((method, args, allow_failure))
+        return len(self.calls) - 1
+
+    def execute(self, block=None):
+        """Results of every call at block, latest when None. A failed call raises BatchCallFailed."""
+        from brownie import BatchReader, web3
+
+        targets = [method._address for method, _, _ in self.calls]
+        data = [method.encode_input(*args) for method, args, _ in self.calls]
+        creation = BatchReader.deploy.encode_input(targets, data)
+        if not creation.startswith("0x"):
+            creation = "0x" + creation
+
+        raw = web3.eth.call({"data": creation}, block if block is not None else "latest")
+        success, results = decode_abi(["bool[]", "bytes[]"], bytes(raw))
+
+        decoded = []
+        for (method, args, allow_failure), ok, result in zip(self.calls, success, results):
+            if not ok:
+                if not allow_failure:
+                    raise BatchCallFailed(f"{method._name}{args} reverted")
+                decoded.append(None)
+                continue
+            decoded.append(method.decode_output("0x" + result.hex()))
+        return decoded
@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .batch import Batch
+
+# 1m gas at 30 gwei, what the state dumps have always passed to the triggers
+CALL_COST = 1000000 * 30 * 10 ** 9
+
+
+@dataclass
+class StrategyParams:
+    """Vault 0.3.0 StrategyParams."""
+
+    performanceFee: int
+    activation: int
+    debtLimit: int
+    rateLimit: int
+    lastReport: int
+    totalDebt: int
+    totalGain: int
+    totalLoss: int
+
+
+@dataclass
+class LenderSnapshot:
+    name: str
+    assets: int
+    rate: int
+    address: str
+
+
+@dataclass
+class StrategySnapshot:
+    """Strategy state at block. Rates and triggers are None when the call reverts, e.g. with no assets."""
+
+    block: int
+    name: str
+    decimals: int
+    want: int
+    estimated_total_assets: int
+    params: StrategyParams
+    iron_bank_borrow_rate: Optional[int]
+    current_supply_rate: Optional[int]
+    iron_bank_debt: int
+    harvest_trigger: Optional[bool]
+    tend_trigger: Optional[bool]
+    emergency_exit: bool
+    lenders: List[LenderSnapshot]
+
+
+@dataclass
+class VaultSnapshot:
+    block: int
+    name: str
+    decimals: int
+    total_assets: int
+    total_debt: int
+    loose: int
+
+
+def _strategy_calls(batch, strategy, currency, vault, call_cost):
+    return {
+        "name": batch.add(strategy.name),
+        "want": batch.add(currency.balanceOf, strategy),
+        "estimated_total_assets": batch.add(strategy.estimatedTotalAssets),
+        "params": batch.add(vault.strategies, strategy),
+        "iron_bank_borrow_rate": batch.add(strategy.ironBankBorrowRate, 0, True, allow_failure=True),
+        "current_supply_rate": batch.add(strategy.currentSupplyRate, allow_failure=True),
+        "iron_bank_debt": batch.add(strategy.ironBankOutstandingDebtStored),
+        "harvest_trigger": batch.add(strategy.harvestTrigger, call_cost, allow_failure=True),
+        "tend_trigger": batch.add(strategy.tendTrigger, call_cost, allow_failure=True),
+        "emergency_exit": batch.add(strategy.emergencyExit),
+        "lenders": batch.add(strategy.lendStatuses),
+    }
+
+
+def _vault_calls(batch, vault, currency):
+    return {
+        "name": batch.add(vault.name),
+        "total_assets": batch.add(vault.totalAssets),
+        "total_debt": batch.add(vault.totalDebt),
+        "loose": batch.add(currency.balanceOf, vault),
+    }
+
+
+def _strategy(results, calls, block, decimals):
+    values = {key: results[i] for key, i in calls.items()}
+    values["params"] = StrategyParams(*values["params"])
+    values["lenders"] = [LenderSnapshot(*status) for status in values["lenders"]]
+    return StrategySnapshot(block=block, decimals=decimals, **values)
+
+
+def _vault(results, calls, block, decimals):
+    return VaultSnapshot(block=block, decimals=decimals, **{key: results[i] for key, i in calls.items()})
+
+
+def _pin(block):
+    from brownie import web3
+
+    return web3.eth.block_number if block is None else block
+
+
+def read_state(strategy, vault, currency, block=None, call_cost=CALL_COST):
+    """(StrategySnapshot, VaultSnapshot) from one eth_call at block, latest when None."""
+    block = _pin(block)
+    batch = Batch()
+    decimals = batch.add(currency.decimals)
+    strategy_calls = _strategy_calls(batch, strategy, currency, vault, call_cost)
+    vault_calls = _vault_calls(batch, vault, currency)
+    results = batch.execute(block)
+    return _strategy(results, strategy_calls, block, results[decimals]), _vault(results, vault_calls, block, results[decimals])
+
+
+def strategy_snapshot(strategy, currency, vault, block=None, call_cost=CALL_COST):
+    block = _pin(block)
+    batch = Batch()
+    decimals = batch.add(currency.decimals)
+    calls = _strategy_calls(batch, strategy, currency, vault, call_cost)
+    results = batch.execute(block)
+    return _strategy(results, calls, block, results[decimals])
+
+
+def vault_snapshot(vault, currency, block=None):
+    block = _pin(block)
+    batch = Batch()
+    decimals = batch.add(currency.decimals)
+    calls = _vault_calls(batch, vault, currency)
+    results = batch.execute(block)
+    return _vault(results, calls, block, results[decimals])